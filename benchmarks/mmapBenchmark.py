@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+# Compares DirectoryParser reading and decoding whole export files with scanning memory-mapped bytes.
+# The synthetic export is mostly page chrome, like a full-year web-portal export.
+# Usage: python benchmarks/mmapBenchmark.py [transactions]
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from parsers import DateRange, DirectoryParser  # pylint: disable=wrong-import-position
+
+DEFAULT_TRANSACTIONS = 100_000
+CHROME = "".join(f"  * Navigation Eintrag {index} <#>\n" for index in range(20)) + \
+    "Ihre Karte läuft bald ab. Aus diesem Grund erhalten Sie in einigen Wochen eine neue Karte.\n\n"
+
+
+def writeExport(path: Path, transactionCount: int) -> None:
+    with open(path, "w", encoding="utf-8") as file:
+        for index in range(transactionCount):
+            month = index * 12 // transactionCount + 1
+            file.write(CHROME)
+            file.write(f"Essen & Trinken\n\n*Café {index % 50}*\n{index % 28 + 1:02d}.{month:02d}.2025 12:00 Zürich\n"
+                       f"*{index % 900 + 1}.50*  CHF\n<https://one.viseca.ch/de/transaktionen/detail/TRX{index:09d}>\n\n")
+
+
+def measure(useMmap: bool, directory: Path, dateRange):
+    # timed without tracemalloc, whose per-allocation overhead would distort the comparison
+    start = time.perf_counter()
+    count = sum(1 for _ in DirectoryParser(useMmap=useMmap).parse(str(directory), dateRange=dateRange))
+    elapsed = time.perf_counter() - start
+
+    # mapped pages live in the OS page cache and are not Python allocations
+    tracemalloc.start()
+    for _ in DirectoryParser(useMmap=useMmap).parse(str(directory), dateRange=dateRange):
+        pass
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return count, elapsed, peak
+
+
+def main():
+    transactionCount = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_TRANSACTIONS
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        writeExport(directory / "2025_full-year.txt", transactionCount)
+        size = (directory / "2025_full-year.txt").stat().st_size
+        print(f"export size: {size / 1e6:.1f} MB, transactions: {transactionCount}")
+        print(f"{'mode':<8} {'filter':<10} {'parsed':>8} {'time [s]':>9} {'peak [MB]':>10}")
+        for label, dateRange in [("all", None), ("one month", DateRange.forMonth(datetime(2025, 7, 1)))]:
+            for useMmap in (False, True):
+                count, elapsed, peak = measure(useMmap, directory, dateRange)
+                print(f"{'mmap' if useMmap else 'text':<8} {label:<10} {count:>8} {elapsed:>9.3f} {peak / 1e6:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# Compares writing bookings.ods through the odfpy document tree with streaming rows into the zip container.
+# The document tree writer (generateInMemory) is the former OdsGenerator implementation, kept here as the
+# comparator; the tests check that both writers produce the same cells.
+# Usage: python benchmarks/odsWriterBenchmark.py [rows]
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+from odf.table import Table, TableRow, TableCell
+from odf.text import P
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from accountMapper import BookingEntry  # pylint: disable=wrong-import-position
+from columnValues import entryAmount, entryDate, formatDate, textOf  # pylint: disable=wrong-import-position
+from configuration import ColumnConfig, Configuration  # pylint: disable=wrong-import-position
+from odsGenerator import AMOUNT_CELL_STYLE, OdsGenerator, dateCellStyleName  # pylint: disable=wrong-import-position
+from parsers.transaction import Transaction  # pylint: disable=wrong-import-position
+
+DEFAULT_ROWS = 100_000
+COLUMNS = [
+    {"name": "Datum", "type": "date", "format": "DD.MM.YY"},
+    {"name": "Beleg"},
+    {"name": "Beschreibung", "type": "description"},
+    {"name": "KtSoll", "type": "debitAccount"},
+    {"name": "KtHaben", "type": "creditAccount"},
+    {"name": "Betrag CHF", "type": "amountChf"},
+    {"name": "Bemerkungen", "type": "remarks"},
+    {"name": "KS1"},
+    {"name": "KS2"},
+    {"name": "Saldo"},
+]
+
+
+def generateInMemory(configuration: Configuration, entries, outputPath: Path) -> int:
+    # Builds the complete odfpy document tree before saving it; memory grows with the row count.
+    # The document with its styles and the header row come from the streaming writer's (unopened) sink.
+    frame = OdsGenerator(configuration).open(outputPath)
+    table = Table(name="Transactions")
+    table.addElement(frame.headerRow)
+    rowCount = 0
+    for rowCount, entry in enumerate(entries, start=1):
+        row = TableRow()
+        for column in configuration.columns:
+            row.addElement(createCell(column, entry))
+        table.addElement(row)
+    frame.document.spreadsheet.addElement(table)
+    frame.document.save(str(outputPath))
+    return rowCount
+
+
+def createCell(column: ColumnConfig, entry: BookingEntry) -> TableCell:
+    if column.type == "date":
+        date = entryDate(entry)
+        if date is None:
+            return TableCell()
+        cell = TableCell(stylename=dateCellStyleName(column.format), valuetype="date", datevalue=date.strftime("%Y-%m-%d"))
+        cell.addElement(P(text=formatDate(date, column.format)))
+        return cell
+    if column.type == "amountChf":
+        amount = entryAmount(entry)
+        if amount is None:
+            return TableCell()
+        cell = TableCell(stylename=AMOUNT_CELL_STYLE, valuetype="float", value=f"{amount:.10g}")
+        cell.addElement(P(text=f"{amount:.2f}"))
+        return cell
+    value = textOf(column, entry)
+    if not value:
+        return TableCell()
+    if column.type in ("debitAccount", "creditAccount"):
+        cell = TableCell(valuetype="float", value=value)
+    else:
+        cell = TableCell(valuetype="string")
+    cell.addElement(P(text=value))
+    return cell
+
+
+def createEntries(count: int):
+    # generated lazily, so that only the writer's own memory is measured
+    for index in range(count):
+        transaction = Transaction("Shopping", f"Shop {index % 500}", datetime(2025, index % 12 + 1, index % 28 + 1),
+                                  None, None, (index % 90000 + 1) / 100, 12.5 if index % 10 == 0 else None,
+                                  "EUR" if index % 10 == 0 else None)
+        yield BookingEntry(transaction.merchant, "6000" if index % 3 else None, "2110", transaction)
+
+
+def measure(write, count: int, outputPath: Path):
+    # timed without tracemalloc, whose per-allocation overhead would distort the comparison
+    start = time.perf_counter()
+    write(createEntries(count), outputPath)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    write(createEntries(count), outputPath)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, outputPath.stat().st_size
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ROWS
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        configPath = directory / "onecreditcard.json"
+        configPath.write_text(json.dumps({"creditAccount": "2110", "mapping": {}, "columns": COLUMNS}), encoding="utf-8")
+        configuration = Configuration(configPath)
+
+        print(f"rows: {count}")
+        print(f"{'writer':<10} {'time [s]':>9} {'peak [MB]':>10} {'file [MB]':>10}")
+        writers = [("odfpy", lambda entries, path: generateInMemory(configuration, entries, path)),
+                   ("streaming", OdsGenerator(configuration).generate)]
+        for label, write in writers:
+            elapsed, peak, size = measure(write, count, directory / f"{label}.ods")
+            print(f"{label:<10} {elapsed:>9.3f} {peak / 1e6:>10.1f} {size / 1e6:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
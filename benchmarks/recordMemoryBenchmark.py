@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# Compares the memory held by a million transactions and their booking entries as plain dataclasses
+# with fresh strings per transaction (the former representation) against the slotted, interned records.
+# Usage: python benchmarks/recordMemoryBenchmark.py [transactions]
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from accountMapper import BookingEntry  # pylint: disable=wrong-import-position
+from parsers.transaction import Transaction  # pylint: disable=wrong-import-position
+
+DEFAULT_TRANSACTIONS = 1_000_000
+CATEGORIES = ["Essen & Trinken", "Fahrzeug", "Shopping", "Allgemeines", "Reisen", "Gesundheit"]
+DATES = [datetime(2025, month, day) for month in range(1, 13) for day in range(1, 29)]
+
+
+@dataclass
+class PlainTransaction:  # pylint: disable=too-many-instance-attributes
+    category: str
+    merchant: str
+    date: datetime
+    time: Optional[str]
+    location: Optional[str]
+    amount: float
+    foreignAmount: Optional[float] = None
+    foreignCurrency: Optional[str] = None
+    transactionId: Optional[str] = None
+
+
+@dataclass
+class PlainBookingEntry:
+    mappedDescription: str
+    debitAccount: Optional[str]
+    creditAccount: str
+    transaction: Optional[PlainTransaction] = None
+    group: Optional[object] = None
+
+
+def fresh(text: str) -> str:
+    # a new string object with equal content, like every regex match group
+    return "".join(list(text))
+
+
+def createPlain(index: int):
+    transaction = PlainTransaction(fresh(CATEGORIES[index % len(CATEGORIES)]), fresh(f"Merchant {index % 500}"),
+                                   DATES[index % len(DATES)], None, None, index % 900 + 1.5,
+                                   transactionId=f"TRX{index:09d}")
+    return PlainBookingEntry(transaction.merchant, None, "2110", transaction=transaction)
+
+
+def createSlotted(index: int):
+    transaction = Transaction(fresh(CATEGORIES[index % len(CATEGORIES)]), fresh(f"Merchant {index % 500}"),
+                              DATES[index % len(DATES)], None, None, index % 900 + 1.5,
+                              transactionId=f"TRX{index:09d}")
+    return BookingEntry(transaction.merchant, None, "2110", transaction)
+
+
+def measure(create, count: int):
+    tracemalloc.start()
+    start = time.perf_counter()
+    entries = [create(index) for index in range(count)]
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del entries
+    return current, elapsed
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_TRANSACTIONS
+    print(f"transactions: {count}")
+    print(f"{'records':<10} {'held [MB]':>10} {'bytes/entry':>12} {'time [s]':>9}")
+    results = {}
+    for label, create in [("plain", createPlain), ("slotted", createSlotted)]:
+        held, elapsed = measure(create, count)
+        results[label] = held
+        print(f"{label:<10} {held / 1e6:>10.1f} {held / count:>12.0f} {elapsed:>9.3f}")
+    print(f"reduction: {1 - results['slotted'] / results['plain']:.0%}")
+
+
+if __name__ == '__main__':
+    main()
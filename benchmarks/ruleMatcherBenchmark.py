@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+# Compares the ordered per-rule fallback loop with the combined RuleMatcher regex.
+# Usage: python benchmarks/ruleMatcherBenchmark.py
+import json
+import sys
+import tempfile
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from configuration import Configuration  # pylint: disable=wrong-import-position
+from ruleMatcher import RuleMatcher  # pylint: disable=wrong-import-position
+
+RULE_COUNTS = [10, 100, 1000]
+MERCHANT_COUNT = 1000
+
+
+# mostly plain keywords, as in real charts of accounts, with some anchored and some full regex rules
+PATTERNS = ["shop {index}", "restaurant {index}", "^merchant {index} ", "gasstation {index}", "kiosk {index}",
+            "parking {index}", "^(sbb|cff|ffs) {index} ", "bakery {index}", "garage {index}", "pharmacy {index}"]
+
+
+def createConfiguration(directory: Path, ruleCount: int) -> Configuration:
+    mapping = {
+        f"Category {index}": {
+            'pattern': PATTERNS[index % len(PATTERNS)].format(index=index),
+            'description': f"Rule {index}",
+            'debitAccount': str(6000 + index)
+        }
+        for index in range(ruleCount)
+    }
+    configPath = directory / f"onecreditcard-{ruleCount}.json"
+    configPath.write_text(json.dumps({'creditAccount': '2000', 'mapping': mapping, 'columns': []}), encoding='utf-8')
+    return Configuration(configPath)
+
+
+def orderedLoop(matcher: RuleMatcher, merchant: str):
+    for rule in matcher.fallbackRules:
+        if rule.matches(merchant):
+            return rule
+    return None
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{'rules':>6} {'loop [ms]':>10} {'combined [ms]':>14} {'speedup':>8}")
+        for ruleCount in RULE_COUNTS:
+            matcher = RuleMatcher(createConfiguration(Path(tmp), ruleCount))
+            # half of the merchants match a rule somewhere in the list, the other half match none
+            merchants = [f"Merchant {index % ruleCount} Shop {index % ruleCount} Restaurant {index % ruleCount}"
+                         if index % 2 else f"Unknown vendor {index} Zurich"
+                         for index in range(MERCHANT_COUNT)]
+            assert [matcher.match('Unknown', m) for m in merchants] == [orderedLoop(matcher, m) for m in merchants]
+
+            loop = min(timeit.repeat(lambda matcher=matcher, merchants=merchants: [orderedLoop(matcher, m) for m in merchants], number=1, repeat=5))
+            combined = min(timeit.repeat(lambda matcher=matcher, merchants=merchants: [matcher.match('Unknown', m) for m in merchants], number=1, repeat=5))
+            print(f"{ruleCount:>6} {loop * 1000:>10.2f} {combined * 1000:>14.2f} {loop / combined:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
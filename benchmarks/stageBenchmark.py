@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+# Times every pipeline stage in isolation and end-to-end on synthetic exports of several sizes and rule counts,
+# writes the results as JSON and, given a baseline, fails when a stage got slower than the threshold allows.
+# Usage: python benchmarks/stageBenchmark.py [--sizes 10000,100000] [--rules 10,200] [--repeat 3] [--output results.json]
+#                                            [--compare baseline.json] [--threshold 20]
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from syntheticExport import DEFAULT_SEED, SyntheticExport
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from accountMapper import AccountMapper  # pylint: disable=wrong-import-position
+from configuration import Configuration  # pylint: disable=wrong-import-position
+from odsGenerator import OdsGenerator  # pylint: disable=wrong-import-position
+from parsers import TextParser  # pylint: disable=wrong-import-position
+from parsers.directoryParser import DirectoryParser  # pylint: disable=wrong-import-position
+from transactionClassifier import TransactionClassifier  # pylint: disable=wrong-import-position
+from transactionGrouper import TransactionGrouper  # pylint: disable=wrong-import-position
+
+RESULTS_VERSION = 1
+DEFAULT_SIZES = "10000,100000"
+DEFAULT_RULES = "10,200"
+DEFAULT_REPEAT = 3
+DEFAULT_THRESHOLD = 20.0
+FILES = 4
+MIN_REPETITION_SECONDS = 0.2
+STAGES = ("textParser", "directoryParser", "grouper", "mapper", "odsGenerator", "endToEnd")
+
+
+def timeStage(run: Callable[[], object], repeat: int) -> float:
+    # Seconds per run, best of the repetitions as the least disturbed by other load on the machine. Fast
+    # stages run several times per repetition, so that millisecond timings do not drown in noise.
+    best = float("inf")
+    for _ in range(repeat):
+        runs = 0
+        start = time.perf_counter()
+        while True:
+            run()
+            runs += 1
+            elapsed = time.perf_counter() - start
+            if elapsed >= MIN_REPETITION_SECONDS:
+                break
+        best = min(best, elapsed / runs)
+    return best
+
+
+def stageRuns(folder: Path, files: List[Path], config: Configuration) -> Tuple[int, Dict[str, Callable[[], object]]]:
+    # returns the number of transactions and a run per stage
+    texts = [file.read_text(encoding="utf-8") for file in files]
+
+    # Inputs of the later stages, prepared once outside of the timings. Mapper and writer get every
+    # transaction as an individual entry, the worst case of a configuration without catch-all rules;
+    # with the grouped entries alone they would only see a few rows.
+    transactions = list(DirectoryParser().parse(folder))
+    _, groups = TransactionGrouper(config).group(iter(transactions))
+    mapper = AccountMapper(config)
+    entries = list(mapper.mapTransactions(transactions)) + list(mapper.mapGroups(groups))
+    outputPath = folder / "bookings.ods"
+
+    def mapAll():
+        # a new mapper per run, its rule resolution cache starts cold like in a real run
+        stageMapper = AccountMapper(config)
+        return list(stageMapper.mapTransactions(transactions)) + list(stageMapper.mapGroups(groups))
+
+    stages: Dict[str, Callable[[], object]] = {
+        "textParser": lambda: [sum(1 for _ in TextParser().parse(text)) for text in texts],
+        "directoryParser": lambda: list(DirectoryParser().parse(folder)),
+        "grouper": lambda: TransactionGrouper(config).group(iter(transactions)),
+        "mapper": mapAll,
+        "odsGenerator": lambda: OdsGenerator(config).generate(entries, outputPath),
+        "endToEnd": lambda: OdsGenerator(config).generate(
+            TransactionClassifier(config).stream(DirectoryParser().parse(folder)), outputPath),
+    }
+    return len(transactions), stages
+
+
+def benchmarkDataset(folder: Path, transactionCount: int, ruleCount: int, repeat: int, seed: int) -> List[dict]:
+    # one month, so that every transaction reaches every stage
+    export = SyntheticExport(seed)
+    files = export.writeExports(folder, transactionCount, FILES, monthCount=1)
+    parsedCount, stages = stageRuns(folder, files, Configuration(export.writeConfiguration(folder, ruleCount)))
+    results = []
+    for stage in STAGES:
+        seconds = timeStage(stages[stage], repeat)
+        results.append({"stage": stage, "transactions": parsedCount, "rules": ruleCount, "seconds": round(seconds, 6),
+                        "transactionsPerSecond": round(parsedCount / seconds) if seconds else None})
+        print(f"{stage:<16} {parsedCount:>9} {ruleCount:>6} {seconds:>10.3f}", flush=True)
+    return results
+
+
+def resultKey(result: dict) -> Tuple[str, int, int]:
+    return result["stage"], result["transactions"], result["rules"]
+
+
+def compare(results: List[dict], baseline: dict, threshold: float) -> List[str]:
+    # Returns a message per stage slower than the baseline by more than threshold percent
+    baselineResults = {resultKey(result): result for result in baseline.get("results", [])}
+    regressions = []
+    print(f"\n{'stage':<16} {'trx':>9} {'rules':>6} {'base [s]':>10} {'now [s]':>10} {'change':>8}")
+    for result in results:
+        base = baselineResults.get(resultKey(result))
+        if base is None or not base["seconds"]:
+            print(f"{result['stage']:<16} {result['transactions']:>9} {result['rules']:>6} {'-':>10} {result['seconds']:>10.3f} {'new':>8}")
+            continue
+        change = (result["seconds"] / base["seconds"] - 1) * 100
+        print(f"{result['stage']:<16} {result['transactions']:>9} {result['rules']:>6} {base['seconds']:>10.3f} "
+              f"{result['seconds']:>10.3f} {change:>+7.1f}%")
+        if change > threshold:
+            regressions.append(f"{result['stage']} ({result['transactions']} transactions, {result['rules']} rules): "
+                               f"{base['seconds']:.3f} s -> {result['seconds']:.3f} s ({change:+.1f}%)")
+    return regressions
+
+
+def parseArguments(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Per-stage pipeline benchmark with regression check against a baseline")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help=f"Comma separated transaction counts (default: {DEFAULT_SIZES})")
+    parser.add_argument("--rules", default=DEFAULT_RULES, help=f"Comma separated mapping rule counts (default: {DEFAULT_RULES})")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help=f"Runs per stage, the fastest counts (default: {DEFAULT_REPEAT})")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="Seed of the synthetic exports")
+    parser.add_argument("--output", type=Path, default=None, help="JSON file to write the results to")
+    parser.add_argument("--compare", type=Path, default=None, help="Results JSON of an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"Slowdown in percent that fails the comparison (default: {DEFAULT_THRESHOLD:g})")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parseArguments(argv)
+    sizes = [int(size) for size in args.sizes.split(",")]
+    ruleCounts = [int(rules) for rules in args.rules.split(",")]
+
+    print(f"{'stage':<16} {'trx':>9} {'rules':>6} {'time [s]':>10}")
+    results = []
+    for size in sizes:
+        for ruleCount in ruleCounts:
+            with tempfile.TemporaryDirectory() as tmp:
+                results.extend(benchmarkDataset(Path(tmp), size, ruleCount, args.repeat, args.seed))
+
+    report = {"version": RESULTS_VERSION, "python": platform.python_version(), "machine": platform.machine(),
+              "seed": args.seed, "repeat": args.repeat, "results": results}
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=1), encoding="utf-8")
+        print(f"\nresults: {args.output}")
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} stage(s) slower than the baseline by more than {args.threshold:g}%:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print(f"\nno stage slower than the baseline by more than {args.threshold:g}%")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
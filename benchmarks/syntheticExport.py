@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+# Writes seeded, deterministic Viseca portal exports of any size for load tests, in the block format of
+# TextParser.TRANSACTION_PATTERN and wrapped in the portal's page chrome, plus a matching onecreditcard.json.
+# Usage: python benchmarks/syntheticExport.py folder [--transactions N] [--files N] [--rules N] [--from YYYY-MM] [--months N] [--seed N]
+import argparse
+import json
+import random
+import re
+import sys
+from datetime import date
+from pathlib import Path
+from typing import Dict, List, Optional, TextIO, Tuple
+
+DEFAULT_TRANSACTIONS = 100_000
+DEFAULT_FILES = 12
+DEFAULT_RULES = 50
+DEFAULT_MONTHS = 12
+DEFAULT_SEED = 42
+
+# category -> merchant name stems; "Einlagen" holds the (negative) payments
+CATEGORIES: Dict[str, List[str]] = {
+    "Essen & Trinken": ["Restaurant", "Cafe", "Pizzeria", "Bakery", "- My Lunch Place", "Take Away"],
+    "Lebensmittel": ["Migros", "Coop", "Denner", "Volg", "Farm Shop"],
+    "Fahrzeug": ["Gasstation", "Car Wash", "Main station parking", "City parking", "Garage"],
+    "Transport": ["SBB CFF FFS", "Taxi", "Bus Company", "Bike Rental"],
+    "Shopping": ["shop.company.com", "Bookstore", "Electronics", "Fashion Store", "Sports Shop"],
+    "Allgemeines": ["Company AG", "Post Office", "Kiosk", "Pharmacy"],
+    "Reisen": ["Hotel", "Airline", "Travel Agency", "Holiday Flat"],
+    "Freizeit": ["Cinema", "Fitness Club", "Museum", "Ski Resort", "Streaming Service"],
+    "Einlagen": ["Ihre Zahlung - Danke"],
+}
+LOCATIONS = ["Zurich", "Bern", "Basel", "Luzern", "Olten", "Zug", "Winterthur", "St. Gallen", "Lausanne", "Genève"]
+MONTH_NAMES = ["Januar", "Februar", "März", "April", "Mai", "Juni", "Juli", "August", "September", "Oktober",
+               "November", "Dezember"]
+FOREIGN_RATES = {"EUR": 0.94, "USD": 0.86}
+
+PAGE_HEAD = """migrosCumulus <#>
+migrosCumulus <#>
+
+  * Cockpit <#>
+  * Transaktionen <#>
+  * Rechnungen <#>
+  * Karte <#>
+  * Benutzerkonto <#>
+  * Log out <#>
+
+  * Log out <#>
+
+
+    Transaktionen
+
+Visa
+*Visa **•••• 1234 **CHF*John Doe
+
+Alle Transaktionen
+suchen
+
+*Betrag*
+von
+
+bis
+
+*Datum*
+von
+
+bis
+
+zurücksetzen
+suchen
+
+Erweiterte Suchoptionen Erweiterte Suchoptionen schliessen
+
+"""
+PAGE_FOOT = """
+  * // Pendente Transaktionen
+
+  *
+  *
+  * 1
+  * 2
+  *
+  *
+
+Hinweis:
+
+Der Devisenkurs ist provisorisch und kann geringfügig vom Devisenkurs in
+der Monatsabrechnung abweichen. Massgebend ist in jedem Fall der in der
+Monatsrechnung angegebene Devisenkurs.
+
+Für Beanstandungen von Transaktionen wenden Sie sich bitte an Ihren
+Kartenherausgeber <https://one.viseca.ch/public/de/support#faq07>
+
+one <#>
+
+
+          Sprache
+
+  * DE
+  * FR
+  * IT
+  * EN
+"""
+
+
+def escapePattern(text: str) -> str:
+    # escapes regex metacharacters only, keeping patterns as readable as hand-written ones
+    return re.sub(r"([.^$*+?{}\[\]\\|()])", r"\\\1", text)
+
+
+class SyntheticExport:
+    # Everything derives from the seed: the same arguments always give byte-identical files
+    def __init__(self, seed: int = DEFAULT_SEED, merchantsPerStem: int = 20):
+        # Args: merchantsPerStem - distinct merchants per name stem ("Restaurant 1" .. "Restaurant 20")
+        self.seed = seed
+        self.merchants: Dict[str, List[str]] = {
+            category: [f"{stem} {number}" for stem in stems for number in range(1, merchantsPerStem + 1)]
+            for category, stems in CATEGORIES.items() if category != "Einlagen"
+        }
+        self.merchants["Einlagen"] = CATEGORIES["Einlagen"]
+
+    def writeExports(self, folder: Path, transactionCount: int = DEFAULT_TRANSACTIONS, fileCount: int = DEFAULT_FILES,
+                     firstMonth: date = date(2025, 1, 1), monthCount: int = DEFAULT_MONTHS) -> List[Path]:
+        # Spreads the transactions evenly over the months and the files over the months' pages
+        # (YYYY-MM_<page>.txt, newest transaction first like the portal); written block by block, so
+        # millions of transactions never sit in memory
+        if fileCount < monthCount:
+            raise ValueError(f"Every month needs an export file: {fileCount} files for {monthCount} months")
+        folder.mkdir(parents=True, exist_ok=True)
+        rng = random.Random(self.seed)
+        files = []
+        transactionId = rng.randrange(100_000_000, 900_000_000)
+        for month, page, pageTransactions in self.__pages(transactionCount, fileCount, firstMonth, monthCount):
+            path = folder / f"{month:%Y-%m}_{page}.txt"
+            with open(path, "w", encoding="utf-8", newline="\n") as file:
+                transactionId = self.__writePage(file, rng, month, pageTransactions, transactionId)
+            files.append(path)
+        return files
+
+    def configuration(self, ruleCount: int = DEFAULT_RULES) -> dict:
+        # ruleCount mapping rules: merchant patterns per category, then a catch-all per category;
+        # payments are ignored like in a real configuration
+        categories = [category for category in CATEGORIES if category != "Einlagen"]
+        mapping: Dict[str, List[dict]] = {category: [] for category in categories}
+        patternRules = max(ruleCount - len(categories), 0)
+        for index in range(patternRules):
+            category = categories[index % len(categories)]
+            merchant = self.merchants[category][(index // len(categories)) % len(self.merchants[category])]
+            # alternately a single merchant and a keyword covering all merchants of the stem
+            stem = merchant.rsplit(" ", 1)[0]
+            mapping[category].append({
+                "description": f"{category} {merchant if index % 2 else stem}",
+                "debitAccount": str(6000 + index % 900),
+                "pattern": f"^{escapePattern(merchant)}$" if index % 2 else escapePattern(stem),
+            })
+        for index, category in enumerate(categories[:ruleCount]):
+            mapping[category].append({"description": category, "debitAccount": str(5800 + index)})
+        return {
+            "creditAccount": "2110",
+            "ignore": {"categories": ["Einlagen"]},
+            "mapping": {category: rules for category, rules in mapping.items() if rules},
+            "columns": [
+                {"name": "Datum", "type": "date", "format": "DD.MM.YY"},
+                {"name": "Beleg"},
+                {"name": "Beschreibung", "type": "description"},
+                {"name": "KtSoll", "type": "debitAccount"},
+                {"name": "KtHaben", "type": "creditAccount"},
+                {"name": "Betrag CHF", "type": "amountChf"},
+                {"name": "Bemerkungen", "type": "remarks"}
+            ]
+        }
+
+    def writeConfiguration(self, folder: Path, ruleCount: int = DEFAULT_RULES) -> Path:
+        folder.mkdir(parents=True, exist_ok=True)
+        path = folder / "onecreditcard.json"
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.configuration(ruleCount), file, ensure_ascii=False, indent=2)
+        return path
+
+    def __pages(self, transactionCount: int, fileCount: int, firstMonth: date, monthCount: int) -> List[Tuple[date, int, int]]:
+        # (month, page number, transactions on the page) of every export file
+        pages = []
+        written = 0
+        for monthIndex in range(monthCount):
+            month = self.__addMonths(firstMonth, monthIndex)
+            pageCount = fileCount // monthCount + (1 if monthIndex < fileCount % monthCount else 0)
+            monthTransactions = transactionCount * (monthIndex + 1) // monthCount - written
+            written += monthTransactions
+            for page in range(pageCount):
+                pageTransactions = monthTransactions * (page + 1) // pageCount - monthTransactions * page // pageCount
+                pages.append((month, page + 1, pageTransactions))
+        return pages
+
+    def __writePage(self, file: TextIO, rng: random.Random, month: date, transactionCount: int, transactionId: int) -> int:
+        file.write(PAGE_HEAD)
+        file.write(f"{MONTH_NAMES[month.month - 1]}\n\n")
+        lastDay = (self.__addMonths(month, 1) - month).days
+        days = sorted((rng.randint(1, lastDay) for _ in range(transactionCount)), reverse=True)
+        for day in days:
+            file.write(self.__block(rng, month.replace(day=day), transactionId))
+            transactionId += rng.randint(1, 50)
+        file.write(PAGE_FOOT)
+        return transactionId
+
+    def __block(self, rng: random.Random, day: date, transactionId: int) -> str:
+        category = rng.choices(list(CATEGORIES), weights=[30, 25, 10, 10, 10, 5, 4, 5, 1])[0]
+        merchant = rng.choice(self.merchants[category])
+        # the portal shows the transaction ID in place of an unknown category now and then
+        categoryLine = f"TRX{transactionId}" if rng.random() < 0.01 else category
+
+        dateLine = f"{day:%d.%m.%Y}"
+        if rng.random() < 0.85:
+            dateLine += f" {rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}"
+            if rng.random() < 0.75:
+                dateLine += f" {rng.choice(LOCATIONS)}"
+
+        amount = self.__amount(rng, category)
+        amountLine = f"*{self.__formatChf(amount)}*  CHF"
+        currency = rng.choice(list(FOREIGN_RATES)) if category != "Einlagen" and rng.random() < 0.08 else None
+        if currency:
+            amountLine += f" {amount / FOREIGN_RATES[currency]:.2f}  {currency}"
+
+        # a few transactions lack the detail link, as pending ones do
+        link = (f"<https://one.viseca.ch/de/transaktionen/detail/TRX{transactionId}>\n"
+                if rng.random() < 0.98 else "")
+        return f"{categoryLine}\n\n*{merchant}*\n{dateLine}\n{amountLine}\n{link}"
+
+    @staticmethod
+    def __amount(rng: random.Random, category: str) -> float:
+        if category == "Einlagen":
+            return -rng.randint(10_000, 800_000) / 100
+        # mostly small amounts, a long tail into the thousands (written with ' separators)
+        return round(min(rng.lognormvariate(3.2, 1.1), 25_000), 2) or 0.05
+
+    @staticmethod
+    def __formatChf(amount: float) -> str:
+        return f"{amount:,.2f}".replace(",", "'")
+
+    @staticmethod
+    def __addMonths(month: date, offset: int) -> date:
+        index = month.year * 12 + month.month - 1 + offset
+        return date(index // 12, index % 12 + 1, 1)
+
+
+def parseArguments(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Write synthetic Viseca exports and a matching configuration")
+    parser.add_argument("folder", type=Path, help="Data folder to write the exports and onecreditcard.json into")
+    parser.add_argument("--transactions", type=int, default=DEFAULT_TRANSACTIONS, help="Number of transactions")
+    parser.add_argument("--files", type=int, default=DEFAULT_FILES, help="Number of export files, spread over the months")
+    parser.add_argument("--rules", type=int, default=DEFAULT_RULES, help="Number of mapping rules in the configuration")
+    parser.add_argument("--from", dest="fromMonth", type=str, default="2025-01", help="First month in YYYY-MM format")
+    parser.add_argument("--months", type=int, default=DEFAULT_MONTHS, help="Number of months")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="Random seed")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parseArguments(argv)
+    year, month = (int(part) for part in args.fromMonth.split("-"))
+    export = SyntheticExport(args.seed)
+    files = export.writeExports(args.folder, args.transactions, args.files, date(year, month, 1), args.months)
+    configPath = export.writeConfiguration(args.folder, args.rules)
+    size = sum(file.stat().st_size for file in files)
+    print(f"transactions: {args.transactions}, files: {len(files)}, size: {size / 1e6:.1f} MB, rules: {args.rules}")
+    print(f"configuration: {configPath}")
+
+
+if __name__ == '__main__':
+    sys.exit(main())
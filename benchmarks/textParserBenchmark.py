@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+# Measures TextParser throughput on a large synthetic export, with the fast date/amount decoders
+# against the former strptime/replace decoding.
+# Usage: python benchmarks/textParserBenchmark.py [transactions]
+import random
+import sys
+import timeit
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from parsers import TextParser  # pylint: disable=wrong-import-position
+
+DEFAULT_TRANSACTIONS = 200_000
+CATEGORIES = ["Essen & Trinken", "Shopping", "Fahrzeug", "Lebensmittel", "Transport"]
+MERCHANTS = ["Restaurant 1", "Gasstation 1", "SBB CFF FFS", "Shop 1", "Bakery 2"]
+
+
+class StrptimeTextParser(TextParser):
+    # decoding as it was before the fast path
+    def _decodeDate(self, dateStr: str) -> datetime:
+        return datetime.strptime(dateStr, "%d.%m.%Y")
+
+    @staticmethod
+    def _decodeAmount(amountStr: str) -> float:
+        return float(amountStr.replace("'", ""))
+
+
+def createExport(transactionCount: int) -> str:
+    rng = random.Random(42)
+    blocks = []
+    for index in range(transactionCount):
+        amount = rng.randint(100, 500_000) / 100
+        amountStr = f"{amount:,.2f}".replace(",", "'")
+        blocks.append(
+            f"{rng.choice(CATEGORIES)}\n\n"
+            f"*{rng.choice(MERCHANTS)}*\n"
+            f"{rng.randint(1, 28):02d}.07.2025 {index % 24:02d}:{index % 60:02d} Olten\n"
+            f"*{amountStr}*  CHF\n"
+            f"<https://one.viseca.ch/de/transaktionen/detail/TRX{index:09d}>\n"
+        )
+    return "\n".join(blocks)
+
+
+def main():
+    transactionCount = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_TRANSACTIONS
+    text = createExport(transactionCount)
+    assert list(TextParser().parse(text)) == list(StrptimeTextParser().parse(text))
+
+    before = min(timeit.repeat(lambda: sum(1 for _ in StrptimeTextParser().parse(text)), number=1, repeat=3))
+    after = min(timeit.repeat(lambda: sum(1 for _ in TextParser().parse(text)), number=1, repeat=3))
+    print(f"transactions: {transactionCount}, export size: {len(text) / 1e6:.1f} MB")
+    print(f"strptime decoding: {before:.3f} s ({transactionCount / before:,.0f} transactions/s)")
+    print(f"fast decoding:     {after:.3f} s ({transactionCount / after:,.0f} transactions/s)")
+    print(f"speedup:           {before / after:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
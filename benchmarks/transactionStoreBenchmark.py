@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# Compares grouping transactions one by one (TransactionClassifier) with the columnar TransactionStore,
+# aggregating with NumPy and with plain loops over the array columns.
+# Usage: python benchmarks/transactionStoreBenchmark.py [transactions]
+import json
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from configuration import Configuration  # pylint: disable=wrong-import-position
+from parsers.transaction import Transaction  # pylint: disable=wrong-import-position
+from ruleResolver import RuleResolver  # pylint: disable=wrong-import-position
+from transactionClassifier import TransactionClassifier  # pylint: disable=wrong-import-position
+from transactionStore import TransactionStore, np  # pylint: disable=wrong-import-position
+
+DEFAULT_TRANSACTIONS = 1_000_000
+CATEGORIES = ["Essen & Trinken", "Fahrzeug", "Shopping", "Allgemeines", "Reisen", "Gesundheit"]
+
+
+def createTransactions(count: int):
+    return [Transaction(CATEGORIES[index % len(CATEGORIES)], f"Merchant {index % 500}",
+                        datetime(2020 + index * 5 // count, index % 12 + 1, index % 28 + 1), None, None,
+                        (index % 90000 + 1) / 100)
+            for index in range(count)]
+
+
+def writeConfig(directory: Path) -> Path:
+    mapping = {category: {"description": category, "debitAccount": str(6000 + index)}
+               for index, category in enumerate(CATEGORIES[:4])}
+    configPath = directory / "onecreditcard.json"
+    configPath.write_text(json.dumps({"creditAccount": "2110", "mapping": mapping, "columns": []}), encoding="utf-8")
+    return configPath
+
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - start
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_TRANSACTIONS
+    transactions = createTransactions(count)
+    with tempfile.TemporaryDirectory() as tmp:
+        config = Configuration(writeConfig(Path(tmp)))
+    resolver = RuleResolver(config)
+
+    print(f"transactions: {count}")
+    print(f"{'aggregation':<22} {'build [s]':>10} {'groups [s]':>11} {'by month [s]':>13}")
+    classification, elapsed = timed(lambda: TransactionClassifier(config, resolver).classify(transactions))
+    expected = [(g.description, g.totalAmount, g.transactionCount) for g in classification.groups]
+    print(f"{'one by one':<22} {'':>10} {elapsed:>11.3f} {'':>13}")
+
+    for label, useNumpy in [("store (array)", False), ("store (numpy)", True)]:
+        if useNumpy and np is None:
+            print(f"{label:<22} NumPy not installed")
+            continue
+        store, buildTime = timed(lambda useNumpy=useNumpy: TransactionStore.fromTransactions(transactions, useNumpy))
+        groups, groupTime = timed(lambda store=store: store.groups(resolver))
+        _, monthTime = timed(lambda store=store: store.groupsByMonth(resolver))
+        assert [(g.description, g.totalAmount, g.transactionCount) for g in groups] == expected
+        print(f"{label:<22} {buildTime:>10.3f} {groupTime:>11.3f} {monthTime:>13.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,27 +1,36 @@
-import re
 from dataclasses import dataclass
-from typing import Iterator, List, Optional
+from typing import Iterator, List, Optional, Union
 
 from parsers.transaction import Transaction
 from configuration import Configuration, MappingRule
 from transactionGrouper import Group
 from logging_config import getLogger
+from ruleResolver import RuleResolver
 
 logger = getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class BookingEntry:
     mappedDescription: str
     debitAccount: Optional[str]
     creditAccount: str
-    transaction: Optional[Transaction] = None
-    group: Optional[Group] = None
+    # the single transaction booked individually, or the group booked as one entry
+    source: Union[Transaction, Group]
+
+    @property
+    def transaction(self) -> Optional[Transaction]:
+        return self.source if isinstance(self.source, Transaction) else None
+
+    @property
+    def group(self) -> Optional[Group]:
+        return self.source if isinstance(self.source, Group) else None
 
 
 class AccountMapper:
-    def __init__(self, configuration: Configuration):
+    def __init__(self, configuration: Configuration, resolver: Optional[RuleResolver] = None):
         self.configuration = configuration
+        self.resolver = resolver or RuleResolver(configuration)
 
     def mapTransactions(self, transactions: List[Transaction]) -> Iterator[BookingEntry]:
         # Maps transactions to account codes and descriptions based on configuration
@@ -30,40 +39,46 @@ class AccountMapper:
         ignoredCount = 0
 
         for transaction in transactions:
-            if self.__ignored(transaction):
+            resolution = self.resolver.resolve(transaction.category, transaction.merchant)
+            if resolution.ignored:
                 ignoredCount += 1
                 logger.debug("Transaction ignored; merchant='%s', category='%s'",
                             transaction.merchant, transaction.category)
                 continue
 
-            mappingRule = self.__findMappingRule(transaction)
-            if mappingRule:
-                # Create mapped transaction with mapping information
+            entry = self.mapTransaction(transaction, resolution.rule)
+            if entry.debitAccount is not None:
                 mappedCount += 1
-                logger.debug("Transaction mapped; merchant='%s', category='%s', description='%s', debitAccount='%s'",
-                            transaction.merchant, transaction.category,
-                            mappingRule.description, mappingRule.debitAccount)
-                yield BookingEntry(
-                    mappedDescription=mappingRule.description,
-                    debitAccount=mappingRule.debitAccount,
-                    creditAccount=self.configuration.creditAccount,
-                    transaction=transaction
-                )
             else:
-                # Unmapped transaction - use merchant as description, no debit account
                 unmappedCount += 1
-                logger.debug("Transaction unmapped; merchant='%s', category='%s'",
-                            transaction.merchant, transaction.category)
-                yield BookingEntry(
-                    mappedDescription=transaction.merchant,
-                    debitAccount=None,
-                    creditAccount=self.configuration.creditAccount,
-                    transaction=transaction
-                )
+            yield entry
 
         logger.info("Transactions mapped; total=%d, mapped=%d, unmapped=%d, ignored=%d",
                    len(transactions), mappedCount, unmappedCount, ignoredCount)
 
+    def mapTransaction(self, transaction: Transaction, mappingRule: Optional[MappingRule]) -> BookingEntry:
+        if mappingRule:
+            # Create mapped transaction with mapping information
+            logger.debug("Transaction mapped; merchant='%s', category='%s', description='%s', debitAccount='%s'",
+                        transaction.merchant, transaction.category,
+                        mappingRule.description, mappingRule.debitAccount)
+            return BookingEntry(
+                mappedDescription=mappingRule.description,
+                debitAccount=mappingRule.debitAccount,
+                creditAccount=self.configuration.creditAccount,
+                source=transaction
+            )
+
+        # Unmapped transaction - use merchant as description, no debit account
+        logger.debug("Transaction unmapped; merchant='%s', category='%s'",
+                    transaction.merchant, transaction.category)
+        return BookingEntry(
+            mappedDescription=transaction.merchant,
+            debitAccount=None,
+            creditAccount=self.configuration.creditAccount,
+            source=transaction
+        )
+
     def mapGroups(self, groups: List[Group]) -> Iterator[BookingEntry]:
         # Map grouped transactions
         mappedCount = 0
@@ -75,65 +90,24 @@ class AccountMapper:
                 mappedCount += 1
                 logger.debug("Group mapped; description='%s', debitAccount='%s', transactions=%d",
                             group.description,
-                            mappingRule.debitAccount, len(group.transactions))
+                            mappingRule.debitAccount, group.transactionCount)
                 yield BookingEntry(
                     mappedDescription=mappingRule.description,
                     debitAccount=mappingRule.debitAccount,
                     creditAccount=self.configuration.creditAccount,
-                    group=group
+                    source=group
                 )
             else:
                 # This shouldn't happen if grouping is correct, but handle it
                 unmappedCount += 1
                 logger.debug("Group unmapped; description='%s', transactions=%d",
-                            group.description, len(group.transactions))
+                            group.description, group.transactionCount)
                 yield BookingEntry(
                     mappedDescription=group.description,
                     debitAccount=None,
                     creditAccount=self.configuration.creditAccount,
-                    group=group
+                    source=group
                 )
 
         logger.info("Groups mapped; total=%d, mapped=%d, unmapped=%d",
                    len(groups), mappedCount, unmappedCount)
-
-    def __ignored(self, transaction: Transaction) -> bool:
-        return self.__ignoredCategory(transaction) or self.__ignoredTransaction(transaction)
-
-    def __ignoredCategory(self, transaction: Transaction) -> bool:
-        for ignoredCategory in self.configuration.ignoreRules.categories:
-            if transaction.category.lower() == ignoredCategory.lower():
-                return True
-        return False
-
-    def __ignoredTransaction(self, transaction: Transaction) -> bool:
-        for ignoredTransaction in self.configuration.ignoreRules.transactions:
-            if self.__matchesPattern(transaction.merchant, ignoredTransaction):
-                return True
-        return False
-
-    def __findMappingRule(self, transaction: Transaction) -> Optional[MappingRule]:
-        mappingRules = self.configuration.mappingRules
-
-        # Pass 1: direct category match — check patterns first, then catch-all
-        if transaction.category in mappingRules:
-            catchAll: Optional[MappingRule] = None
-            for rule in mappingRules[transaction.category]:
-                if rule.pattern:
-                    if self.__matchesPattern(transaction.merchant, rule.pattern):
-                        return rule
-                elif catchAll is None:
-                    catchAll = rule
-            if catchAll:
-                return catchAll
-
-        # Pass 2: pattern-based matching across all categories
-        for rules in mappingRules.values():
-            for rule in rules:
-                if rule.pattern and self.__matchesPattern(transaction.merchant, rule.pattern):
-                    return rule
-
-        return None
-
-    def __matchesPattern(self, text: str, pattern: str) -> bool:
-        return re.search(pattern, text, re.IGNORECASE) is not None
@@ -0,0 +1,82 @@
+from datetime import datetime
+from typing import Callable, Optional, Sequence, Tuple, Union
+
+from accountMapper import BookingEntry
+from configuration import ColumnConfig
+from parsers.transaction import Transaction
+from transactionGrouper import Group
+
+DATE_FORMATS = {"DD.MM.YY": "%d.%m.%y", "DD.MM.YYYY": "%d.%m.%Y"}
+DEFAULT_DATE_FORMAT = "%d.%m.%y"
+REMARKS_COLUMN_NAMES = ("Bemerkungen", "Bemerkung")
+
+# text for description, account and remarks columns, the amount as number, a formatted date; None when empty
+ColumnValue = Union[str, float, None]
+
+
+def entryDate(entry: BookingEntry) -> Optional[datetime]:
+    source = entry.source
+    if isinstance(source, Transaction):
+        return source.date
+    if isinstance(source, Group):
+        return source.monthEndDate
+    return None
+
+
+def entryAmount(entry: BookingEntry) -> Optional[float]:
+    source = entry.source
+    if isinstance(source, Transaction):
+        return source.amount
+    if isinstance(source, Group):
+        return source.totalAmount
+    return None
+
+
+def entryRemarks(entry: BookingEntry) -> str:
+    source = entry.source
+    if isinstance(source, Transaction) and source.hasForeignCurrency:
+        return f"{source.foreignCurrency} {source.foreignAmount:.2f}"
+    return ""
+
+
+def formatDate(date: datetime, dateFormat: Optional[str]) -> str:
+    return date.strftime(DATE_FORMATS.get(dateFormat, DEFAULT_DATE_FORMAT))
+
+
+def isRemarksColumn(column: ColumnConfig) -> bool:
+    # optional columns named like the remarks column hold the remarks as well
+    return column.type == "remarks" or (not column.type and column.name in REMARKS_COLUMN_NAMES)
+
+
+def textOf(column: ColumnConfig, entry: BookingEntry) -> str:
+    # value of a text column (description, accounts, remarks); other columns are empty
+    if column.type == "description":
+        return entry.mappedDescription
+    if column.type == "debitAccount":
+        return entry.debitAccount or ""
+    if column.type == "creditAccount":
+        return entry.creditAccount
+    if isRemarksColumn(column):
+        return entryRemarks(entry)
+    return ""
+
+
+def compileColumnValues(columns: Sequence[ColumnConfig]) -> Tuple[Callable[[BookingEntry], ColumnValue], ...]:
+    # one value producer per configured column, resolved once, for the text backends
+    return tuple(_compileColumn(column) for column in columns)
+
+
+def _compileColumn(column: ColumnConfig) -> Callable[[BookingEntry], ColumnValue]:
+    if column.type == "date":
+        strftimeFormat = DATE_FORMATS.get(column.format, DEFAULT_DATE_FORMAT)
+
+        def dateValue(entry: BookingEntry) -> Optional[str]:
+            date = entryDate(entry)
+            return date.strftime(strftimeFormat) if date is not None else None
+        return dateValue
+    if column.type == "amountChf":
+        def amountValue(entry: BookingEntry) -> Optional[float]:
+            amount = entryAmount(entry)
+            return round(amount, 2) if amount is not None else None
+        return amountValue
+    return lambda entry: textOf(column, entry) or None
@@ -1,32 +1,53 @@
 import json
 import re
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List, Optional, Union
+from types import MappingProxyType
+from typing import FrozenSet, List, Mapping, Optional, Pattern, Tuple, Union
 
 from logging_config import getLogger
 
 logger = getLogger(__name__)
 
 
-@dataclass
+@dataclass(frozen=True)
 class ColumnConfig:
     name: str
     type: Optional[str] = None
     format: Optional[str] = None
 
 
-@dataclass
+@dataclass(frozen=True)
 class MappingRule:
     description: str
     debitAccount: str
     pattern: Optional[str] = None
+    regex: Optional[Pattern] = field(default=None, init=False, repr=False, compare=False)
 
+    def __post_init__(self):
+        if self.pattern:
+            object.__setattr__(self, 'regex', re.compile(self.pattern, re.IGNORECASE))
 
-@dataclass
+    def matches(self, text: str) -> bool:
+        return self.regex is not None and self.regex.search(text) is not None
+
+
+@dataclass(frozen=True)
 class IgnoreRules:
-    categories: List[str]
-    transactions: List[str]
+    categories: Tuple[str, ...]
+    transactions: Tuple[str, ...]
+    categoryKeys: FrozenSet[str] = field(init=False, repr=False, compare=False)
+    transactionRegexes: Tuple[Pattern, ...] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, 'categoryKeys', frozenset(c.casefold() for c in self.categories))
+        object.__setattr__(self, 'transactionRegexes', tuple(re.compile(p, re.IGNORECASE) for p in self.transactions))
+
+    def ignoresCategory(self, category: str) -> bool:
+        return category.casefold() in self.categoryKeys
+
+    def ignoresMerchant(self, merchant: str) -> bool:
+        return any(regex.search(merchant) for regex in self.transactionRegexes)
 
 
 class Configuration:
@@ -36,6 +57,7 @@ class Configuration:
         self.configPath = configPath
         self.__loadConfiguration()
         self.__validateConfiguration()
+        self.__compileConfiguration()
 
     def __loadConfiguration(self) -> None:
         # Load configuration from JSON file
@@ -55,10 +77,10 @@ class Configuration:
 
     def __validateConfiguration(self) -> None:
         requiredFields = ['creditAccount', 'mapping', 'columns']
-        for field in requiredFields:
-            if field not in self._config:
-                logger.error("Missing required configuration field; field='%s'", field)
-                raise ValueError(f"Missing required configuration field: {field}")
+        for requiredField in requiredFields:
+            if requiredField not in self._config:
+                logger.error("Missing required configuration field; field='%s'", requiredField)
+                raise ValueError(f"Missing required configuration field: {requiredField}")
 
         if not isinstance(self._config['creditAccount'], str):
             logger.error("Invalid creditAccount type; type='%s'", type(self._config['creditAccount']).__name__)
@@ -113,51 +135,61 @@ class Configuration:
             logger.error("Invalid regex pattern; context='%s', pattern='%s', error='%s'", context, pattern, exc)
             raise ValueError(f"Invalid regex pattern in {context}: {pattern}") from exc
 
-    @property
-    def creditAccount(self) -> str:
-        return self._config['creditAccount']
-
-    @property
-    def ignoreRules(self) -> IgnoreRules:
+    def __compileConfiguration(self) -> None:
+        # Build the immutable rule, ignore and column views once; every stage shares them
         ignoreConfig = self._config.get('ignore', {})
-        return IgnoreRules(
-            categories=ignoreConfig.get('categories', []),
-            transactions=ignoreConfig.get('transactions', [])
+        self.__ignoreRules = IgnoreRules(
+            categories=tuple(ignoreConfig.get('categories', [])),
+            transactions=tuple(ignoreConfig.get('transactions', []))
         )
 
-    @property
-    def mappingRules(self) -> Dict[str, List[MappingRule]]:
-        rules: Dict[str, List[MappingRule]] = {}
+        rules = {}
         for category, ruleOrRules in self._config['mapping'].items():
             ruleList: Union[List[dict], dict] = ruleOrRules if isinstance(ruleOrRules, list) else [ruleOrRules]
-            rules[category] = [
+            rules[category] = tuple(
                 MappingRule(
                     description=r['description'],
                     debitAccount=r['debitAccount'],
                     pattern=r.get('pattern')
                 )
                 for r in ruleList
-            ]
-        return rules
+            )
+        self.__mappingRules = MappingProxyType(rules)
 
-    @property
-    def columns(self) -> List[ColumnConfig]:
-        columns = []
-        for columnConfig in self._config['columns']:
-            columns.append(ColumnConfig(
+        self.__columns = tuple(
+            ColumnConfig(
                 name=columnConfig['name'],
                 type=columnConfig.get('type'),
                 format=columnConfig.get('format')
-            ))
-        return columns
+            )
+            for columnConfig in self._config['columns']
+        )
+        self.__coreColumns = tuple(col for col in self.__columns if col.type is not None)
+        self.__optionalColumns = tuple(col for col in self.__columns if col.type is None)
+
+    @property
+    def creditAccount(self) -> str:
+        return self._config['creditAccount']
+
+    @property
+    def ignoreRules(self) -> IgnoreRules:
+        return self.__ignoreRules
+
+    @property
+    def mappingRules(self) -> Mapping[str, Tuple[MappingRule, ...]]:
+        return self.__mappingRules
+
+    @property
+    def columns(self) -> Tuple[ColumnConfig, ...]:
+        return self.__columns
 
-    def getCoreColumns(self) -> List[ColumnConfig]:
+    def getCoreColumns(self) -> Tuple[ColumnConfig, ...]:
         # Columns with type field (containing actual data)
-        return [col for col in self.columns if col.type is not None]
+        return self.__coreColumns
 
-    def getOptionalColumns(self) -> List[ColumnConfig]:
+    def getOptionalColumns(self) -> Tuple[ColumnConfig, ...]:
         # Columns without type field (used for formatting/compatibility)
-        return [col for col in self.columns if col.type is None]
+        return self.__optionalColumns
 
     @classmethod
     def fromDirectory(cls, directory: Path) -> 'Configuration':
@@ -0,0 +1,144 @@
+import hashlib
+import json
+import os
+import tempfile
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+
+from logging_config import getLogger
+from parsers.dateRange import DateRange
+from parsers.directoryParser import DirectoryParser
+from parsers.parseCache import ParseCache
+from parsers.textParser import TextParser
+from parsers.transaction import Transaction
+
+logger = getLogger(__name__)
+
+
+class RunManifest:
+    # Per export file: content hash, size and mtime (to skip rehashing untouched files) and the months it
+    # holds transactions of; per output file: the fingerprint of the inputs it was generated from
+    FILE_NAME = 'manifest.json'
+    VERSION = 1
+
+    def __init__(self, cacheDirectory: Path):
+        self.path = cacheDirectory / self.FILE_NAME
+        self.files: Dict[str, dict] = {}
+        self.outputs: Dict[str, str] = {}
+        self.__load()
+
+    @classmethod
+    def forDataFolder(cls, folder: Path) -> 'RunManifest':
+        return cls(folder / ParseCache.DIRECTORY_NAME)
+
+    def fileHash(self, file: Path) -> str:
+        stat = file.stat()
+        entry = self.files.get(file.name)
+        if entry and entry['size'] == stat.st_size and entry['mtimeNs'] == stat.st_mtime_ns:
+            return entry['hash']
+        return ParseCache.hashFile(file)
+
+    def monthsOf(self, file: Path, fileHash: str) -> Optional[List[str]]:
+        entry = self.files.get(file.name)
+        if entry and entry['hash'] == fileHash:
+            return entry['months']
+        return None
+
+    def recordFile(self, file: Path, fileHash: str, months: Set[str]) -> None:
+        stat = file.stat()
+        self.files[file.name] = {'hash': fileHash, 'size': stat.st_size, 'mtimeNs': stat.st_mtime_ns, 'months': sorted(months)}
+
+    def retainFiles(self, files: Iterable[Path]) -> None:
+        names = {file.name for file in files}
+        self.files = {name: entry for name, entry in self.files.items() if name in names}
+
+    def isCurrent(self, outputFile: Path, fingerprint: str) -> bool:
+        return outputFile.exists() and self.outputs.get(outputFile.name) == fingerprint
+
+    def recordOutput(self, outputFile: Path, fingerprint: str) -> None:
+        self.outputs[outputFile.name] = fingerprint
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tempPath = tempfile.mkstemp(dir=self.path.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as file:
+                json.dump({'version': self.VERSION, 'files': self.files, 'outputs': self.outputs}, file, ensure_ascii=False, indent=1)
+            os.replace(tempPath, self.path)
+        except Exception:
+            Path(tempPath).unlink(missing_ok=True)
+            raise
+
+    def __load(self) -> None:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as file:
+                data = json.load(file)
+        except FileNotFoundError:
+            return
+        except ValueError as exc:
+            logger.warning("Discarding unreadable run manifest; path='%s', error='%s'", self.path, exc)
+            return
+        if not isinstance(data, dict) or data.get('version') != self.VERSION:
+            logger.info("Discarding run manifest of another version; path='%s'", self.path)
+            return
+        self.files = data.get('files', {})
+        self.outputs = data.get('outputs', {})
+
+
+class IncrementalRun:
+    # Only export files that are new or changed since the last run get parsed (to learn their months; the
+    # parse cache keeps the result), a target month is built from the files holding transactions of it, and
+    # an output whose month, files, configuration and program version are unchanged is not generated again
+    def __init__(self, folder: Path, directoryParser: DirectoryParser, filePattern: str = "*.txt"):
+        # Args: directoryParser - parser with a parse cache, so indexed files are not parsed twice
+        self.directoryParser = directoryParser
+        self.manifest = RunManifest.forDataFolder(folder)
+        self.fileHashes = {file: self.manifest.fileHash(file) for file in sorted(folder.glob(filePattern))}
+        self.monthFiles = self.__indexMonths()
+
+    def filesOf(self, month: datetime) -> List[Path]:
+        return self.monthFiles.get(month.strftime('%Y-%m'), [])
+
+    def fingerprint(self, month: datetime, configPath: Path, programVersion: str) -> str:
+        digest = hashlib.sha256()
+        digest.update(f"{programVersion}|{TextParser.PARSER_VERSION}|{self.directoryParser.deduplicate}|"
+                      f"{month:%Y-%m}|{ParseCache.hashFile(configPath)}".encode())
+        for file in self.filesOf(month):
+            digest.update(f"|{file.name}={self.fileHashes[file]}".encode())
+        return digest.hexdigest()
+
+    def isCurrent(self, outputFile: Path, fingerprint: str) -> bool:
+        return self.manifest.isCurrent(outputFile, fingerprint)
+
+    def transactions(self, month: datetime) -> Iterator[Transaction]:
+        files = self.filesOf(month)
+        logger.info("Parsing files of month; month='%s', files=%d, skipped=%d",
+                    month.strftime('%Y-%m'), len(files), len(self.fileHashes) - len(files))
+        return self.directoryParser.parseFiles(files, DateRange.forMonth(month), self.fileHashes)
+
+    def recordOutput(self, outputFile: Path, fingerprint: str) -> None:
+        self.manifest.recordOutput(outputFile, fingerprint)
+
+    def complete(self, outputFile: Optional[Path] = None, fingerprint: Optional[str] = None) -> None:
+        if outputFile is not None:
+            self.recordOutput(outputFile, fingerprint)
+        self.manifest.save()
+        if self.directoryParser.cache is not None:
+            self.directoryParser.cache.prune(self.fileHashes.values())
+
+    def __indexMonths(self) -> Dict[str, List[Path]]:
+        unindexed = [file for file, fileHash in self.fileHashes.items() if self.manifest.monthsOf(file, fileHash) is None]
+        logger.info("Indexing export files; files=%d, newOrChanged=%d", len(self.fileHashes), len(unindexed))
+        for file, transactions in self.directoryParser.parseEachFile(unindexed, None, self.fileHashes):
+            months = {transaction.date.strftime('%Y-%m') for transaction in transactions}
+            self.manifest.recordFile(file, self.fileHashes[file], months)
+            logger.debug("Indexed file; path='%s', months=%s", file, sorted(months))
+        self.manifest.retainFiles(self.fileHashes)
+
+        monthFiles: Dict[str, List[Path]] = defaultdict(list)
+        for file, fileHash in self.fileHashes.items():
+            for month in self.manifest.monthsOf(file, fileHash):
+                monthFiles[month].append(file)
+        return monthFiles
@@ -1,6 +1,7 @@
 import logging
 import sys
 from pathlib import Path
+from typing import TextIO
 
 
 LOG_DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
@@ -23,12 +24,13 @@ class ColorFormatter(logging.Formatter):
         return super().format(record)
 
 
-def setupLogging(logLevel: str = "INFO", logFile: Path = Path('onecreditcard.log')) -> None:
+def setupLogging(logLevel: str = "INFO", logFile: Path = Path('onecreditcard.log'), consoleStream: TextIO = None) -> None:
     # Configure logging with console and optional file output
+    # Args: consoleStream - console log stream (default: stdout), stderr when stdout carries output data
     level = getattr(logging, logLevel.upper(), logging.INFO)
 
     # Console handler
-    consoleHandler = logging.StreamHandler(sys.stdout)
+    consoleHandler = logging.StreamHandler(consoleStream or sys.stdout)
     consoleHandler.setFormatter(ColorFormatter(LOG_FORMAT, datefmt=LOG_DATE_FORMAT))
 
     # Configure root logger
@@ -1,8 +1,13 @@
 #!/usr/bin/env python3
 import argparse
+import cProfile
+import hashlib
+import multiprocessing
 import sys
 from datetime import datetime, timedelta
+from itertools import chain
 from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
 try:
     from _version import __version__
@@ -13,15 +18,34 @@ except ModuleNotFoundError:
     except PackageNotFoundError:
         __version__ = "0.0.0.dev0"
 
-from accountMapper import AccountMapper
+import runProfile
+from accountMapper import BookingEntry
 from configuration import Configuration
+from incrementalRun import IncrementalRun
 from logging_config import setupLogging, getLogger
+from memorySnapshots import DEFAULT_TOP_SITES, MemorySnapshots
+from monthBatch import MonthBatch, dateRangeOf, monthsBetween, partitionByMonth
 from odsGenerator import OdsGenerator
+from outputWriter import OUTPUT_FORMATS, OutputWriter
+from parsers.dateRange import DateRange
 from parsers.directoryParser import DirectoryParser
-from transactionGrouper import TransactionGrouper
+from parsers.parseCache import ParseCache
+from parsers.transaction import Transaction
+from ruleResolver import RuleResolver
+from runProfile import RunProfile
+from traceEvents import TraceRecorder
+from transactionClassifier import TransactionClassifier
+from transactionGrouper import Group
+from transactionStore import TransactionStore
 
 logger = getLogger(__name__)
 
+OUTPUT_BASE_NAME = 'bookings'
+PROFILE_FILE_NAME = f'{OUTPUT_BASE_NAME}.profile.json'
+PSTATS_FILE_NAME = f'{OUTPUT_BASE_NAME}.pstats'
+MEMORY_SNAPSHOTS_FILE_NAME = f'{OUTPUT_BASE_NAME}.memory.txt'
+TRACE_FILE_NAME = f'{OUTPUT_BASE_NAME}.trace.json'
+
 
 def createArgumentParser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
@@ -36,11 +60,55 @@ Examples:
   # Specify custom data folder and month
   onecreditcard --folder /path/to/exports --month 2025-07
 
+  # Backfill a year: parse once, write bookings_2025-01.ods .. bookings_2025-12.ods in 4 processes
+  onecreditcard --from 2025-01 --to 2025-12 --jobs 4
+
+  # Year-end closing: one workbook bookings_2025.ods with a sheet per month and a summary sheet
+  onecreditcard --year 2025
+
   # Use custom config file
   onecreditcard --config custom-config.json
 
   # Enable debug logging
   onecreditcard --log-level DEBUG
+
+  # Parse export files in 4 parallel processes
+  onecreditcard --jobs 4
+
+  # Reuse parse results of unchanged export files from previous runs
+  onecreditcard --cache
+
+  # Only parse exports added or changed since the last run, skip an up to date output
+  onecreditcard --incremental
+
+  # Aggregate the groups of a multi-year batch in one columnar pass (vectorized with NumPy when installed)
+  onecreditcard --from 2020-01 --to 2025-12 --columnar
+
+  # Book transactions contained in several overlapping exports every time (deduplicated by default)
+  onecreditcard --no-deduplicate
+
+  # Write the bookings as ODS and CSV in one pass
+  onecreditcard --format ods,csv
+
+  # Stream the bookings as JSON Lines to stdout (log messages go to stderr)
+  onecreditcard --format jsonl | jq .
+
+  # Write stage timings, memory peaks and cache hit rates of the run to bookings.profile.json
+  onecreditcard --profile
+
+  # Same without the Python allocation peak, for stage times undistorted by allocation tracing
+  onecreditcard --profile timing
+
+  # Run under cProfile, then list the 20 most expensive functions
+  onecreditcard --cprofile
+  python -m pstats bookings.pstats <<< "sort cumulative
+stats 20"
+
+  # Top 15 allocation sites at every stage boundary, written to bookings.memory.txt
+  onecreditcard --memory-snapshots 15
+
+  # Timeline of stages, parsed files and workbooks of a parallel batch, open bookings.trace.json in ui.perfetto.dev
+  onecreditcard --from 2025-01 --to 2025-12 --jobs 4 --trace
         '''
     )
     parser.add_argument(
@@ -60,12 +128,102 @@ Examples:
         default=None,
         help='Processing month in YYYY-MM format (default: previous month)'
     )
+    parser.add_argument(
+        '--from',
+        dest='fromMonth',
+        type=str,
+        default=None,
+        help='First month of a batch in YYYY-MM format, one output per month named bookings_YYYY-MM (excludes --month)'
+    )
+    parser.add_argument(
+        '--to',
+        dest='toMonth',
+        type=str,
+        default=None,
+        help='Last month of a batch in YYYY-MM format (default: previous month)'
+    )
+    parser.add_argument(
+        '--year', '-y',
+        type=str,
+        default=None,
+        help='Year in YYYY format, one workbook bookings_YYYY.ods with a sheet per month and a summary sheet (excludes --month, --from, --to)'
+    )
     parser.add_argument(
         '--config', '-c',
         type=Path,
         default=None,
         help='Configuration file path (default: {folder}/onecreditcard.json)'
     )
+    parser.add_argument(
+        '--jobs', '-j',
+        type=int,
+        default=1,
+        help='Number of processes parsing export files, and writing the months of a batch, in parallel (default: 1)'
+    )
+    parser.add_argument(
+        '--mmap',
+        action='store_true',
+        help='Scan memory-mapped export files as bytes instead of reading them into memory'
+    )
+    parser.add_argument(
+        '--cache',
+        action='store_true',
+        help='Reuse parsed transactions of unchanged export files, kept in {folder}/.onecreditcard-cache'
+    )
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help='Only parse export files added or changed since the last run and keep an up to date output (implies --cache)'
+    )
+    parser.add_argument(
+        '--deduplicate',
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help='Drop transactions already contained in an earlier export file (by Viseca transaction ID, else by content); '
+             '--no-deduplicate books every copy (default: on)'
+    )
+    parser.add_argument(
+        '--columnar',
+        action='store_true',
+        help='Aggregate the groups of all months of --from/--to and --year in one pass over a columnar store, '
+             'vectorized with NumPy when installed'
+    )
+    parser.add_argument(
+        '--format',
+        type=str,
+        default='ods',
+        help=f"Comma separated output formats out of {', '.join(OUTPUT_FORMATS)}; jsonl is written to stdout (default: ods)"
+    )
+    parser.add_argument(
+        '--profile',
+        nargs='?',
+        const='full',
+        choices=['full', 'timing'],
+        default=None,
+        help=f'Write wall and CPU time per stage and file, memory peaks and cache hit rates to {{folder}}/{PROFILE_FILE_NAME}; '
+             'timing leaves out tracing Python allocations, which slows the run down several times (default: full)'
+    )
+    parser.add_argument(
+        '--cprofile',
+        action='store_true',
+        help=f'Run under cProfile and write the statistics to {{folder}}/{PSTATS_FILE_NAME} (worker processes of --jobs are not profiled)'
+    )
+    parser.add_argument(
+        '--memory-snapshots',
+        type=int,
+        nargs='?',
+        const=DEFAULT_TOP_SITES,
+        default=None,
+        metavar='SITES',
+        help=f'Take tracemalloc snapshots where the stages start and end and write the top allocation sites to '
+             f'{{folder}}/{MEMORY_SNAPSHOTS_FILE_NAME} (default: {DEFAULT_TOP_SITES} sites)'
+    )
+    parser.add_argument(
+        '--trace',
+        action='store_true',
+        help=f'Write a timeline of the stages, parsed files and written workbooks, worker processes included, to '
+             f'{{folder}}/{TRACE_FILE_NAME} (Chrome trace-event format, opened with Perfetto or chrome://tracing)'
+    )
     parser.add_argument(
         '--log-level',
         choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'],
@@ -109,56 +267,240 @@ def loadConfig(args) -> Configuration:
     if not configPath.exists():
         logger.error("Configuration file not found; path='%s'", configPath)
         raise FileNotFoundError(f"Configuration file not found: {configPath}")
-    return Configuration(configPath)
-
-def parseTransactions(folder: Path, targetMonth: datetime) -> list:
-    directoryParser = DirectoryParser()
-    allTransactions = directoryParser.parse(folder)
-    lastMonthTransactions = [
-        t for t in allTransactions
-        if t.date.year == targetMonth.year and t.date.month == targetMonth.month
-    ]
-    return lastMonthTransactions
-
-def groupTransactions(transactions: list, config: Configuration) -> tuple:
-    grouper = TransactionGrouper(config)
-    individualTransactions, groups = grouper.group(iter(transactions))
-    return individualTransactions, groups
-
-def mapToBookingEntries(individualTransactions: list, groups: list, config: Configuration) -> list:
-    mapper = AccountMapper(config)
-    entries = list(mapper.mapTransactions(individualTransactions))
-    entries.extend(list(mapper.mapGroups(groups)))
-    return entries
-
-def generateOdsFile(config: Configuration, entries: list, outputPath: Path) -> None:
-    outputFile = outputPath / 'bookings.ods'
-    generator = OdsGenerator(config)
-    generator.generate(entries, outputFile)
-    logger.info("Processing completed successfully; output_file='%s', entries=%d", outputFile, len(entries))
+    with runProfile.stage("configLoad"):
+        return Configuration(configPath)
+
+def evaluateMonthRange(fromStr: str = None, toStr: str = None) -> List[datetime]:
+    if not fromStr:
+        logger.error("Month range without first month; to='%s'", toStr)
+        raise ValueError("--to requires --from")
+    return monthsBetween(evaluateTargetMonth(fromStr), evaluateTargetMonth(toStr))
+
+def evaluateYear(yearStr: str) -> List[datetime]:
+    try:
+        year = datetime.strptime(yearStr, '%Y').year
+    except ValueError as exc:
+        logger.error("Invalid year format; year='%s'", yearStr)
+        raise ValueError(f"Invalid year format: {yearStr}. Use YYYY") from exc
+    return monthsBetween(datetime(year, 1, 1), datetime(year, 12, 1))
+
+def createDirectoryParser(args, useCache: bool) -> DirectoryParser:
+    cache = ParseCache.forDataFolder(args.folder) if useCache else None
+    return DirectoryParser(args.jobs, args.mmap, cache, args.deduplicate)
+
+def parseTransactions(directoryParser: DirectoryParser, folder: Path, dateRange: DateRange) -> Iterator[Transaction]:
+    # the date filter is pushed down into the parser, out-of-range blocks are never decoded
+    return directoryParser.parse(folder, dateRange=dateRange)
+
+def prepareIncrementalRun(args) -> IncrementalRun:
+    return IncrementalRun(args.folder, createDirectoryParser(args, useCache=True))
+
+def classifyTransactions(transactions: Iterable[Transaction], config: Configuration, resolver: RuleResolver,
+                         groups: Optional[List[Group]] = None) -> Iterator[BookingEntry]:
+    classifier = TransactionClassifier(config, resolver)
+    # grouping and mapping run in one pass over the transactions, profiled as one stage
+    return runProfile.timed("classify", classifier.stream(transactions, groups))
+
+def aggregateGroups(transactionsByMonth: Dict[str, Iterable[Transaction]],
+                    resolver: RuleResolver) -> Tuple[Dict[str, List[Transaction]], Dict[str, List[Group]]]:
+    # --columnar: the groups of every month in one aggregation over a columnar store, which needs all
+    # transactions of the range in memory; returns them per month along with the groups
+    transactionsByMonth = {month: transactions if isinstance(transactions, list) else list(runProfile.timed("parse", transactions))
+                           for month, transactions in transactionsByMonth.items()}
+    with runProfile.stage("group"):
+        store = TransactionStore.fromTransactions(chain.from_iterable(transactionsByMonth.values()))
+        groupsByMonth = store.groupsByMonth(resolver)
+    logger.info("Groups aggregated in columnar store; transactions=%d, months=%d, numpy=%s",
+                len(store), len(groupsByMonth), store.useNumpy)
+    return transactionsByMonth, groupsByMonth
+
+def generateOutputs(writer: OutputWriter, entries: Iterable[BookingEntry], outputPath: Path) -> None:
+    with runProfile.stage("write"):
+        rowCount = writer.write(entries, outputPath, OUTPUT_BASE_NAME)
+    logger.info("Processing completed successfully; output_files=%s, entries=%d",
+                [str(outputFile) for outputFile in writer.outputFiles(outputPath, OUTPUT_BASE_NAME)], rowCount)
+
+def parseFormats(formats: str) -> List[str]:
+    return [outputFormat.strip().lower() for outputFormat in formats.split(',') if outputFormat.strip()]
+
+def processMonth(args, config: Configuration, formats: List[str], targetMonth: datetime) -> int:
+    writer = OutputWriter(config, formats)
+    outputFiles = writer.outputFiles(args.folder, OUTPUT_BASE_NAME)
+
+    incrementalRun = None
+    if args.incremental:
+        incrementalRun = prepareIncrementalRun(args)
+        fingerprint = incrementalRun.fingerprint(targetMonth, config.configPath, __version__)
+        # output on stdout is never up to date
+        if not writer.writesToStdout and all(incrementalRun.isCurrent(outputFile, fingerprint) for outputFile in outputFiles):
+            incrementalRun.complete()
+            logger.info("Output is up to date, no export of the month changed; output_files=%s",
+                        [str(outputFile) for outputFile in outputFiles])
+            return 0
+        lastMonthTransactions = incrementalRun.transactions(targetMonth)
+    else:
+        lastMonthTransactions = parseTransactions(createDirectoryParser(args, args.cache), args.folder,
+                                                  DateRange.forMonth(targetMonth))
+
+    # transactions stream from the parser through the classifier into the writer
+    resolver = RuleResolver(config)
+    entries = classifyTransactions(runProfile.timed("parse", lastMonthTransactions), config, resolver)
+    generateOutputs(writer, entries, args.folder)
+    resolver.logCacheStatistics()
+    runProfile.recordCache("ruleResolver", resolver.cacheHits, resolver.cacheMisses)
+    if incrementalRun is not None:
+        for outputFile in outputFiles:
+            incrementalRun.recordOutput(outputFile, fingerprint)
+        incrementalRun.complete()
+    return 0
+
+def processMonthRange(args, config: Configuration, formats: List[str], months: List[datetime]) -> int:
+    # the folder is parsed once for the whole range, each month is classified and written on its own
+    batch = MonthBatch(config, formats, args.jobs, OUTPUT_BASE_NAME)
+
+    incrementalRun = None
+    if args.incremental:
+        incrementalRun = prepareIncrementalRun(args)
+        fingerprints = {f"{month:%Y-%m}": incrementalRun.fingerprint(month, config.configPath, __version__) for month in months}
+        pendingMonths = [month for month in months if batch.writer.writesToStdout or not all(
+            incrementalRun.isCurrent(outputFile, fingerprints[f"{month:%Y-%m}"])
+            for outputFile in batch.outputFiles(args.folder, f"{month:%Y-%m}"))]
+        logger.info("Months to generate; months=%d, upToDate=%d", len(pendingMonths), len(months) - len(pendingMonths))
+        transactionsByMonth = {f"{month:%Y-%m}": list(runProfile.timed("parse", incrementalRun.transactions(month)))
+                               for month in pendingMonths}
+    else:
+        transactions = parseTransactions(createDirectoryParser(args, args.cache), args.folder, dateRangeOf(months))
+        transactionsByMonth = partitionByMonth(runProfile.timed("parse", transactions), months)
+
+    groupsByMonth = None
+    if args.columnar:
+        transactionsByMonth, groupsByMonth = aggregateGroups(transactionsByMonth, RuleResolver(config))
+
+    with runProfile.stage("write"):
+        rowCounts = batch.write(transactionsByMonth, args.folder, groupsByMonth)
+    for month, rowCount in rowCounts.items():
+        logger.info("Month processed; month='%s', output_files=%s, entries=%d",
+                    month, [str(outputFile) for outputFile in batch.outputFiles(args.folder, month)], rowCount)
+    if incrementalRun is not None:
+        for month in rowCounts:
+            for outputFile in batch.outputFiles(args.folder, month):
+                incrementalRun.recordOutput(outputFile, fingerprints[month])
+        incrementalRun.complete()
+    logger.info("Processing completed successfully; months=%d, entries=%d", len(rowCounts), sum(rowCounts.values()))
+    return 0
+
+def processYear(args, config: Configuration, formats: List[str], months: List[datetime]) -> int:
+    # parsed once, then each month is classified on its own and streamed into its sheet of one workbook
+    if formats != ['ods']:
+        logger.error("Yearly workbook in other format; formats=%s", formats)
+        raise ValueError("--year writes an ODS workbook, other formats are not supported")
+    outputFile = args.folder / f"{OUTPUT_BASE_NAME}_{months[0]:%Y}.ods"
+
+    incrementalRun = None
+    if args.incremental:
+        incrementalRun = prepareIncrementalRun(args)
+        fingerprint = hashlib.sha256("|".join(
+            incrementalRun.fingerprint(month, config.configPath, __version__) for month in months).encode()).hexdigest()
+        if incrementalRun.isCurrent(outputFile, fingerprint):
+            incrementalRun.complete()
+            logger.info("Output is up to date, no export of the year changed; output_file='%s'", outputFile)
+            return 0
+        transactionsByMonth = {f"{month:%Y-%m}": incrementalRun.transactions(month) for month in months}
+    else:
+        transactions = parseTransactions(createDirectoryParser(args, args.cache), args.folder, dateRangeOf(months))
+        transactionsByMonth = partitionByMonth(runProfile.timed("parse", transactions), months)
+
+    resolver = RuleResolver(config)
+    groupsByMonth = None
+    if args.columnar:
+        transactionsByMonth, groupsByMonth = aggregateGroups(transactionsByMonth, resolver)
+    monthEntries = ((month, classifyTransactions(transactions, config, resolver,
+                                                 None if groupsByMonth is None else groupsByMonth.get(month, [])))
+                    for month, transactions in transactionsByMonth.items())
+    with runProfile.stage("write"):
+        rowCount = OdsGenerator(config).generateWorkbook(monthEntries, outputFile)
+    resolver.logCacheStatistics()
+    runProfile.recordCache("ruleResolver", resolver.cacheHits, resolver.cacheMisses)
+    if incrementalRun is not None:
+        incrementalRun.complete(outputFile, fingerprint)
+    logger.info("Processing completed successfully; output_file='%s', entries=%d", outputFile, rowCount)
+    return 0
+
+def writeDiagnostics(args, profile: Optional[RunProfile], snapshots: Optional[MemorySnapshots],
+                     profiler: Optional[cProfile.Profile], tracer: Optional[TraceRecorder]) -> None:
+    # written next to the bookings, for failed runs too as long as the folder exists
+    if profile is not None:
+        profile.stop()
+    if snapshots is not None:
+        snapshots.stop()
+    if not args.folder.is_dir():
+        return
+    if profile is not None:
+        arguments = {name: str(value) if isinstance(value, Path) else value for name, value in vars(args).items()}
+        profile.write(args.folder / PROFILE_FILE_NAME, arguments)
+    if snapshots is not None:
+        snapshots.write(args.folder / MEMORY_SNAPSHOTS_FILE_NAME)
+    if tracer is not None:
+        tracer.write(args.folder / TRACE_FILE_NAME)
+    if profiler is not None:
+        profiler.dump_stats(args.folder / PSTATS_FILE_NAME)
+        logger.info("cProfile statistics written; path='%s'", args.folder / PSTATS_FILE_NAME)
 
 def main():
     parser = createArgumentParser()
     args = parser.parse_args()
 
-    setupLogging(args.log_level, args.log_file)
+    formats = parseFormats(args.format)
+    # stdout carries the JSON Lines, log messages move to stderr
+    setupLogging(args.log_level, args.log_file, sys.stderr if 'jsonl' in formats else None)
 
+    # all off by default; the pipeline then only checks for observers, cProfile is never enabled
+    profile = RunProfile(traceMemory=args.profile == 'full').start() if args.profile else None
+    snapshots = MemorySnapshots(args.memory_snapshots).start() if args.memory_snapshots else None
+    tracer = TraceRecorder() if args.trace else None
+    runProfile.activate(profile, tracer, snapshots)
+    profiler = cProfile.Profile() if args.cprofile else None
+    if profiler is not None:
+        profiler.enable()
     try:
         validateFolder(args.folder)
+        if args.year:
+            if args.month or args.fromMonth or args.toMonth:
+                logger.error("Year and month given; year='%s'", args.year)
+                raise ValueError("--year cannot be combined with --month, --from or --to")
+            months = evaluateYear(args.year)
+            config = loadConfig(args)
+            logger.info("Starting processing; folder='%s', year='%s'", args.folder, args.year)
+            return processYear(args, config, formats, months)
+
+        if args.fromMonth or args.toMonth:
+            if args.month:
+                logger.error("Month and month range given; month='%s'", args.month)
+                raise ValueError("--month cannot be combined with --from/--to")
+            months = evaluateMonthRange(args.fromMonth, args.toMonth)
+            config = loadConfig(args)
+            logger.info("Starting processing; folder='%s', from='%s', to='%s'", args.folder, f"{months[0]:%Y-%m}", f"{months[-1]:%Y-%m}")
+            return processMonthRange(args, config, formats, months)
+
         targetMonth = evaluateTargetMonth(args.month)
         config = loadConfig(args)
-
         logger.info("Starting processing; folder='%s'", args.folder)
-
-        lastMonthTransactions = parseTransactions(args.folder, targetMonth)
-        individualTransactions, groups = groupTransactions(lastMonthTransactions, config)
-        entries = mapToBookingEntries(individualTransactions, groups, config)
-        generateOdsFile(config, entries, args.folder)
-        return 0
+        return processMonth(args, config, formats, targetMonth)
 
     except Exception as exc:
         logger.error("Processing failed; error='%s'", exc)
         return 1
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        runProfile.activate()
+        # the diagnostics cannot change the outcome of the run
+        try:
+            writeDiagnostics(args, profile, snapshots, profiler, tracer)
+        except Exception as exc:
+            logger.error("Diagnostics could not be written; error='%s'", exc)
 
 if __name__ == "__main__":
+    # required for process pools in the frozen executable
+    multiprocessing.freeze_support()
     sys.exit(main())
@@ -0,0 +1,89 @@
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional
+
+from logging_config import getLogger
+from runProfile import StageObserver
+
+logger = getLogger(__name__)
+
+DEFAULT_TOP_SITES = 10
+
+# allocations of the tracing itself and of imports are noise in the report; dropped from the statistics,
+# filtering the traces of a snapshot instead costs more than taking it
+_IGNORED_FILES = frozenset({tracemalloc.__file__, "<frozen importlib._bootstrap>",
+                            "<frozen importlib._bootstrap_external>", "<unknown>"})
+
+
+class MemorySnapshots(StageObserver):
+    # Takes a tracemalloc snapshot where a pipeline stage starts and ends and reports the top allocation
+    # sites of each, with the growth since the previous snapshot. Streaming stages interleave, so parse,
+    # classify and write start before any of them ends; files parsed within a stage are not snapshotted.
+    def __init__(self, topSites: int = DEFAULT_TOP_SITES):
+        # Args: topSites - number of allocation sites (source lines) reported per snapshot
+        self.topSites = topSites
+        self.lines: List[str] = []
+        self.snapshotCount = 0
+        self.__tracing = False
+        self.__previous: Optional[tracemalloc.Snapshot] = None
+        self.__start = time.perf_counter()
+
+    def start(self) -> 'MemorySnapshots':
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.__tracing = True
+        self.__start = time.perf_counter()
+        self.snapshot("start")
+        return self
+
+    def stop(self) -> None:
+        self.snapshot("end")
+        self.__previous = None
+        if self.__tracing:
+            tracemalloc.stop()
+            self.__tracing = False
+
+    def snapshot(self, label: str) -> None:
+        if not tracemalloc.is_tracing():
+            return
+        current, peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot()
+        self.snapshotCount += 1
+        self.lines.append(f"== {label} (+{time.perf_counter() - self.__start:.3f} s): "
+                          f"traced={current / 1024:.1f} KiB, peak={peak / 1024:.1f} KiB")
+        self.lines.append("top allocation sites:")
+        self.lines.extend(f"  {stat}" for stat in self.__top(snapshot.statistics("lineno")))
+        if self.__previous is not None:
+            self.lines.append("growth since the previous snapshot:")
+            self.lines.extend(f"  {stat}" for stat in self.__top(snapshot.compare_to(self.__previous, "lineno")))
+        self.lines.append("")
+        self.__previous = snapshot
+
+    @contextmanager
+    def stage(self, name: str, detail: Optional[str] = None) -> Iterator[None]:
+        if detail is None:
+            self.snapshot(f"{name} start")
+        yield
+        if detail is None:
+            self.snapshot(f"{name} end")
+
+    def timed(self, name: str, iterable: Iterable, detail: Optional[str] = None) -> Iterable:
+        if detail is not None:
+            return iterable
+        return self.__snapshotAround(name, iterable)
+
+    def write(self, path: Path) -> None:
+        with open(path, "w", encoding="utf-8") as file:
+            file.write("\n".join(self.lines))
+        logger.info("Memory snapshots written; path='%s', snapshots=%d", path, self.snapshotCount)
+
+    def __top(self, statistics: list) -> list:
+        return [stat for stat in statistics if stat.traceback[0].filename not in _IGNORED_FILES][:self.topSites]
+
+    def __snapshotAround(self, name: str, iterable: Iterable) -> Iterator:
+        # the stage starts with its first item, not when the pipeline is built
+        self.snapshot(f"{name} start")
+        yield from iterable
+        self.snapshot(f"{name} end")
@@ -0,0 +1,131 @@
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import runProfile
+from configuration import Configuration
+from logging_config import getLogger
+from outputWriter import OutputWriter
+from parsers.dateRange import DateRange
+from parsers.transaction import Transaction
+from transactionClassifier import TransactionClassifier
+from transactionGrouper import Group
+
+logger = getLogger(__name__)
+
+
+def monthsBetween(firstMonth: datetime, lastMonth: datetime) -> List[datetime]:
+    if firstMonth > lastMonth:
+        logger.error("Invalid month range; from='%s', to='%s'", firstMonth.strftime('%Y-%m'), lastMonth.strftime('%Y-%m'))
+        raise ValueError(f"Month range starts after it ends: {firstMonth:%Y-%m} > {lastMonth:%Y-%m}")
+    months = []
+    year, month = firstMonth.year, firstMonth.month
+    while (year, month) <= (lastMonth.year, lastMonth.month):
+        months.append(datetime(year, month, 1))
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
+
+
+def dateRangeOf(months: Sequence[datetime]) -> DateRange:
+    return DateRange(DateRange.forMonth(months[0]).start, DateRange.forMonth(months[-1]).end)
+
+
+def partitionByMonth(transactions: Iterable[Transaction], months: Sequence[datetime]) -> Dict[str, List[Transaction]]:
+    # transactions per month ('YYYY-MM', every month of the range, empty ones included) in input order
+    partitions: Dict[str, List[Transaction]] = {month.strftime('%Y-%m'): [] for month in months}
+    outOfRange: Dict[str, int] = defaultdict(int)
+    for transaction in transactions:
+        key = f"{transaction.date.year:04d}-{transaction.date.month:02d}"
+        partition = partitions.get(key)
+        if partition is None:
+            outOfRange[key] += 1
+            continue
+        partition.append(transaction)
+    if outOfRange:
+        logger.debug("Transactions outside of the month range skipped; months=%s", dict(outOfRange))
+    return partitions
+
+
+def _writeMonth(configuration: Configuration, formats: List[str], outputBase: Path,
+                transactions: List[Transaction], groups: Optional[List[Group]] = None) -> int:
+    # groups and maps a single month, so group dates are the end of that month
+    # Args: outputBase - output folder joined with the file name without extension
+    #       groups - the month's groups when aggregated beforehand, see TransactionClassifier.stream()
+    classifier = TransactionClassifier(configuration)
+    entries = runProfile.timed("classify", classifier.stream(transactions, groups))
+    return OutputWriter(configuration, formats).write(entries, outputBase.parent, outputBase.name)
+
+
+def _writeMonthInWorker(configPath: str, formats: List[str], outputBase: str,
+                        transactions: List[Transaction], groups: Optional[List[Group]]) -> int:
+    return _writeMonth(Configuration(Path(configPath)), formats, Path(outputBase), transactions, groups)
+
+
+class MonthBatch:
+    # Writes one output per month out of transactions parsed once for the whole range, the months
+    # classified and written in parallel worker processes
+    def __init__(self, configuration: Configuration, formats: Sequence[str], jobs: int = 1,
+                 baseName: str = "bookings"):
+        # Args: jobs - number of worker processes writing months in parallel (1 writes in-process)
+        #       baseName - output file name without extension, suffixed with _YYYY-MM per month
+        if jobs < 1:
+            raise ValueError(f"Number of jobs must be at least 1: {jobs}")
+        self.configuration = configuration
+        self.writer = OutputWriter(configuration, formats)
+        self.jobs = jobs
+        self.baseName = baseName
+
+    def baseNameOf(self, month: str) -> str:
+        return f"{self.baseName}_{month}"
+
+    def outputFiles(self, outputFolder: Path, month: str) -> List[Path]:
+        return self.writer.outputFiles(outputFolder, self.baseNameOf(month))
+
+    def write(self, transactionsByMonth: Dict[str, List[Transaction]], outputFolder: Path,
+              groupsByMonth: Optional[Dict[str, List[Group]]] = None) -> Dict[str, int]:
+        # Args: transactionsByMonth - transactions per month ('YYYY-MM'), see partitionByMonth
+        #       groupsByMonth - groups per month aggregated beforehand (TransactionStore.groupsByMonth()),
+        #                       months without any group may be missing
+        # Returns the number of entries written per month, in month order
+        months = sorted(transactionsByMonth)
+        logger.info("Starting month batch; months=%d, jobs=%d", len(months), self.jobs)
+        # stdout formats are written month after month, parallel workers would interleave their lines
+        if self.jobs > 1 and len(months) > 1 and not self.writer.writesToStdout:
+            rowCounts = self.__writeInPool(transactionsByMonth, months, outputFolder, groupsByMonth)
+        else:
+            rowCounts = {month: self.__writeMonth(month, lambda month=month: _writeMonth(
+                self.configuration, self.writer.formats, outputFolder / self.baseNameOf(month), transactionsByMonth[month],
+                self.__groupsOf(groupsByMonth, month)))
+                for month in months}
+        logger.info("Month batch complete; months=%d, entries=%d", len(months), sum(rowCounts.values()))
+        return rowCounts
+
+    def __writeInPool(self, transactionsByMonth: Dict[str, List[Transaction]], months: List[str], outputFolder: Path,
+                      groupsByMonth: Optional[Dict[str, List[Group]]]) -> Dict[str, int]:
+        with ProcessPoolExecutor(max_workers=min(self.jobs, len(months))) as executor:
+            futures = {month: runProfile.submit(executor, _writeMonthInWorker, str(self.configuration.configPath),
+                                                self.writer.formats, str(outputFolder / self.baseNameOf(month)),
+                                                transactionsByMonth[month], self.__groupsOf(groupsByMonth, month))
+                       for month in months}
+            try:
+                return {month: self.__writeMonth(month, futures[month].result) for month in months}
+            except Exception:
+                for future in futures.values():
+                    future.cancel()
+                raise
+
+    @staticmethod
+    def __groupsOf(groupsByMonth: Optional[Dict[str, List[Group]]], month: str) -> Optional[List[Group]]:
+        return None if groupsByMonth is None else groupsByMonth.get(month, [])
+
+    @staticmethod
+    def __writeMonth(month: str, writeMonth) -> int:
+        try:
+            rowCount = writeMonth()
+            logger.debug("Month written; month='%s', entries=%d", month, rowCount)
+            return rowCount
+        except Exception as e:
+            logger.error("Error writing month; month='%s', error='%s'", month, str(e))
+            raise RuntimeError(f"Error writing month {month}: {e}") from e
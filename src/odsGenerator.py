@@ -1,47 +1,283 @@
+import io
+import re
+import time
+import zipfile
+from datetime import datetime
 from pathlib import Path
-from typing import List
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from xml.sax.saxutils import escape
 
+from odf import manifest
+from odf.element import Element
 from odf.number import DateStyle, Day, Month, Number, NumberStyle, NUMBERNS, Text, Year
+from odf.office import DocumentContent
 from odf.opendocument import OpenDocumentSpreadsheet
 from odf.style import Style
-from odf.table import Table, TableRow, TableCell
+from odf.table import TableRow, TableCell
 from odf.text import P
 
+import runProfile
 from accountMapper import BookingEntry
+from columnValues import entryAmount, entryDate, entryRemarks, formatDate, isRemarksColumn
 from configuration import Configuration, ColumnConfig
 from logging_config import getLogger
+from partialFile import commitPartial, discardPartial, partialPathOf
 
 logger = getLogger(__name__)
 
+XML_PROLOGUE = "<?xml version='1.0' encoding='UTF-8'?>\n"
+ZIP_PERMISSIONS = 0o100644 << 16  # -rw-r--r--, as written by odfpy
+EMPTY_CELL = "<table:table-cell/>"
+RENDER_CACHE_SIZE = 4096
+SUMMARY_TABLE_NAME = "Summary"
+TOTAL_LABEL = "Total"
+AMOUNT_CELL_STYLE = "amountCell"
+# characters XML 1.0 forbids; replaced like odfpy does, escaping alone would leave content.xml malformed
+_XML_INVALID_CHARACTERS = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ud800-\udfff\ufffe\uffff]")
+
+
+def dateCellStyleName(dateFormat: str) -> str:
+    return f"dateCell{dateFormat.replace('.', '')}"
+
+
+def _xmlText(value: str) -> str:
+    return escape(_XML_INVALID_CHARACTERS.sub("\ufffd", value))
+
+
+def _xmlAttribute(value: str) -> str:
+    return '"' + escape(_XML_INVALID_CHARACTERS.sub("\ufffd", value), {'"': "&quot;"}) + '"'
+
+
+def _stringCell(value: str) -> str:
+    if not value:
+        return EMPTY_CELL
+    return f'<table:table-cell office:value-type="string"><text:p>{_xmlText(value)}</text:p></table:table-cell>'
+
+
+def _accountCell(account: Optional[str]) -> str:
+    if not account:
+        return EMPTY_CELL
+    return f'<table:table-cell office:value-type="float" office:value={_xmlAttribute(account)}><text:p>{_xmlText(account)}</text:p></table:table-cell>'
+
+
+def _amountCell(amount: Optional[float], cellStyleName: str) -> str:
+    if amount is None:
+        return EMPTY_CELL
+    return (f'<table:table-cell table:style-name={_xmlAttribute(cellStyleName)} office:value-type="float" '
+            f'office:value="{amount:.10g}"><text:p>{amount:.2f}</text:p></table:table-cell>')
+
+
+def _cached(render: Callable[[Optional[str]], str], getValue: Callable[[BookingEntry], Optional[str]]) -> Callable[[BookingEntry], str]:
+    # accounts and descriptions repeat across entries; each distinct value is rendered once
+    cells: Dict[Optional[str], str] = {}
+
+    def produce(entry: BookingEntry) -> str:
+        value = getValue(entry)
+        cell = cells.get(value)
+        if cell is None:
+            if len(cells) >= RENDER_CACHE_SIZE:
+                cells.clear()
+            cell = cells[value] = render(value)
+        return cell
+    return produce
+
+
+def _xmlOf(element: Element, level: int) -> str:
+    buffer = io.StringIO()
+    element.toXml(level, buffer)
+    return buffer.getvalue()
+
+
+class OdsSink:  # pylint: disable=too-many-instance-attributes
+    # Writes an ODS file row by row straight into the zip container: the mimetype (stored, first entry),
+    # content.xml streamed while rows arrive, then styles, meta and manifest serialized by odfpy.
+    # The container is written next to outputPath and replaces it on close().
+    # Only the document frame is built with odfpy; rows never exist as element trees.
+    # Rows go to the current table; startTable() begins another sheet, otherwise all rows end up in one
+    # table named tableName.
+    def __init__(self, outputPath: Path, document: OpenDocumentSpreadsheet, headerRow: TableRow,
+                 renderRow: Callable[[BookingEntry], str], tableName: str = "Transactions"):
+        # Args: document - document holding the automatic styles the rows refer to
+        #       renderRow - renders an entry as <table:table-row> XML
+        self.outputPath = outputPath
+        self.document = document
+        self.headerRow = headerRow
+        self.renderRow = renderRow
+        self.tableName = tableName
+        self.rowCount = 0
+        self.tableCount = 0
+        self.__zip: Optional[zipfile.ZipFile] = None
+        self.__content: Optional[io.TextIOWrapper] = None
+        self.__tableOpen = False
+        self.__openedAt = 0.0
+
+    def __enter__(self) -> 'OdsSink':
+        return self.open()
+
+    def __exit__(self, excType, excValue, traceback) -> None:
+        if excType is None:
+            self.close()
+        else:
+            self.abort()
+
+    def open(self) -> 'OdsSink':
+        self.__openedAt = time.perf_counter()
+        # the container and the content.xml stream stay open while rows arrive; close() or abort() release them
+        self.__zip = zipfile.ZipFile(partialPathOf(self.outputPath), "w", compression=zipfile.ZIP_DEFLATED)  # pylint: disable=consider-using-with
+        self.__zip.writestr(self.__zipInfo("mimetype", zipfile.ZIP_STORED), self.document.mimetype.encode("utf-8"))
+        stream = self.__zip.open(self.__zipInfo("content.xml"), "w")  # pylint: disable=consider-using-with
+        self.__content = io.TextIOWrapper(stream, encoding="utf-8", newline="")
+        self.__content.write(self.__contentHead())
+        return self
+
+    def startTable(self, name: str, headerRow: Optional[TableRow] = None) -> None:
+        # Args: headerRow - first row of the sheet (default: the column header row)
+        self.__endTable()
+        self.__content.write(f'<table:table table:name={_xmlAttribute(name)}>')
+        self.__content.write(_xmlOf(headerRow if headerRow is not None else self.headerRow, 3))
+        self.__tableOpen = True
+        self.tableCount += 1
+
+    def write(self, entry: BookingEntry) -> None:
+        self.writeRow(self.renderRow(entry))
+        self.rowCount += 1
+
+    def writeRow(self, rowXml: str) -> None:
+        # Args: rowXml - <table:table-row> XML referring to the document's styles only
+        if not self.__tableOpen:
+            self.startTable(self.tableName)
+        self.__content.write(rowXml)
+
+    def close(self) -> int:
+        # a spreadsheet needs a table, even without rows
+        if self.tableCount == 0:
+            self.startTable(self.tableName)
+        self.__endTable()
+        self.__content.write("</office:spreadsheet></office:body></office:document-content>")
+        self.__content.close()
+        self.__writeDocumentParts()
+        self.__zip.close()
+        commitPartial(self.outputPath)
+        self.__recordSpan()
+        return self.rowCount
+
+    def abort(self) -> None:
+        # an incomplete file must not pass for a valid workbook; a previous workbook at outputPath is kept
+        try:
+            if self.__content is not None:
+                self.__content.close()
+            if self.__zip is not None:
+                self.__zip.close()
+        finally:
+            discardPartial(self.outputPath)
+            self.__recordSpan(aborted=True)
+
+    def __recordSpan(self, aborted: bool = False) -> None:
+        args = {"file": Path(self.outputPath).name, "rows": self.rowCount, "sheets": self.tableCount}
+        if aborted:
+            args["aborted"] = True
+        runProfile.recordSpan("workbook", self.__openedAt, time.perf_counter(), args)
+
+    def __contentHead(self) -> str:
+        # mirrors OpenDocument.contentxml(), except that every automatic style is kept, not only the
+        # ones referenced by the (still empty) body
+        head = io.StringIO()
+        head.write(XML_PROLOGUE)
+        DocumentContent().write_open_tag(0, head)
+        head.write("<office:automatic-styles>")
+        for style in self.document.automaticstyles.childNodes:
+            style.toXml(2, head)
+        head.write("</office:automatic-styles><office:body><office:spreadsheet>")
+        return head.getvalue()
+
+    def __endTable(self) -> None:
+        if self.__tableOpen:
+            self.__content.write("</table:table>")
+            self.__tableOpen = False
+
+    def __writeDocumentParts(self) -> None:
+        documentManifest = manifest.Manifest()
+        documentManifest.addElement(manifest.FileEntry(fullpath="/", mediatype=self.document.mimetype))
+        documentManifest.addElement(manifest.FileEntry(fullpath="content.xml", mediatype="text/xml"))
+        documentManifest.addElement(manifest.FileEntry(fullpath="styles.xml", mediatype="text/xml"))
+        self.__zip.writestr(self.__zipInfo("styles.xml"), self.document.stylesxml().encode("utf-8"))
+        if self.document.settings.hasChildNodes():
+            documentManifest.addElement(manifest.FileEntry(fullpath="settings.xml", mediatype="text/xml"))
+            self.__zip.writestr(self.__zipInfo("settings.xml"), self.document.settingsxml().encode("utf-8"))
+        documentManifest.addElement(manifest.FileEntry(fullpath="meta.xml", mediatype="text/xml"))
+        self.__zip.writestr(self.__zipInfo("meta.xml"), self.document.metaxml().encode("utf-8"))
+        self.__zip.writestr(self.__zipInfo("META-INF/manifest.xml"), (XML_PROLOGUE + _xmlOf(documentManifest, 0)).encode("utf-8"))
+
+    @staticmethod
+    def __zipInfo(name: str, compressType: int = zipfile.ZIP_DEFLATED) -> zipfile.ZipInfo:
+        info = zipfile.ZipInfo(name, time.localtime()[:6])
+        info.compress_type = compressType
+        info.external_attr = ZIP_PERMISSIONS
+        return info
+
 
 class OdsGenerator:
     def __init__(self, configuration: Configuration):
         self.configuration = configuration
 
-    def generate(self, entries: List[BookingEntry], outputPath: Path) -> None:
-        logger.info("Starting ODS generation; output_path='%s', entries=%d", outputPath, len(entries))
+    def open(self, outputPath: Path) -> OdsSink:
+        # Sink writing one row per entry as they arrive; use as context manager or call open()/close()
+        doc = OpenDocumentSpreadsheet()
+        styleMap = self.__registerStyles(doc)
+        return OdsSink(outputPath, doc, self.__createHeaderRow(), self.__compileRenderPlan(styleMap))
+
+    def generate(self, entries: Iterable[BookingEntry], outputPath: Path) -> int:
+        # Consumes the entries once (lists and generators alike), streaming rows into the file in
+        # bounded memory; returns the number of data rows written
+        logger.info("Starting ODS generation; output_path='%s'", outputPath)
 
         try:
-            doc = OpenDocumentSpreadsheet()
-            styleMap = self.__registerStyles(doc)
+            with self.open(outputPath) as sink:
+                for entry in entries:
+                    sink.write(entry)
+                    logger.debug("Row added; row=%d, description='%s', debitAccount='%s'",
+                                sink.rowCount, entry.mappedDescription, entry.debitAccount or "")
 
-            table = Table(name="Transactions")
-            self.__addHeaderRow(table)
+            logger.info("ODS generation completed; output_path='%s', rows=%d", outputPath, sink.rowCount)
+            return sink.rowCount
+        except Exception as exc:
+            logger.error("ODS generation failed; output_path='%s', error='%s'", outputPath, exc)
+            raise
 
-            for idx, entry in enumerate(entries, start=1):
-                self.__addDataRow(table, entry, styleMap)
-                logger.debug("Row added; row=%d, description='%s', debitAccount='%s'",
-                            idx, entry.mappedDescription, entry.debitAccount or "")
+    def generateWorkbook(self, months: Iterable[Tuple[str, Iterable[BookingEntry]]], outputPath: Path) -> int:
+        # One sheet per month, named as given and in the given order, followed by a summary sheet with
+        # the totals per debit account and month. The totals are summed in cents while the rows are
+        # written, so every entry is consumed exactly once; returns the number of data rows written
+        logger.info("Starting ODS workbook generation; output_path='%s'", outputPath)
 
-            doc.spreadsheet.addElement(table)
-            doc.save(str(outputPath))
+        try:
+            doc = OpenDocumentSpreadsheet()
+            styleMap = self.__registerStyles(doc, withAmountStyle=True)
+            monthNames: List[str] = []
+            accountTotals: Dict[Optional[str], Dict[str, int]] = {}
+            with OdsSink(outputPath, doc, self.__createHeaderRow(), self.__compileRenderPlan(styleMap)) as sink:
+                for month, entries in months:
+                    monthNames.append(month)
+                    sink.startTable(month)
+                    for entry in entries:
+                        sink.write(entry)
+                        amount = entryAmount(entry)
+                        if amount is not None:
+                            totals = accountTotals.setdefault(entry.debitAccount, {})
+                            totals[month] = totals.get(month, 0) + round(amount * 100)
+                sink.startTable(SUMMARY_TABLE_NAME, self.__createSummaryHeaderRow(monthNames))
+                for rowXml in self.__renderSummaryRows(accountTotals, monthNames, styleMap["amountChf"]):
+                    sink.writeRow(rowXml)
 
-            logger.info("ODS generation completed; output_path='%s', rows=%d", outputPath, len(entries))
+            logger.info("ODS workbook generation completed; output_path='%s', sheets=%d, rows=%d, accounts=%d",
+                        outputPath, sink.tableCount, sink.rowCount, len(accountTotals))
+            return sink.rowCount
         except Exception as exc:
-            logger.error("ODS generation failed; output_path='%s', error='%s'", outputPath, exc)
+            logger.error("ODS workbook generation failed; output_path='%s', error='%s'", outputPath, exc)
             raise
 
-    def __registerStyles(self, doc: OpenDocumentSpreadsheet) -> dict:
+    def __registerStyles(self, doc: OpenDocumentSpreadsheet, withAmountStyle: bool = False) -> dict:
+        # Args: withAmountStyle - register the amount style even without an amountChf column (summary sheets)
         styleMap = {}
         for column in self.configuration.columns:
             if column.type != "date":
@@ -50,9 +286,8 @@ class OdsGenerator:
             if key in styleMap:
                 continue
             fmt = column.format
-            safeName = fmt.replace(".", "")
-            numStyleName = f"dateNum{safeName}"
-            cellStyleName = f"dateCell{safeName}"
+            numStyleName = f"dateNum{fmt.replace('.', '')}"
+            cellStyleName = dateCellStyleName(fmt)
             ds = DateStyle(name=numStyleName, automaticorder="true")
             ds.addElement(Day(style="long"))
             ds.addElement(Text(text="."))
@@ -64,110 +299,92 @@ class OdsGenerator:
                        parentstylename="Default", datastylename=numStyleName)
             doc.automaticstyles.addElement(cs)
             styleMap[key] = cellStyleName
-        if any(col.type == "amountChf" for col in self.configuration.columns):
+        if withAmountStyle or any(col.type == "amountChf" for col in self.configuration.columns):
             ns = NumberStyle(name="amountNum")
             # decimal-places=max, min-decimal-places=min → always exactly 2 places (0.00)
             n = Number(decimalplaces="2", minintegerdigits="1")
             n.attributes[(NUMBERNS, "min-decimal-places")] = "2"
             ns.addElement(n)
             doc.automaticstyles.addElement(ns)
-            cs = Style(name="amountCell", family="table-cell",
+            cs = Style(name=AMOUNT_CELL_STYLE, family="table-cell",
                        parentstylename="Default", datastylename="amountNum")
             doc.automaticstyles.addElement(cs)
-            styleMap["amountChf"] = "amountCell"
+            styleMap["amountChf"] = AMOUNT_CELL_STYLE
         return styleMap
 
-    def __addHeaderRow(self, table: Table) -> None:
+    def __createHeaderRow(self) -> TableRow:
         row = TableRow()
         for column in self.configuration.columns:
             cell = TableCell(valuetype="string")
             cell.addElement(P(text=column.name))
             row.addElement(cell)
-        table.addElement(row)
+        return row
 
-    def __addDataRow(self, table: Table, entry: BookingEntry, styleMap: dict) -> None:
+    def __createSummaryHeaderRow(self, monthNames: List[str]) -> TableRow:
+        accountColumn = next((column.name for column in self.configuration.columns if column.type == "debitAccount"), "debitAccount")
         row = TableRow()
-        for column in self.configuration.columns:
-            row.addElement(self.__createCell(column, entry, styleMap))
-        table.addElement(row)
-
-    def __createCell(self, column: ColumnConfig, entry: BookingEntry, styleMap: dict) -> TableCell:
-        if column.type == "date":
-            return self.__createDateCell(entry, column.format, styleMap.get(f"date:{column.format}"))
-        if column.type == "amountChf":
-            return self.__createAmountCell(entry, styleMap.get("amountChf"))
-        if column.type in ("debitAccount", "creditAccount"):
-            return self.__createAccountCell(self.__getCellValue(column, entry))
-        value = self.__getCellValue(column, entry)
-        if value:
+        for name in [accountColumn, *monthNames, TOTAL_LABEL]:
             cell = TableCell(valuetype="string")
-            cell.addElement(P(text=value))
-            return cell
-        return TableCell()
-
-    def __createDateCell(self, entry: BookingEntry, dateFormat: str, cellStyleName: str) -> TableCell:
-        date = self.__getDate(entry)
-        if date is None:
-            return TableCell()
-        cell = TableCell(stylename=cellStyleName, valuetype="date", datevalue=date.strftime("%Y-%m-%d"))
-        cell.addElement(P(text=self.__formatDateStr(date, dateFormat)))
-        return cell
+            cell.addElement(P(text=name))
+            row.addElement(cell)
+        return row
 
-    def __createAccountCell(self, account: str) -> TableCell:
-        if not account:
-            return TableCell()
-        cell = TableCell(valuetype="float", value=account)
-        cell.addElement(P(text=account))
-        return cell
+    @staticmethod
+    def __renderSummaryRows(accountTotals: Dict[Optional[str], Dict[str, int]], monthNames: List[str], cellStyleName: str) -> Iterator[str]:
+        # one row per debit account (unmapped entries last, without account), then the totals per month;
+        # months without entries of an account stay empty
+        def row(firstCell: str, totals: Dict[str, int]) -> str:
+            cells = [_amountCell(totals[month] / 100 if month in totals else None, cellStyleName) for month in monthNames]
+            return ("<table:table-row>" + firstCell + "".join(cells)
+                    + _amountCell(sum(totals.values()) / 100, cellStyleName) + "</table:table-row>")
 
-    def __createAmountCell(self, entry: BookingEntry, cellStyleName: str) -> TableCell:
-        amount = self.__getAmount(entry)
-        if amount is None:
-            return TableCell()
-        cell = TableCell(stylename=cellStyleName, valuetype="float", value=f"{amount:.10g}")
-        cell.addElement(P(text=f"{amount:.2f}"))
-        return cell
+        monthTotals: Dict[str, int] = {}
+        for account in sorted(accountTotals, key=lambda account: (account is None, account or "")):
+            totals = accountTotals[account]
+            for month, cents in totals.items():
+                monthTotals[month] = monthTotals.get(month, 0) + cents
+            yield row(_accountCell(account), totals)
+        yield row(_stringCell(TOTAL_LABEL), monthTotals)
 
-    def __getCellValue(self, column: ColumnConfig, entry: BookingEntry) -> str:
-        if not column.type:
-            # Optional column - check for remarks
-            if column.name in ("Bemerkungen", "Bemerkung"):
-                return self.__getRemarksValue(entry)
-            return ""
+    def __compileRenderPlan(self, styleMap: dict) -> Callable[[BookingEntry], str]:
+        # Resolves every column once into a cell producer with its style name, so rendering a row is a
+        # plain loop over the producers without consulting the configuration
+        cellProducers = tuple(self.__compileCell(column, styleMap) for column in self.configuration.columns)
 
+        def renderRow(entry: BookingEntry) -> str:
+            return "<table:table-row>" + "".join([produce(entry) for produce in cellProducers]) + "</table:table-row>"
+        return renderRow
+
+    def __compileCell(self, column: ColumnConfig, styleMap: dict) -> Callable[[BookingEntry], str]:
+        if column.type == "date":
+            return self.__compileDateCell(column.format, styleMap.get(f"date:{column.format}"))
+        if column.type == "amountChf":
+            return self.__compileAmountCell(styleMap.get("amountChf"))
         if column.type == "description":
-            return entry.mappedDescription
+            return _cached(_stringCell, lambda entry: entry.mappedDescription)
         if column.type == "debitAccount":
-            return entry.debitAccount or ""
+            return _cached(_accountCell, lambda entry: entry.debitAccount)
         if column.type == "creditAccount":
-            return entry.creditAccount
-        if column.type == "remarks":
-            return self.__getRemarksValue(entry)
-
-        return ""
-
-    def __getDate(self, entry: BookingEntry):
-        if entry.transaction:
-            return entry.transaction.date
-        if entry.group:
-            return entry.group.monthEndDate
-        return None
-
-    def __formatDateStr(self, date, dateFormat: str) -> str:
-        if dateFormat == "DD.MM.YY":
-            return date.strftime("%d.%m.%y")
-        if dateFormat == "DD.MM.YYYY":
-            return date.strftime("%d.%m.%Y")
-        return date.strftime("%d.%m.%y")
-
-    def __getAmount(self, entry: BookingEntry):
-        if entry.transaction:
-            return entry.transaction.amount
-        if entry.group:
-            return entry.group.totalAmount
-        return None
-
-    def __getRemarksValue(self, entry: BookingEntry) -> str:
-        if entry.transaction and entry.transaction.hasForeignCurrency:
-            return f"{entry.transaction.foreignCurrency} {entry.transaction.foreignAmount:.2f}"
-        return ""
+            return _cached(_accountCell, lambda entry: entry.creditAccount)
+        if isRemarksColumn(column):
+            return lambda entry: _stringCell(entryRemarks(entry))
+        return lambda entry: EMPTY_CELL
+
+    def __compileDateCell(self, dateFormat: str, cellStyleName: str) -> Callable[[BookingEntry], str]:
+        # a month has few distinct dates; each is formatted once
+        cells: Dict[datetime, str] = {}
+        prefix = f'<table:table-cell table:style-name={_xmlAttribute(cellStyleName)} office:value-type="date" office:date-value="'
+
+        def produce(entry: BookingEntry) -> str:
+            date = entryDate(entry)
+            cell = cells.get(date)
+            if cell is None:
+                if date is None:
+                    return EMPTY_CELL
+                cell = cells[date] = (f'{prefix}{date.strftime("%Y-%m-%d")}">'
+                                      f'<text:p>{formatDate(date, dateFormat)}</text:p></table:table-cell>')
+            return cell
+        return produce
+
+    def __compileAmountCell(self, cellStyleName: str) -> Callable[[BookingEntry], str]:
+        return lambda entry: _amountCell(entryAmount(entry), cellStyleName)
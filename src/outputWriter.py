@@ -0,0 +1,61 @@
+from contextlib import ExitStack
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, TextIO
+
+from accountMapper import BookingEntry
+from configuration import Configuration
+from logging_config import getLogger
+from odsGenerator import OdsGenerator
+from textGenerators import CsvGenerator, JsonLinesGenerator
+
+logger = getLogger(__name__)
+
+# format -> file extension; formats without one are written to standard output
+OUTPUT_FORMATS: Dict[str, Optional[str]] = {"ods": ".ods", "csv": ".csv", "tsv": ".tsv", "jsonl": None}
+
+
+class OutputWriter:
+    # Writes the entries in every selected format during a single pass over them, so a run classifies its
+    # transactions once however many formats it produces. A failing run keeps the previous output files.
+    def __init__(self, configuration: Configuration, formats: Sequence[str], stdout: Optional[TextIO] = None):
+        # Args: formats - keys of OUTPUT_FORMATS, written in the given order
+        #       stdout - stream for the stream formats (default: standard output)
+        unknown = [outputFormat for outputFormat in formats if outputFormat not in OUTPUT_FORMATS]
+        if unknown or not formats:
+            logger.error("Invalid output formats; formats=%s", list(formats))
+            raise ValueError(f"Invalid output formats: {', '.join(unknown) or 'none given'}")
+        self.configuration = configuration
+        self.formats = list(dict.fromkeys(formats))
+        self.stdout = stdout
+
+    @property
+    def writesToStdout(self) -> bool:
+        return any(OUTPUT_FORMATS[outputFormat] is None for outputFormat in self.formats)
+
+    def outputFiles(self, outputFolder: Path, baseName: str) -> List[Path]:
+        return [outputFolder / f"{baseName}{OUTPUT_FORMATS[outputFormat]}"
+                for outputFormat in self.formats if OUTPUT_FORMATS[outputFormat] is not None]
+
+    def write(self, entries: Iterable[BookingEntry], outputFolder: Path, baseName: str) -> int:
+        # returns the number of entries written (to each format)
+        logger.info("Starting output generation; formats=%s, output_folder='%s'", self.formats, outputFolder)
+        try:
+            with ExitStack() as stack:
+                sinks = [stack.enter_context(self.__open(outputFormat, outputFolder, baseName)) for outputFormat in self.formats]
+                rowCount = 0
+                for rowCount, entry in enumerate(entries, start=1):
+                    for sink in sinks:
+                        sink.write(entry)
+            logger.info("Output generation completed; formats=%s, rows=%d", self.formats, rowCount)
+            return rowCount
+        except Exception as exc:
+            logger.error("Output generation failed; formats=%s, error='%s'", self.formats, exc)
+            raise
+
+    def __open(self, outputFormat: str, outputFolder: Path, baseName: str):
+        if outputFormat == "jsonl":
+            return JsonLinesGenerator(self.configuration).open(self.stdout)
+        outputFile = outputFolder / f"{baseName}{OUTPUT_FORMATS[outputFormat]}"
+        if outputFormat == "ods":
+            return OdsGenerator(self.configuration).open(outputFile)
+        return CsvGenerator(self.configuration, "\t" if outputFormat == "tsv" else ",").open(outputFile)
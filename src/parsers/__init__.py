@@ -1,5 +1,7 @@
+from .dateRange import DateRange
 from .transaction import Transaction
 from .textParser import TextParser
+from .parseCache import ParseCache
 from .directoryParser import DirectoryParser
 
-__all__ = ["Transaction", "TextParser", "DirectoryParser"]
+__all__ = ["DateRange", "Transaction", "TextParser", "ParseCache", "DirectoryParser"]
@@ -0,0 +1,31 @@
+from calendar import monthrange
+from dataclasses import dataclass, field
+from datetime import date, datetime
+
+
+@dataclass(frozen=True)
+class DateRange:
+    # Inclusive range of booking dates; containsRaw checks the raw DD.MM.YYYY text of an export
+    # so that out-of-range transaction blocks are skipped before anything is decoded
+    start: date
+    end: date
+    startKey: int = field(init=False, repr=False, compare=False)
+    endKey: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        if self.start > self.end:
+            raise ValueError(f"Date range start {self.start} is after end {self.end}")
+        object.__setattr__(self, 'startKey', self.start.year * 10000 + self.start.month * 100 + self.start.day)
+        object.__setattr__(self, 'endKey', self.end.year * 10000 + self.end.month * 100 + self.end.day)
+
+    @classmethod
+    def forMonth(cls, month: datetime) -> 'DateRange':
+        lastDay = monthrange(month.year, month.month)[1]
+        return cls(date(month.year, month.month, 1), date(month.year, month.month, lastDay))
+
+    def contains(self, value: date) -> bool:
+        return self.startKey <= value.year * 10000 + value.month * 100 + value.day <= self.endKey
+
+    def containsRaw(self, dateStr: str) -> bool:
+        key = int(dateStr[6:10]) * 10000 + int(dateStr[3:5]) * 100 + int(dateStr[0:2])
+        return self.startKey <= key <= self.endKey
@@ -1,18 +1,70 @@
+import mmap
+import os
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Iterator
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
+import runProfile
 from logging_config import getLogger
+from .dateRange import DateRange
+from .parseCache import ParseCache
 from .textParser import TextParser
 from .transaction import Transaction
 
 logger = getLogger(__name__)
 
 
+@lru_cache(maxsize=1)
+def _workerTextParser() -> TextParser:
+    # one parser per worker process, so its date cache survives across the files a worker parses
+    return TextParser()
+
+
+def _parseFile(textParser: TextParser, filePath: str, dateRange: Optional[DateRange], useMmap: bool) -> Iterator[Transaction]:
+    if useMmap:
+        with open(filePath, "rb") as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                return
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                # universal newline translation needs the text path
+                if buffer.find(b"\r") == -1:
+                    yield from textParser.parseBytes(buffer, dateRange)
+                    return
+
+    with open(filePath, "r", encoding="utf-8") as file:
+        content = file.read()
+    yield from textParser.parse(content, dateRange)
+
+
+def _parseFileInWorker(filePath: str, dateRange: Optional[DateRange], useMmap: bool) -> List[Transaction]:
+    start = time.perf_counter()
+    transactions = list(_parseFile(_workerTextParser(), filePath, dateRange, useMmap))
+    runProfile.recordSpan(f"parse {Path(filePath).name}", start, time.perf_counter(),
+                          {"file": Path(filePath).name, "transactions": len(transactions)})
+    return transactions
+
+
 class DirectoryParser:
-    def __init__(self):
+    def __init__(self, jobs: int = 1, useMmap: bool = False, cache: Optional[ParseCache] = None,
+                 deduplicate: bool = False):
+        # Args: jobs - number of worker processes parsing files in parallel (1 parses in-process)
+        #       useMmap - scan memory-mapped file bytes instead of decoding whole files into str
+        #       cache - persisted parse results reused for files whose content did not change
+        #       deduplicate - drop transactions already contained in an earlier file (overlapping exports)
+        if jobs < 1:
+            raise ValueError(f"Number of jobs must be at least 1: {jobs}")
+        self.jobs = jobs
+        self.useMmap = useMmap
+        self.cache = cache
+        self.deduplicate = deduplicate
+        self.cacheHits = 0
+        self.cacheMisses = 0
         self.textParser = TextParser()
 
-    def parse(self, directoryPath: str, filePattern: str = "*.txt") -> Iterator[Transaction]:
+    def parse(self, directoryPath: str, filePattern: str = "*.txt", dateRange: Optional[DateRange] = None) -> Iterator[Transaction]:
         directory = Path(directoryPath)
         if not directory.exists():
             logger.error("Directory not found; path='%s'", directoryPath)
@@ -21,26 +73,139 @@ class DirectoryParser:
             logger.error("Path is not a directory; path='%s'", directoryPath)
             raise ValueError(f"Path is not a directory: {directoryPath}")
 
-        logger.info("Parsing directory; path='%s', pattern='%s'", directoryPath, filePattern)
+        logger.info("Parsing directory; path='%s', pattern='%s', jobs=%d, mmap=%s",
+                    directoryPath, filePattern, self.jobs, self.useMmap)
+        with runProfile.stage("directoryScan"):
+            files = sorted(directory.glob(filePattern))
+        if self.cache is None:
+            yield from self.parseFiles(files, dateRange)
+            return
+        # all files of the folder are known here, so entries of edited or removed ones can go
+        fileHashes = {file: ParseCache.hashFile(file) for file in files}
+        yield from self.parseFiles(files, dateRange, fileHashes)
+        self.cache.prune(fileHashes.values())
+
+    def parseFiles(self, files: List[Path], dateRange: Optional[DateRange] = None,
+                   fileHashes: Optional[Dict[Path, str]] = None) -> Iterator[Transaction]:
         fileCount = 0
         transactionCount = 0
+        duplicateCount = 0
+        # Identities of earlier files only: an export never lists a transaction twice, so equal content
+        # within one file stems from separate purchases
+        seenIdentities: Set[tuple] = set()
+        for _, fileTransactions in self.parseEachFile(files, dateRange, fileHashes):
+            fileCount += 1
+            fileIdentities: Set[tuple] = set()
+            for transaction in fileTransactions:
+                if self.deduplicate:
+                    identity = transaction.identity
+                    if identity in seenIdentities:
+                        duplicateCount += 1
+                        continue
+                    fileIdentities.add(identity)
+                transactionCount += 1
+                yield transaction
+            seenIdentities |= fileIdentities
+
+        logger.info("Directory parsing complete; files=%d, transactions=%d, duplicates=%d",
+                    fileCount, transactionCount, duplicateCount)
+        runProfile.count("files", fileCount)
+        runProfile.count("transactions", transactionCount)
+        runProfile.count("duplicates", duplicateCount)
+        if self.cache is not None:
+            logger.info("Parse cache; hits=%d, misses=%d", self.cacheHits, self.cacheMisses)
+            runProfile.recordCache("parseCache", self.cacheHits, self.cacheMisses)
+
+    def parseEachFile(self, files: List[Path], dateRange: Optional[DateRange] = None,
+                      fileHashes: Optional[Dict[Path, str]] = None) -> Iterator[Tuple[Path, Iterator[Transaction]]]:
+        # Args: fileHashes - content hashes the caller already knows, sparing the cache from hashing these files
+        # A file's transactions have to be consumed before advancing to the next file
+        if self.cache is not None:
+            scheduledFiles = self.__scheduleWithCache(files, dateRange, fileHashes or {})
+        else:
+            scheduledFiles = self.__schedule(files, dateRange)
+
+        # files are consumed in sorted order whatever finishes first, keeping the output deterministic
+        for file, parseFile in scheduledFiles:
+            yield file, runProfile.timed("parse", self.__parseFile(file, parseFile), detail=file.name)
+
+    @staticmethod
+    def __parseFile(file: Path, parseFile: Callable[[], Iterable[Transaction]]) -> Iterator[Transaction]:
+        try:
+            fileTransactions = 0
+            for transaction in parseFile():
+                fileTransactions += 1
+                yield transaction
+            logger.debug("Parsed file; path='%s', transactions=%d", file, fileTransactions)
+        except Exception as e:
+            logger.error("Error parsing file; path='%s', error='%s'", file, str(e))
+            raise RuntimeError(f"Error parsing file {file}: {e}") from e
+
+    def __schedule(self, files: List[Path], dateRange: Optional[DateRange]) -> Iterator[Tuple[Path, Callable[[], Iterable[Transaction]]]]:
+        if self.jobs > 1 and len(files) > 1:
+            return self.__scheduleInPool(files, dateRange)
+        return self.__scheduleInProcess(files, dateRange)
+
+    def __scheduleWithCache(self, files: List[Path], dateRange: Optional[DateRange],
+                            knownHashes: Dict[Path, str]) -> Iterator[Tuple[Path, Callable[[], Iterable[Transaction]]]]:
+        # Files without a cache entry are parsed in full through the usual scheduling, as the entry has to
+        # serve any later target month; the date range is applied to the cached and the fresh transactions alike
+        fileHashes = {file: knownHashes.get(file) or ParseCache.hashFile(file) for file in files}
+        uncachedFiles = [file for file in files if not self.cache.contains(fileHashes[file])]
+        parsedFiles = self.__schedule(uncachedFiles, None)
+        uncached = set(uncachedFiles)
+
+        for file in files:
+            fileHash = fileHashes[file]
+            if file in uncached:
+                # the schedule yields the uncached files in their order, pair them explicitly
+                scheduledFile, parseFile = next(parsedFiles, (None, None))
+                if scheduledFile != file:
+                    logger.error("Parse schedule out of step; path='%s', scheduled='%s'", file, scheduledFile)
+                    raise RuntimeError(f"Parse schedule out of step at {file}: {scheduledFile}")
+                yield file, lambda fileHash=fileHash, parseFile=parseFile: self.__parseIntoCache(fileHash, parseFile, dateRange)
+            else:
+                yield file, lambda file=file, fileHash=fileHash: self.__loadFromCache(file, fileHash, dateRange)
+
+    def __loadFromCache(self, file: Path, fileHash: str, dateRange: Optional[DateRange]) -> List[Transaction]:
+        transactions = self.cache.load(fileHash)
+        if transactions is None:
+            return self.__parseIntoCache(fileHash, lambda: _parseFile(self.textParser, str(file), None, self.useMmap), dateRange)
+        self.cacheHits += 1
+        logger.debug("Parse cache hit; path='%s', hash='%s'", file, fileHash)
+        return self.__filter(transactions, dateRange)
+
+    def __parseIntoCache(self, fileHash: str, parseFile: Callable[[], Iterable[Transaction]], dateRange: Optional[DateRange]) -> List[Transaction]:
+        transactions = list(parseFile())
+        self.cacheMisses += 1
+        self.cache.store(fileHash, transactions)
+        return self.__filter(transactions, dateRange)
+
+    @staticmethod
+    def __filter(transactions: List[Transaction], dateRange: Optional[DateRange]) -> List[Transaction]:
+        if dateRange is None:
+            return transactions
+        return [transaction for transaction in transactions if dateRange.contains(transaction.date)]
+
+    def __scheduleInProcess(self, files: List[Path], dateRange: Optional[DateRange]) -> Iterator[Tuple[Path, Callable[[], Iterable[Transaction]]]]:
+        for file in files:
+            yield file, lambda file=file: _parseFile(self.textParser, str(file), dateRange, self.useMmap)
 
-        for file in sorted(directory.glob(filePattern)):
-            try:
-                fileCount += 1
-                fileTransactions = 0
-                for transaction in self.__parseFile(str(file)):
-                    fileTransactions += 1
-                    transactionCount += 1
-                    yield transaction
-                logger.debug("Parsed file; path='%s', transactions=%d", file, fileTransactions)
-            except Exception as e:
-                logger.error("Error parsing file; path='%s', error='%s'", file, str(e))
-                raise RuntimeError(f"Error parsing file {file}: {e}") from e
-
-        logger.info("Directory parsing complete; files=%d, transactions=%d", fileCount, transactionCount)
-
-    def __parseFile(self, filePath: str) -> Iterator[Transaction]:
-        with open(filePath, "r", encoding="utf-8") as file:
-            content = file.read()
-        yield from self.textParser.parse(content)
+    def __scheduleInPool(self, files: List[Path], dateRange: Optional[DateRange]) -> Iterator[Tuple[Path, Callable[[], Iterable[Transaction]]]]:
+        # at most two files per worker are in flight, bounding the parsed but not yet consumed results
+        executor = ProcessPoolExecutor(max_workers=min(self.jobs, len(files)))
+        try:
+            pending: deque[Tuple[Path, Future]] = deque()
+            remaining = iter(files)
+            for file in remaining:
+                pending.append((file, runProfile.submit(executor, _parseFileInWorker, str(file), dateRange, self.useMmap)))
+                if len(pending) >= 2 * self.jobs:
+                    break
+            while pending:
+                file, future = pending.popleft()
+                nextFile = next(remaining, None)
+                if nextFile is not None:
+                    pending.append((nextFile, runProfile.submit(executor, _parseFileInWorker, str(nextFile), dateRange, self.useMmap)))
+                yield file, future.result
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
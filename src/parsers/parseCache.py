@@ -0,0 +1,99 @@
+import hashlib
+import json
+import os
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+from logging_config import getLogger
+from .textParser import TextParser
+from .transaction import Transaction
+
+logger = getLogger(__name__)
+
+
+class ParseCache:
+    # Parsed transactions per export file, keyed by the file's content hash and the parser version;
+    # a changed file or parser simply misses, stale entries are removed by prune()
+    DIRECTORY_NAME = '.onecreditcard-cache'
+    HASH_CHUNK_SIZE = 1024 * 1024
+
+    def __init__(self, cacheDirectory: Path):
+        self.cacheDirectory = cacheDirectory / 'parsed'
+
+    @classmethod
+    def forDataFolder(cls, folder: Path) -> 'ParseCache':
+        return cls(folder / cls.DIRECTORY_NAME)
+
+    @classmethod
+    def hashFile(cls, filePath: Path) -> str:
+        digest = hashlib.sha256()
+        with open(filePath, 'rb') as file:
+            while chunk := file.read(cls.HASH_CHUNK_SIZE):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def contains(self, fileHash: str) -> bool:
+        return self.__entryPath(fileHash).exists()
+
+    def load(self, fileHash: str) -> Optional[List[Transaction]]:
+        entryPath = self.__entryPath(fileHash)
+        try:
+            with open(entryPath, 'r', encoding='utf-8') as file:
+                rows = json.load(file)
+            transactions = [self.__deserialize(row) for row in rows]
+        except FileNotFoundError:
+            return None
+        except (ValueError, TypeError) as exc:
+            logger.warning("Discarding unreadable parse cache entry; path='%s', error='%s'", entryPath, exc)
+            return None
+        return transactions
+
+    def store(self, fileHash: str, transactions: List[Transaction]) -> None:
+        self.cacheDirectory.mkdir(parents=True, exist_ok=True)
+        entryPath = self.__entryPath(fileHash)
+        # written to a temporary file first so that concurrent or aborted runs never see partial entries
+        fd, tempPath = tempfile.mkstemp(dir=self.cacheDirectory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as file:
+                json.dump([self.__serialize(t) for t in transactions], file, ensure_ascii=False)
+            os.replace(tempPath, entryPath)
+        except Exception:
+            Path(tempPath).unlink(missing_ok=True)
+            raise
+
+    def prune(self, fileHashes: Iterable[str]) -> int:
+        # Args: fileHashes - hashes of every export file of the data folder; entries of other hashes (edited or
+        #       removed exports) and of other parser versions are deleted. Returns the number of entries deleted
+        keep = {self.__entryPath(fileHash).name for fileHash in fileHashes}
+        stale = [entryPath for entryPath in self.cacheDirectory.glob('*.json') if entryPath.name not in keep]
+        for entryPath in stale:
+            entryPath.unlink(missing_ok=True)
+        if stale:
+            logger.info("Parse cache pruned; path='%s', deleted=%d, kept=%d", self.cacheDirectory, len(stale), len(keep))
+        return len(stale)
+
+    def __entryPath(self, fileHash: str) -> Path:
+        return self.cacheDirectory / f"{fileHash}.v{TextParser.PARSER_VERSION}.json"
+
+    @staticmethod
+    def __serialize(transaction: Transaction) -> list:
+        return [transaction.category, transaction.merchant, transaction.date.strftime('%Y-%m-%d'),
+                transaction.time, transaction.location, transaction.amount,
+                transaction.foreignAmount, transaction.foreignCurrency, transaction.transactionId]
+
+    @staticmethod
+    def __deserialize(row: list) -> Transaction:
+        category, merchant, date, time, location, amount, foreignAmount, foreignCurrency, transactionId = row
+        return Transaction(
+            category=category,
+            merchant=merchant,
+            date=datetime.fromisoformat(date),
+            time=time,
+            location=location,
+            amount=amount,
+            foreignAmount=foreignAmount,
+            foreignCurrency=foreignCurrency,
+            transactionId=transactionId,
+        )
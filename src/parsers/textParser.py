@@ -1,11 +1,18 @@
 import re
 from datetime import datetime
-from typing import Iterator
+from typing import Dict, Iterator, Optional, Sequence, Union
 
+from logging_config import getLogger
+from .dateRange import DateRange
 from .transaction import Transaction
 
+logger = getLogger(__name__)
+
 
 class TextParser:
+    # bump whenever parsed transactions change for the same input, invalidating persisted parse results
+    PARSER_VERSION = 2
+
     CATEGORY_PATTERN = re.compile(r"^([^\n*]+?)$", re.MULTILINE)
 
     # Transaction block pattern - matches the complete transaction structure
@@ -17,33 +24,72 @@ class TextParser:
         r"(?:\s+(?P<location>[^\n]+))?\n"  # Optional location
         r"\*(?P<amountChf>-?\d+(?:[\']\d{3})*(?:\.\d{2})?)\*\s+CHF"  # Amount (with optional thousands separator)
         r"(?:\s+(?P<foreignAmount>\d+(?:\.\d{2})?)\s+"  # Foreign amount
-        r"(?P<foreignCurrency>EUR|USD))?",  # Foreign currency
+        r"(?P<foreignCurrency>EUR|USD))?"  # Foreign currency
+        r"(?:[ \t]*\n<https://one\.viseca\.ch/[^>\s]*/(?P<transactionId>TRX\w+)>)?",  # Optional detail link with transaction ID
         re.MULTILINE,
     )
 
-    def parse(self, text: str) -> Iterator[Transaction]:
-        # find all transaction matches
+    # Same pattern over raw UTF-8 bytes (e.g. a memory-mapped export); only matched fields get decoded.
+    # Multi-byte UTF-8 sequences never contain '\n' or '*', so the byte classes match like the str ones,
+    # except for \s: on bytes it matches ASCII whitespace only.
+    TRANSACTION_PATTERN_BYTES = re.compile(TRANSACTION_PATTERN.pattern.encode("utf-8"), re.MULTILINE)
+
+    # UTF-8 of the characters str \s matches beyond ASCII whitespace (\x1c-\x1f, NEL, NBSP, the Unicode
+    # spaces and separators); buffers holding any of them are parsed through the str pattern
+    NON_ASCII_WHITESPACE_BYTES = re.compile(
+        rb"[\x1c-\x1f]|\xc2[\x85\xa0]|\xe1\x9a\x80|\xe2\x80[\x80-\x8a\xa8\xa9\xaf]|\xe2\x81\x9f|\xe3\x80\x80")
+
+    FIELD_NAMES = ("category", "merchant", "date", "time", "location", "amountChf", "foreignAmount", "foreignCurrency",
+                   "transactionId")
+
+    # a month holds at most 31 distinct dates; the bound only matters for multi-year archives
+    DATE_CACHE_SIZE = 4096
+
+    def __init__(self):
+        self.__dateCache: Dict[str, datetime] = {}
+
+    def parse(self, text: str, dateRange: Optional[DateRange] = None) -> Iterator[Transaction]:
+        # find all transaction matches; blocks outside dateRange are skipped before decoding
         for match in self.TRANSACTION_PATTERN.finditer(text):
+            if dateRange is not None and not dateRange.containsRaw(match.group("date")):
+                continue
             try:
                 transaction = self._parseTransactionMatch(match)
                 yield transaction
             except (ValueError, AttributeError) as e:
-                # Log error but continue parsing
-                print(f"Warning: Failed to parse transaction: {e}")
+                # Log error but continue parsing; stdout may carry the output data
+                logger.warning("Failed to parse transaction; error='%s'", e)
+                continue
+
+    def parseBytes(self, buffer: Union[bytes, memoryview], dateRange: Optional[DateRange] = None) -> Iterator[Transaction]:
+        # buffer holds UTF-8 text with '\n' line endings; scanned without decoding it as a whole.
+        # Invalid UTF-8 raises UnicodeDecodeError like the str path does when reading the file.
+        if self.NON_ASCII_WHITESPACE_BYTES.search(buffer):
+            yield from self.parse(bytes(buffer).decode("utf-8"), dateRange)
+            return
+        for match in self.TRANSACTION_PATTERN_BYTES.finditer(buffer):
+            if dateRange is not None and not dateRange.containsRaw(match.group("date")):
+                continue
+            fields = [field.decode() if field else field for field in match.group(*self.FIELD_NAMES)]
+            try:
+                yield self._createTransaction(fields)
+            except (ValueError, AttributeError) as e:
+                # Log error but continue parsing; stdout may carry the output data
+                logger.warning("Failed to parse transaction; error='%s'", e)
                 continue
 
     def _parseTransactionMatch(self, match: re.Match) -> Transaction:
+        return self._createTransaction(match.group(*self.FIELD_NAMES))
+
+    def _createTransaction(self, fields: Sequence[Optional[str]]) -> Transaction:
         # extract fields
-        category = match.group("category").strip()
-        merchant = match.group("merchant").strip()
-        dateStr = match.group("date")
-        timeStr = match.group("time")
-        location = match.group("location")
-        amountChf = float(match.group("amountChf").replace("'", ""))  # remove thousands separator
-        foreignAmountStr = match.group("foreignAmount")
-        foreignCurrency = match.group("foreignCurrency")
-        date = datetime.strptime(dateStr, "%d.%m.%Y")
-        foreignAmount = float(foreignAmountStr) if foreignAmountStr else None
+        (category, merchant, dateStr, timeStr, location,
+         amountChfStr, foreignAmountStr, foreignCurrency, transactionId) = fields
+        category = category.strip()
+        merchant = merchant.strip()
+        amountChf = self._decodeAmount(amountChfStr)
+        date = self._decodeDate(dateStr)
+        foreignAmount = self._decodeAmount(foreignAmountStr) if foreignAmountStr else None
 
         # clean location
         if location:
@@ -58,4 +104,22 @@ class TextParser:
             amount=amountChf,
             foreignAmount=foreignAmount,
             foreignCurrency=foreignCurrency,
+            transactionId=transactionId,
         )
+
+    def _decodeDate(self, dateStr: str) -> datetime:
+        # fixed-width DD.MM.YYYY (guaranteed by TRANSACTION_PATTERN); avoids the cost of strptime
+        date = self.__dateCache.get(dateStr)
+        if date is None:
+            date = datetime(int(dateStr[6:10]), int(dateStr[3:5]), int(dateStr[0:2]))
+            if len(self.__dateCache) >= self.DATE_CACHE_SIZE:
+                self.__dateCache.clear()
+            self.__dateCache[dateStr] = date
+        return date
+
+    @staticmethod
+    def _decodeAmount(amountStr: str) -> float:
+        # thousands separator (') only appears on amounts of 1'000 and more
+        if "'" in amountStr:
+            amountStr = amountStr.replace("'", "")
+        return float(amountStr)
@@ -1,9 +1,11 @@
+import sys
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Optional
 
 
-@dataclass
+# Slotted, not frozen: frozen dataclasses initialise through object.__setattr__, which slows down parsing
+@dataclass(slots=True)
 class Transaction:  # pylint: disable=too-many-instance-attributes
     category: str
     merchant: str
@@ -13,17 +15,36 @@ class Transaction:  # pylint: disable=too-many-instance-attributes
     amount: float
     foreignAmount: Optional[float] = None
     foreignCurrency: Optional[str] = None
+    transactionId: Optional[str] = None
 
     def __post_init__(self):
         if self.amount == 0:
             raise ValueError("Transaction amount cannot be zero")
         if self.foreignAmount is not None and self.foreignCurrency is None:
             raise ValueError("Foreign currency must be specified with foreign amount")
+        # few distinct values across many transactions; one shared string each
+        self.category = sys.intern(self.category)
+        self.merchant = sys.intern(self.merchant)
+        if self.foreignCurrency is not None:
+            self.foreignCurrency = sys.intern(self.foreignCurrency)
 
     @property
     def description(self) -> str:
         return self.merchant
 
+    @property
+    def amountCents(self) -> int:
+        # amounts carry two decimals at most
+        return round(self.amount * 100)
+
+    @property
+    def identity(self) -> tuple:
+        # the Viseca transaction ID where the export carries one, otherwise a fingerprint of the content
+        if self.transactionId:
+            return (self.transactionId,)
+        return (self.category, self.merchant, self.date, self.time, self.location,
+                self.amount, self.foreignAmount, self.foreignCurrency)
+
     @property
     def hasForeignCurrency(self) -> bool:
         return self.foreignAmount is not None and self.foreignCurrency is not None
@@ -0,0 +1,18 @@
+import os
+from pathlib import Path
+
+
+def partialPathOf(outputPath: Path) -> Path:
+    # the file a sink writes while rows arrive, next to the output so that the rename stays on one file system
+    outputPath = Path(outputPath)
+    return outputPath.with_name(f".{outputPath.name}.partial")
+
+
+def commitPartial(outputPath: Path) -> None:
+    # replaces the previous output only once the new one is complete
+    os.replace(partialPathOf(outputPath), outputPath)
+
+
+def discardPartial(outputPath: Path) -> None:
+    # a failed run leaves the previous output untouched
+    partialPathOf(outputPath).unlink(missing_ok=True)
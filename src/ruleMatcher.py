@@ -0,0 +1,121 @@
+import re
+from typing import Dict, Optional, Pattern, Tuple
+
+from configuration import Configuration, MappingRule
+from logging_config import getLogger
+
+logger = getLogger(__name__)
+
+
+class RuleMatcher:
+    # Patterns referring to their own groups cannot be merged into one alternation without renumbering
+    GROUP_REFERENCE_PATTERN = re.compile(r"\\[1-9]|\(\?P=|\(\?\(")
+    # Inline flags other than these would leak into the neighbouring patterns of a combined alternation
+    COMBINABLE_FLAGS = re.IGNORECASE | re.UNICODE
+    # Plain keywords (optionally anchored at the start) are merged into a character trie
+    LITERAL_PATTERN = re.compile(r"\^?[^.^$*+?{}\[\]\\|()]+")
+
+    def __init__(self, configuration: Configuration):
+        self.mappingRules = configuration.mappingRules
+        self.fallbackRules: Tuple[MappingRule, ...] = tuple(
+            rule for rules in self.mappingRules.values() for rule in rules if rule.pattern
+        )
+        self.__rangeRegexes: Dict[Tuple[int, int], Pattern] = {}
+        self.__combined = self.__compileFallback()
+
+    def match(self, category: str, merchant: str) -> Optional[MappingRule]:
+        # Pass 1: direct category match — check patterns first, then catch-all
+        rules = self.mappingRules.get(category)
+        if rules:
+            catchAll: Optional[MappingRule] = None
+            for rule in rules:
+                if rule.pattern:
+                    if rule.matches(merchant):
+                        return rule
+                elif catchAll is None:
+                    catchAll = rule
+            if catchAll:
+                return catchAll
+
+        # Pass 2: pattern-based matching across all categories
+        return self.__matchFallback(merchant)
+
+    def __matchFallback(self, merchant: str) -> Optional[MappingRule]:
+        if not self.__combined:
+            for rule in self.fallbackRules:
+                if rule.matches(merchant):
+                    return rule
+            return None
+
+        # One scan decides whether any rule matches; bisecting over rule ranges then finds the
+        # first matching rule in configuration order with log2(rules) further scans
+        low, high = 0, len(self.fallbackRules)
+        if not self.__rangeRegex(low, high).search(merchant):
+            return None
+        while high - low > 1:
+            middle = (low + high) // 2
+            if self.__rangeRegex(low, middle).search(merchant):
+                high = middle
+            else:
+                low = middle
+        return self.fallbackRules[low]
+
+    def __rangeRegex(self, low: int, high: int) -> Pattern:
+        if high - low == 1:
+            return self.fallbackRules[low].regex
+        regex = self.__rangeRegexes.get((low, high))
+        if regex is None:
+            regex = self.__compileRange(low, high)
+            self.__rangeRegexes[(low, high)] = regex
+        return regex
+
+    def __compileRange(self, low: int, high: int) -> Pattern:
+        # The re module tries alternatives one after another at every position, so keywords are
+        # factored into a trie; this regex only answers whether any rule of the range matches
+        keywords, anchoredKeywords, alternatives = [], [], []
+        for rule in self.fallbackRules[low:high]:
+            if not self.LITERAL_PATTERN.fullmatch(rule.pattern):
+                alternatives.append(f"(?:{rule.pattern})")
+            elif rule.pattern.startswith("^"):
+                anchoredKeywords.append(rule.pattern[1:])
+            else:
+                keywords.append(rule.pattern)
+        if keywords:
+            alternatives.insert(0, self.__trieRegex(keywords))
+        if anchoredKeywords:
+            alternatives.insert(0, f"^{self.__trieRegex(anchoredKeywords)}")
+        return re.compile("|".join(alternatives), re.IGNORECASE)
+
+    @staticmethod
+    def __trieRegex(keywords) -> str:
+        trie: dict = {}
+        for keyword in keywords:
+            node = trie
+            for char in keyword:
+                node = node.setdefault(char, {})
+            node[""] = {}
+
+        def toRegex(node: dict) -> str:
+            # A keyword ending here already matches; longer keywords sharing the prefix are redundant
+            if "" in node:
+                return ""
+            branches = [re.escape(char) + toRegex(child) for char, child in sorted(node.items())]
+            return branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+
+        return f"(?:{toRegex(trie)})"
+
+    def __compileFallback(self) -> bool:
+        if len(self.fallbackRules) < 2:
+            return False
+        for rule in self.fallbackRules:
+            if rule.regex.flags & ~self.COMBINABLE_FLAGS or self.GROUP_REFERENCE_PATTERN.search(rule.pattern):
+                logger.debug("Fallback patterns not combinable, using ordered loop; pattern='%s'", rule.pattern)
+                return False
+        try:
+            self.__rangeRegex(0, len(self.fallbackRules))
+        except re.error as exc:
+            logger.debug("Fallback patterns not combinable, using ordered loop; error='%s'", exc)
+            return False
+
+        logger.debug("Fallback patterns combined; rules=%d", len(self.fallbackRules))
+        return True
@@ -0,0 +1,46 @@
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional
+
+from configuration import Configuration, MappingRule
+from logging_config import getLogger
+from ruleMatcher import RuleMatcher
+
+logger = getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Resolution:
+    # rule is None when no mapping rule matches ("no match")
+    rule: Optional[MappingRule]
+    ignored: bool
+
+
+class RuleResolver:
+    DEFAULT_CACHE_SIZE = 4096
+
+    def __init__(self, configuration: Configuration, cacheSize: int = DEFAULT_CACHE_SIZE):
+        # Args: cacheSize - maximum number of (category, merchant) resolutions kept (least recently used evicted)
+        self.ignoreRules = configuration.ignoreRules
+        self.ruleMatcher = RuleMatcher(configuration)
+        self.__cachedResolve = lru_cache(maxsize=cacheSize)(self.__resolve)
+
+    def resolve(self, category: str, merchant: str) -> Resolution:
+        return self.__cachedResolve(category, merchant)
+
+    @property
+    def cacheHits(self) -> int:
+        return self.__cachedResolve.cache_info().hits
+
+    @property
+    def cacheMisses(self) -> int:
+        return self.__cachedResolve.cache_info().misses
+
+    def logCacheStatistics(self) -> None:
+        info = self.__cachedResolve.cache_info()
+        logger.info("Rule resolution cache; hits=%d, misses=%d, size=%d, maxSize=%d",
+                    info.hits, info.misses, info.currsize, info.maxsize)
+
+    def __resolve(self, category: str, merchant: str) -> Resolution:
+        ignored = self.ignoreRules.ignoresCategory(category) or self.ignoreRules.ignoresMerchant(merchant)
+        return Resolution(rule=self.ruleMatcher.match(category, merchant), ignored=ignored)
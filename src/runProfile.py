@@ -0,0 +1,298 @@
+import json
+import sys
+import time
+import tracemalloc
+from concurrent.futures import Executor, Future
+from contextlib import ExitStack, contextmanager, nullcontext
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # not available on Windows; peak RSS is left out of the report there
+    resource = None
+
+from logging_config import getLogger
+
+logger = getLogger(__name__)
+
+REPORT_VERSION = 1
+
+
+class StageObserver:  # pylint: disable=unused-argument
+    # Watches the pipeline stages; the defaults observe nothing, subclasses override what they need
+    def stage(self, name: str, detail: Optional[str] = None):
+        return nullcontext()
+
+    def timed(self, name: str, iterable: Iterable, detail: Optional[str] = None) -> Iterable:
+        return iterable
+
+    def recordCache(self, name: str, hits: int, misses: int) -> None:
+        pass
+
+    def count(self, name: str, value: int) -> None:
+        pass
+
+    def recordSpan(self, name: str, start: float, end: float, args: Optional[dict] = None) -> None:
+        # Args: start, end - time.perf_counter() values
+        pass
+
+    def forWorker(self) -> Optional['StageObserver']:
+        # a fresh observer to run in a worker process, whose observations adopt() takes over; None observes no workers
+        return None
+
+    def adopt(self, workerObserver: 'StageObserver') -> None:
+        pass
+
+
+# the observers of the running pipeline; empty unless --profile or another diagnostic option was given
+_observers: Tuple[StageObserver, ...] = ()
+
+
+class StageTimes:
+    __slots__ = ("wallSeconds", "cpuSeconds", "calls", "items")
+
+    def __init__(self):
+        self.wallSeconds = 0.0
+        self.cpuSeconds = 0.0
+        self.calls = 0
+        self.items = 0
+
+    def add(self, other: 'StageTimes') -> None:
+        self.wallSeconds += other.wallSeconds
+        self.cpuSeconds += other.cpuSeconds
+        self.calls += other.calls
+        self.items += other.items
+
+    def toJson(self) -> dict:
+        return {"wallSeconds": round(self.wallSeconds, 6), "cpuSeconds": round(self.cpuSeconds, 6),
+                "calls": self.calls, "items": self.items}
+
+
+class RunProfile(StageObserver):  # pylint: disable=too-many-instance-attributes
+    # Self time per stage: the time a stage spends in the stages it pulls from is booked to those, so the
+    # stage times add up to the run time although parsing, classifying and writing interleave as generators.
+    # A stage may be refined by a detail (the file parsed) that gets its own times besides the stage total;
+    # items count what a stage hands to its consumer, a detail's items what it handed to the stage.
+    # Stages of worker processes are added to the totals; as they ran in parallel, the stage times of a
+    # run with --jobs may add up to more than its wall time.
+    def __init__(self, traceMemory: bool = True):
+        # Args: traceMemory - trace Python allocations for the peak (slows allocation heavy stages down)
+        self.traceMemory = traceMemory
+        self.stages: Dict[str, StageTimes] = {}
+        self.details: Dict[Tuple[str, str], StageTimes] = {}
+        self.caches: Dict[str, Dict[str, int]] = {}
+        self.counts: Dict[str, int] = {}
+        self.startedAt = datetime.now()
+        self.tracemallocPeak: Optional[int] = None
+        self.__tracing = False
+        self.__stack: List[Tuple[str, Optional[str]]] = []
+        self.__start = (time.perf_counter(), time.process_time())
+        self.__mark = self.__start
+        self.__end: Optional[Tuple[float, float]] = None
+
+    def start(self) -> 'RunProfile':
+        if self.traceMemory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.__tracing = True
+        self.__start = self.__mark = (time.perf_counter(), time.process_time())
+        return self
+
+    def stop(self) -> None:
+        self.__end = (time.perf_counter(), time.process_time())
+        if tracemalloc.is_tracing():
+            self.tracemallocPeak = tracemalloc.get_traced_memory()[1]
+        if self.__tracing:
+            tracemalloc.stop()
+            self.__tracing = False
+
+    @contextmanager
+    def stage(self, name: str, detail: Optional[str] = None) -> Iterator[None]:
+        self.__enter(name, detail)
+        try:
+            yield
+        finally:
+            self.__leave(items=0)
+
+    def timed(self, name: str, iterable: Iterable, detail: Optional[str] = None) -> Iterator:
+        # the time spent producing each item is booked to the stage, not the time the consumer spends on it
+        iterator = iter(iterable)
+        while True:
+            self.__enter(name, detail)
+            try:
+                item = next(iterator)
+            except StopIteration:
+                self.__leave(items=0)
+                return
+            except BaseException:
+                self.__leave(items=0)
+                raise
+            self.__leave(items=1)
+            yield item
+
+    def recordCache(self, name: str, hits: int, misses: int) -> None:
+        self.caches[name] = {"hits": hits, "misses": misses}
+
+    def count(self, name: str, value: int) -> None:
+        self.counts[name] = self.counts.get(name, 0) + value
+
+    def forWorker(self) -> 'RunProfile':
+        # allocations of the workers are not traced, their peak RSS is in peakRssChildrenBytes
+        return RunProfile(traceMemory=False)
+
+    def adopt(self, workerObserver: StageObserver) -> None:
+        for name, times in workerObserver.stages.items():
+            self.stages.setdefault(name, StageTimes()).add(times)
+        for key, times in workerObserver.details.items():
+            self.details.setdefault(key, StageTimes()).add(times)
+        for name, stats in workerObserver.caches.items():
+            previous = self.caches.get(name, {"hits": 0, "misses": 0})
+            self.caches[name] = {"hits": previous["hits"] + stats["hits"], "misses": previous["misses"] + stats["misses"]}
+        for name, value in workerObserver.counts.items():
+            self.count(name, value)
+
+    def toJson(self, arguments: Optional[dict] = None) -> dict:
+        end = self.__end or (time.perf_counter(), time.process_time())
+        wallSeconds = end[0] - self.__start[0]
+        parse = self.stages.get("parse")
+        transactions = self.counts.get("transactions", parse.items if parse else 0)
+        return {
+            "version": REPORT_VERSION,
+            "startedAt": self.startedAt.isoformat(timespec="seconds"),
+            "arguments": arguments or {},
+            "wallSeconds": round(wallSeconds, 6),
+            "cpuSeconds": round(end[1] - self.__start[1], 6),
+            "transactions": transactions,
+            "transactionsPerSecond": round(transactions / wallSeconds) if wallSeconds else None,
+            "counts": self.counts,
+            "stages": {name: times.toJson() for name, times in self.stages.items()},
+            "files": [{"file": detail, **times.toJson()} for (name, detail), times in self.details.items() if name == "parse"],
+            "memory": {"tracemallocPeakBytes": self.tracemallocPeak, **peakRss()},
+            "caches": {name: {**stats, "hitRate": round(stats["hits"] / (stats["hits"] + stats["misses"]), 4)
+                              if stats["hits"] + stats["misses"] else None}
+                       for name, stats in self.caches.items()},
+        }
+
+    def write(self, path: Path, arguments: Optional[dict] = None) -> None:
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.toJson(arguments), file, ensure_ascii=False, indent=1)
+        logger.info("Profile written; path='%s'", path)
+
+    def __enter(self, name: str, detail: Optional[str]) -> None:
+        self.__book()
+        self.__stack.append((name, detail))
+
+    def __leave(self, items: int) -> None:
+        self.__book()
+        name, detail = self.__stack.pop()
+        # a detail refines a stage entered around it, whose calls and items are counted there
+        times = self.details[(name, detail)] if detail is not None else self.stages[name]
+        times.calls += 1
+        times.items += items
+
+    def __book(self) -> None:
+        # books the time since the last switch to the stage on top of the stack
+        now = (time.perf_counter(), time.process_time())
+        if self.__stack:
+            for times in self.__timesOf(*self.__stack[-1]):
+                times.wallSeconds += now[0] - self.__mark[0]
+                times.cpuSeconds += now[1] - self.__mark[1]
+        self.__mark = now
+
+    def __timesOf(self, name: str, detail: Optional[str]) -> List[StageTimes]:
+        times = [self.stages.setdefault(name, StageTimes())]
+        if detail is not None:
+            times.append(self.details.setdefault((name, detail), StageTimes()))
+        return times
+
+
+def peakRss() -> Dict[str, Optional[int]]:
+    # bytes; ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    if resource is None:
+        return {"peakRssBytes": None, "peakRssChildrenBytes": None}
+    scale = 1 if sys.platform == "darwin" else 1024
+    return {"peakRssBytes": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale,
+            "peakRssChildrenBytes": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * scale}
+
+
+def activate(*observers: Optional[StageObserver]) -> None:
+    # the first observer sees the stages closest, later ones observe it at work too; None entries are skipped
+    global _observers  # pylint: disable=global-statement
+    _observers = tuple(observer for observer in observers if observer is not None)
+
+
+def active() -> Tuple[StageObserver, ...]:
+    return _observers
+
+
+# Entry points for the pipeline; without observers they cost a global lookup and nothing else
+
+def stage(name: str, detail: Optional[str] = None):
+    if not _observers:
+        return nullcontext()
+    if len(_observers) == 1:
+        return _observers[0].stage(name, detail)
+    stack = ExitStack()
+    for observer in _observers:
+        stack.enter_context(observer.stage(name, detail))
+    return stack
+
+
+def timed(name: str, iterable: Iterable, detail: Optional[str] = None) -> Iterable:
+    for observer in _observers:
+        iterable = observer.timed(name, iterable, detail)
+    return iterable
+
+
+def recordCache(name: str, hits: int, misses: int) -> None:
+    for observer in _observers:
+        observer.recordCache(name, hits, misses)
+
+
+def count(name: str, value: int) -> None:
+    for observer in _observers:
+        observer.count(name, value)
+
+
+def recordSpan(name: str, start: float, end: float, args: Optional[dict] = None) -> None:
+    for observer in _observers:
+        observer.recordSpan(name, start, end, args)
+
+
+class _ObservedCall:
+    # Future of a call in a worker process that runs under worker observers; fetching the result hands
+    # their observations to the observers of this process
+    def __init__(self, future: Future, observers: Tuple[StageObserver, ...]):
+        self.future = future
+        self.observers = observers
+
+    def result(self):
+        value, workerObservers = self.future.result()
+        for observer, workerObserver in zip(self.observers, workerObservers):
+            observer.adopt(workerObserver)
+        return value
+
+    def cancel(self) -> bool:
+        return self.future.cancel()
+
+
+def _callObserved(workerObservers: Tuple[StageObserver, ...], function: Callable, args: tuple):
+    activate(*workerObservers)
+    try:
+        return function(*args), workerObservers
+    finally:
+        activate()
+
+
+def submit(executor: Executor, function: Callable, *args):
+    # executor.submit() for process pools; observers wanting to see into the workers get their worker observer
+    # there, the others are kept out of forked workers. Returns a Future, or an object with its result() and
+    # cancel() while observers are active
+    if not _observers:
+        return executor.submit(function, *args)
+    pairs = [(observer, workerObserver) for observer in _observers
+             for workerObserver in (observer.forWorker(),) if workerObserver is not None]
+    observers = tuple(observer for observer, _ in pairs)
+    workerObservers = tuple(workerObserver for _, workerObserver in pairs)
+    return _ObservedCall(executor.submit(_callObserved, workerObservers, function, args), observers)
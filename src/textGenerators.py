@@ -0,0 +1,142 @@
+import csv
+import json
+import sys
+from pathlib import Path
+from typing import Iterable, Optional, TextIO
+
+from accountMapper import BookingEntry
+from columnValues import compileColumnValues
+from configuration import Configuration
+from logging_config import getLogger
+from partialFile import commitPartial, discardPartial, partialPathOf
+
+logger = getLogger(__name__)
+
+
+class CsvSink:
+    # Writes a delimited text file row by row: a header with the column names, then one line per entry
+    # with dates in the configured format, amounts with two decimals and empty fields for missing values.
+    # The file is written next to outputPath and replaces it on close().
+    def __init__(self, outputPath: Path, configuration: Configuration, delimiter: str = ","):
+        self.outputPath = outputPath
+        self.delimiter = delimiter
+        self.columnNames = [column.name for column in configuration.columns]
+        self.columnValues = compileColumnValues(configuration.columns)
+        self.rowCount = 0
+        self.__file: Optional[TextIO] = None
+        self.__writer = None
+
+    def __enter__(self) -> 'CsvSink':
+        return self.open()
+
+    def __exit__(self, excType, excValue, traceback) -> None:
+        if excType is None:
+            self.close()
+        else:
+            self.abort()
+
+    def open(self) -> 'CsvSink':
+        # newline='' as the csv module writes the line terminators itself; the file stays open while rows
+        # arrive, close() or abort() release it
+        self.__file = open(partialPathOf(self.outputPath), "w", encoding="utf-8", newline="")  # pylint: disable=consider-using-with
+        self.__writer = csv.writer(self.__file, delimiter=self.delimiter, lineterminator="\n")
+        self.__writer.writerow(self.columnNames)
+        return self
+
+    def write(self, entry: BookingEntry) -> None:
+        self.__writer.writerow([self.__field(value(entry)) for value in self.columnValues])
+        self.rowCount += 1
+
+    def close(self) -> int:
+        self.__file.close()
+        commitPartial(self.outputPath)
+        return self.rowCount
+
+    def abort(self) -> None:
+        # a previous file at outputPath is kept
+        try:
+            if self.__file is not None:
+                self.__file.close()
+        finally:
+            discardPartial(self.outputPath)
+
+    @staticmethod
+    def __field(value) -> str:
+        if value is None:
+            return ""
+        if isinstance(value, float):
+            return f"{value:.2f}"
+        return value
+
+
+class JsonLinesSink:
+    # Writes one JSON object per entry and line, keyed by column name: dates in the configured format,
+    # amounts as numbers, null for missing values. The stream is flushed, never closed.
+    def __init__(self, stream: TextIO, configuration: Configuration):
+        self.stream = stream
+        self.columnNames = [column.name for column in configuration.columns]
+        self.columnValues = compileColumnValues(configuration.columns)
+        self.rowCount = 0
+        self.__encoder = json.JSONEncoder(ensure_ascii=False)
+
+    def __enter__(self) -> 'JsonLinesSink':
+        return self.open()
+
+    def __exit__(self, excType, excValue, traceback) -> None:
+        if excType is None:
+            self.close()
+        else:
+            self.abort()
+
+    def open(self) -> 'JsonLinesSink':
+        return self
+
+    def write(self, entry: BookingEntry) -> None:
+        row = {name: value(entry) for name, value in zip(self.columnNames, self.columnValues)}
+        self.stream.write(self.__encoder.encode(row) + "\n")
+        self.rowCount += 1
+
+    def close(self) -> int:
+        self.stream.flush()
+        return self.rowCount
+
+    def abort(self) -> None:
+        # lines already written cannot be taken back; consumers see the stream end early
+        self.stream.flush()
+
+
+class CsvGenerator:
+    def __init__(self, configuration: Configuration, delimiter: str = ","):
+        # Args: delimiter - field separator, "\t" for TSV
+        self.configuration = configuration
+        self.delimiter = delimiter
+
+    def open(self, outputPath: Path) -> CsvSink:
+        return CsvSink(outputPath, self.configuration, self.delimiter)
+
+    def generate(self, entries: Iterable[BookingEntry], outputPath: Path) -> int:
+        logger.info("Starting CSV generation; output_path='%s'", outputPath)
+        try:
+            with self.open(outputPath) as sink:
+                for entry in entries:
+                    sink.write(entry)
+            logger.info("CSV generation completed; output_path='%s', rows=%d", outputPath, sink.rowCount)
+            return sink.rowCount
+        except Exception as exc:
+            logger.error("CSV generation failed; output_path='%s', error='%s'", outputPath, exc)
+            raise
+
+
+class JsonLinesGenerator:
+    def __init__(self, configuration: Configuration):
+        self.configuration = configuration
+
+    def open(self, stream: Optional[TextIO] = None) -> JsonLinesSink:
+        # Args: stream - text stream to write to (default: standard output)
+        return JsonLinesSink(stream if stream is not None else sys.stdout, self.configuration)
+
+    def generate(self, entries: Iterable[BookingEntry], stream: Optional[TextIO] = None) -> int:
+        with self.open(stream) as sink:
+            for entry in entries:
+                sink.write(entry)
+        return sink.rowCount
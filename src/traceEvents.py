@@ -0,0 +1,84 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional
+
+from logging_config import getLogger
+from runProfile import StageObserver
+
+logger = getLogger(__name__)
+
+PROCESS_NAME = "onecreditcard"
+# what the items of a streaming stage are, for the span arguments
+ITEM_NAMES = {"parse": "transactions", "classify": "entries"}
+
+
+def _microseconds(seconds: float) -> float:
+    return round(seconds * 1_000_000, 3)
+
+
+class TraceRecorder(StageObserver):
+    # Records a span per pipeline stage, parsed file and written workbook as complete events ("ph": "X")
+    # of the Chrome trace-event format, opened with Perfetto (ui.perfetto.dev) or chrome://tracing.
+    # Timestamps are time.perf_counter() values, a system-wide monotonic clock on Linux, macOS and
+    # Windows, so spans recorded in worker processes line up with those of the main process.
+    # A streaming stage spans from its first item to its last and so encloses the stages it pulls from.
+    def __init__(self):
+        self.events: List[dict] = []
+        self.pid = os.getpid()
+
+    @contextmanager
+    def stage(self, name: str, detail: Optional[str] = None) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.recordSpan(self.__nameOf(name, detail), start, time.perf_counter(), self.__argsOf(detail))
+
+    def timed(self, name: str, iterable: Iterable, detail: Optional[str] = None) -> Iterable:
+        return self.__spanAround(name, iterable, detail)
+
+    def recordSpan(self, name: str, start: float, end: float, args: Optional[dict] = None) -> None:
+        self.events.append({"name": name, "ph": "X", "ts": _microseconds(start), "dur": _microseconds(end - start),
+                            "pid": os.getpid(), "tid": threading.get_native_id(), "args": args or {}})
+
+    def forWorker(self) -> 'TraceRecorder':
+        return TraceRecorder()
+
+    def adopt(self, workerObserver: StageObserver) -> None:
+        self.events.extend(workerObserver.events)
+
+    def toJson(self) -> dict:
+        # the main process and every worker that recorded a span get a name in the timeline
+        pids = sorted({event["pid"] for event in self.events} | {self.pid})
+        names = [{"name": "process_name", "ph": "M", "pid": pid, "tid": 0,
+                  "args": {"name": PROCESS_NAME if pid == self.pid else f"worker {pid}"}} for pid in pids]
+        return {"traceEvents": names + sorted(self.events, key=lambda event: event["ts"]), "displayTimeUnit": "ms"}
+
+    def write(self, path: Path) -> None:
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.toJson(), file, ensure_ascii=False)
+        logger.info("Trace written; path='%s', spans=%d", path, len(self.events))
+
+    def __spanAround(self, name: str, iterable: Iterable, detail: Optional[str]) -> Iterator:
+        # the span starts with the first item pulled, not when the pipeline is built
+        start = time.perf_counter()
+        items = 0
+        try:
+            for item in iterable:
+                items += 1
+                yield item
+        finally:
+            self.recordSpan(self.__nameOf(name, detail), start, time.perf_counter(),
+                            {**self.__argsOf(detail), ITEM_NAMES.get(name, "items"): items})
+
+    @staticmethod
+    def __nameOf(name: str, detail: Optional[str]) -> str:
+        return name if detail is None else f"{name} {detail}"
+
+    @staticmethod
+    def __argsOf(detail: Optional[str]) -> dict:
+        return {"file": detail} if detail is not None else {}
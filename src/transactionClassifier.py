@@ -0,0 +1,76 @@
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from accountMapper import AccountMapper, BookingEntry
+from configuration import Configuration
+from logging_config import getLogger
+from parsers.transaction import Transaction
+from ruleResolver import RuleResolver
+from transactionGrouper import Group, GroupBuilder
+
+logger = getLogger(__name__)
+
+
+@dataclass
+class Classification:
+    # individual holds the transactions booked one by one (ignored transactions excluded)
+    individual: List[Transaction] = field(default_factory=list)
+    groups: List[Group] = field(default_factory=list)
+    entries: List[BookingEntry] = field(default_factory=list)
+    individualCount: int = 0
+    ignoredCount: int = 0
+
+
+class TransactionClassifier:
+    # Resolves every transaction exactly once and derives both the grouping and the mapping from it:
+    # a matching rule makes it a group member (ahead of ignore rules, as grouping always ran first),
+    # otherwise it is ignored or booked individually
+    def __init__(self, configuration: Configuration, resolver: Optional[RuleResolver] = None):
+        self.configuration = configuration
+        self.resolver = resolver or RuleResolver(configuration)
+        self.mapper = AccountMapper(configuration, self.resolver)
+
+    def classify(self, transactions: Iterable[Transaction]) -> Classification:
+        classification = Classification()
+        classification.entries = list(self.__classify(transactions, classification, retainTransactions=True))
+        return classification
+
+    def stream(self, transactions: Iterable[Transaction], groups: Optional[List[Group]] = None) -> Iterator[BookingEntry]:
+        # Individual entries are yielded as transactions arrive; group entries follow once the input is
+        # exhausted. Only group aggregates are held, neither transactions nor entries are retained.
+        # Args: groups - the groups of these transactions, aggregated beforehand (TransactionStore.groups());
+        #                group members are then only skipped
+        yield from self.__classify(transactions, Classification(), retainTransactions=False, groups=groups)
+
+    def __classify(self, transactions: Iterable[Transaction], classification: Classification,
+                   retainTransactions: bool, groups: Optional[List[Group]] = None) -> Iterator[BookingEntry]:
+        # key: (description, debitAccount) to group by mapping rule, not source category
+        toBeGrouped: Dict[Tuple[str, str], GroupBuilder] = {}
+
+        for transaction in transactions:
+            resolution = self.resolver.resolve(transaction.category, transaction.merchant)
+            rule = resolution.rule
+            if rule and groups is not None:
+                continue
+            if rule:
+                key = (rule.description, rule.debitAccount)
+                if key not in toBeGrouped:
+                    toBeGrouped[key] = GroupBuilder(rule, retainTransactions)
+                toBeGrouped[key].add(transaction)
+                logger.debug("Transaction added to group; merchant='%s', category='%s', debitAccount='%s'",
+                            transaction.merchant, transaction.category, rule.debitAccount)
+            elif resolution.ignored:
+                classification.ignoredCount += 1
+                logger.debug("Transaction ignored; merchant='%s', category='%s'",
+                            transaction.merchant, transaction.category)
+            else:
+                classification.individualCount += 1
+                if retainTransactions:
+                    classification.individual.append(transaction)
+                yield self.mapper.mapTransaction(transaction, None)
+
+        classification.groups = groups if groups is not None else [builder.build() for builder in toBeGrouped.values()]
+        yield from self.mapper.mapGroups(classification.groups)
+
+        logger.info("Transactions classified; individual=%d, groups=%d, ignored=%d",
+                   classification.individualCount, len(classification.groups), classification.ignoredCount)
@@ -1,17 +1,17 @@
 from calendar import monthrange
 from dataclasses import dataclass, field
 from datetime import datetime
-import re
 from typing import Dict, Iterator, List, Optional, Tuple
 
 from configuration import Configuration, MappingRule
 from logging_config import getLogger
+from ruleResolver import RuleResolver
 from parsers.transaction import Transaction
 
 logger = getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class Group:
     description: str
     totalAmount: float
@@ -21,21 +21,58 @@ class Group:
     mappingRule: Optional[MappingRule] = field(default=None)
 
 
+class GroupBuilder:
+    # Accumulates a group's aggregates transaction by transaction; members are only kept when retained
+    def __init__(self, rule: MappingRule, retainTransactions: bool = True):
+        self.rule = rule
+        self.retainTransactions = retainTransactions
+        self.totalAmount = 0.0
+        self.transactionCount = 0
+        self.firstDate: Optional[datetime] = None
+        self.transactions: List[Transaction] = []
+
+    def add(self, transaction: Transaction) -> None:
+        self.totalAmount += transaction.amount
+        self.transactionCount += 1
+        if self.firstDate is None:
+            self.firstDate = transaction.date
+        if self.retainTransactions:
+            self.transactions.append(transaction)
+
+    def build(self) -> Group:
+        logger.debug("Group created; description='%s', debitAccount='%s', transactions=%d, totalAmount=%.2f",
+                    self.rule.description, self.rule.debitAccount, self.transactionCount, self.totalAmount)
+        return Group(
+            description=self.rule.description,
+            totalAmount=self.totalAmount,
+            transactionCount=self.transactionCount,
+            monthEndDate=self.__getMonthEndDate(self.firstDate),
+            transactions=self.transactions,
+            mappingRule=self.rule,
+        )
+
+    @staticmethod
+    def __getMonthEndDate(date: datetime) -> datetime:
+        lastDay = monthrange(date.year, date.month)[1]
+        return datetime(date.year, date.month, lastDay)
+
+
 class TransactionGrouper:
-    def __init__(self, configuration: Configuration):
+    def __init__(self, configuration: Configuration, resolver: Optional[RuleResolver] = None):
         self.configuration = configuration
+        self.resolver = resolver or RuleResolver(configuration)
 
     def group(self, transactions: Iterator[Transaction]) -> Tuple[List[Transaction], List[Group]]:
         # key: (description, debitAccount) to group by mapping rule, not source category
-        toBeGrouped: Dict[Tuple[str, str], Dict] = {}
+        toBeGrouped: Dict[Tuple[str, str], GroupBuilder] = {}
         individual = []
         for transaction in transactions:
             rule = self.__findMatchingRule(transaction)
             if rule:
                 key = (rule.description, rule.debitAccount)
                 if key not in toBeGrouped:
-                    toBeGrouped[key] = {'rule': rule, 'transactions': []}
-                toBeGrouped[key]['transactions'].append(transaction)
+                    toBeGrouped[key] = GroupBuilder(rule)
+                toBeGrouped[key].add(transaction)
                 logger.debug("Transaction added to group; merchant='%s', category='%s', debitAccount='%s'",
                             transaction.merchant, transaction.category, rule.debitAccount)
             else:
@@ -43,57 +80,9 @@ class TransactionGrouper:
                 logger.debug("Transaction kept individual; merchant='%s', category='%s'",
                             transaction.merchant, transaction.category)
 
-        groups = []
-        for (description, _), entry in toBeGrouped.items():
-            rule = entry['rule']
-            groupTransactions = entry['transactions']
-            totalAmount = sum(t.amount for t in groupTransactions)
-            monthEndDate = self.__getMonthEndDate(groupTransactions[0].date)
-            groups.append(
-                Group(
-                    description=description,
-                    totalAmount=totalAmount,
-                    transactionCount=len(groupTransactions),
-                    monthEndDate=monthEndDate,
-                    transactions=groupTransactions,
-                    mappingRule=rule,
-                )
-            )
-            logger.debug("Group created; description='%s', debitAccount='%s', transactions=%d, totalAmount=%.2f",
-                        description, rule.debitAccount, len(groupTransactions), totalAmount)
+        groups = [builder.build() for builder in toBeGrouped.values()]
 
         return individual, groups
 
     def __findMatchingRule(self, transaction: Transaction) -> Optional[MappingRule]:
-        mappingRules = self.configuration.mappingRules
-
-        # Pass 1: direct category match — check patterns first, then catch-all
-        if transaction.category in mappingRules:
-            catchAll: Optional[MappingRule] = None
-            for rule in mappingRules[transaction.category]:
-                if rule.pattern:
-                    if self.__matchesPattern(transaction.merchant, rule.pattern):
-                        return rule
-                elif catchAll is None:
-                    catchAll = rule
-            if catchAll:
-                return catchAll
-
-        # Pass 2: pattern-based matching across all categories
-        for rules in mappingRules.values():
-            for rule in rules:
-                if rule.pattern and self.__matchesPattern(transaction.merchant, rule.pattern):
-                    return rule
-
-        return None
-
-    def __matchesPattern(self, text: str, pattern: str) -> bool:
-        try:
-            return re.search(pattern, text, re.IGNORECASE) is not None
-        except re.error as exc:
-            logger.error("Invalid regex pattern in grouping; pattern='%s', error='%s'", pattern, exc)
-            return pattern.lower() in text.lower()
-
-    def __getMonthEndDate(self, date: datetime) -> datetime:
-        lastDay = monthrange(date.year, date.month)[1]
-        return datetime(date.year, date.month, lastDay)
+        return self.resolver.resolve(transaction.category, transaction.merchant).rule
@@ -0,0 +1,202 @@
+from array import array
+from calendar import monthrange
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # optional; aggregation falls back to loops over the array columns
+    np = None
+
+from logging_config import getLogger
+from parsers.transaction import Transaction
+from ruleResolver import RuleResolver
+from transactionGrouper import Group
+
+logger = getLogger(__name__)
+
+
+class _Dictionary:
+    # distinct strings in order of appearance, each encoded as its index
+    def __init__(self):
+        self.values: List[str] = []
+        self.__index: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __getitem__(self, code: int) -> str:
+        return self.values[code]
+
+    def encode(self, value: str) -> int:
+        code = self.__index.get(value)
+        if code is None:
+            code = self.__index[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+class TransactionStore:
+    # Parsed transactions held column by column: integer-cent amounts, ordinal dates and codes into the
+    # category and merchant dictionaries. Grouping, month bucketing and totals aggregate whole columns,
+    # vectorized with NumPy when installed. Group totals add up the amounts in input order like GroupBuilder
+    # does, so they equal its float totals; month totals are exact sums of integer cents.
+    def __init__(self, useNumpy: Optional[bool] = None):
+        # Args: useNumpy - aggregate with NumPy (default: whenever it is installed)
+        if useNumpy and np is None:
+            logger.error("NumPy requested but not installed")
+            raise RuntimeError("NumPy is not installed")
+        self.useNumpy = np is not None if useNumpy is None else useNumpy
+        self.amountCents = array('q')
+        self.dateOrdinals = array('q')
+        self.categoryCodes = array('q')
+        self.merchantCodes = array('q')
+        self.categories = _Dictionary()
+        self.merchants = _Dictionary()
+
+    @classmethod
+    def fromTransactions(cls, transactions: Iterable[Transaction], useNumpy: Optional[bool] = None) -> 'TransactionStore':
+        store = cls(useNumpy)
+        store.extend(transactions)
+        return store
+
+    def __len__(self) -> int:
+        return len(self.amountCents)
+
+    def append(self, transaction: Transaction) -> None:
+        self.amountCents.append(transaction.amountCents)
+        self.dateOrdinals.append(transaction.date.toordinal())
+        self.categoryCodes.append(self.categories.encode(transaction.category))
+        self.merchantCodes.append(self.merchants.encode(transaction.merchant))
+
+    def extend(self, transactions: Iterable[Transaction]) -> None:
+        for transaction in transactions:
+            self.append(transaction)
+
+    def groups(self, resolver: RuleResolver) -> List[Group]:
+        # the groups TransactionClassifier builds, in the same order; members are not retained
+        rules, rowRules = self.__resolveRows(resolver)
+        totals, counts, firstRows = self.__aggregate(rowRules, len(rules), inCents=False)
+        return self.__buildGroups(rules, range(len(rules)), totals, counts, firstRows)
+
+    def groupsByMonth(self, resolver: RuleResolver) -> Dict[str, List[Group]]:
+        # groups per booking month ('YYYY-MM'), months in ascending order
+        rules, rowRules = self.__resolveRows(resolver)
+        months, rowMonths = self.__bucketMonths()
+        ruleCount = len(rules)
+        rowKeys = self.__combineKeys(rowMonths, rowRules, ruleCount)
+        totals, counts, firstRows = self.__aggregate(rowKeys, len(months) * ruleCount, inCents=False)
+        return {month: self.__buildGroups(rules, range(index * ruleCount, (index + 1) * ruleCount), totals, counts, firstRows)
+                for index, month in enumerate(months)}
+
+    def monthTotals(self) -> Dict[str, float]:
+        # total amount of all transactions per booking month ('YYYY-MM'), months in ascending order
+        months, rowMonths = self.__bucketMonths()
+        totals, _, _ = self.__aggregate(rowMonths, len(months), inCents=True)
+        return {month: totals[index] / 100 for index, month in enumerate(months)}
+
+    def __resolveRows(self, resolver: RuleResolver) -> Tuple[List, Sequence[int]]:
+        # Resolves each distinct (category, merchant) pair once; rows without a rule get -1.
+        # Returns the distinct (description, debitAccount) rules and the rule index of every row.
+        merchantCount = max(len(self.merchants), 1)
+        ruleIndex: Dict[Tuple[str, str], int] = {}
+        rules = []
+
+        def ruleOf(pair: int) -> int:
+            rule = resolver.resolve(self.categories[pair // merchantCount], self.merchants[pair % merchantCount]).rule
+            if rule is None:
+                return -1
+            key = (rule.description, rule.debitAccount)
+            if key not in ruleIndex:
+                ruleIndex[key] = len(rules)
+                rules.append(rule)
+            return ruleIndex[key]
+
+        if self.useNumpy:
+            return rules, self.__rowRulesVectorized(ruleOf, merchantCount)
+        return rules, self.__rowRules(ruleOf, merchantCount)
+
+    def __rowRulesVectorized(self, ruleOf, merchantCount: int) -> Sequence[int]:
+        pairs = np.frombuffer(self.categoryCodes, dtype=np.int64) * merchantCount + np.frombuffer(self.merchantCodes, dtype=np.int64)
+        distinctPairs, inverse = np.unique(pairs, return_inverse=True)
+        lookup = np.fromiter((ruleOf(pair) for pair in distinctPairs.tolist()), dtype=np.int64, count=len(distinctPairs))
+        return lookup[inverse]
+
+    def __rowRules(self, ruleOf, merchantCount: int) -> Sequence[int]:
+        pairRules: Dict[int, int] = {}
+        rowRules = array('q')
+        for categoryCode, merchantCode in zip(self.categoryCodes, self.merchantCodes):
+            pair = categoryCode * merchantCount + merchantCode
+            rule = pairRules.get(pair)
+            if rule is None:
+                rule = pairRules[pair] = ruleOf(pair)
+            rowRules.append(rule)
+        return rowRules
+
+    def __bucketMonths(self) -> Tuple[List[str], Sequence[int]]:
+        # Returns the distinct months ('YYYY-MM', ascending) and the month index of every row
+        if self.useNumpy:
+            distinctOrdinals, inverse = np.unique(np.frombuffer(self.dateOrdinals, dtype=np.int64), return_inverse=True)
+            ordinalMonths = [date.fromordinal(ordinal).strftime('%Y-%m') for ordinal in distinctOrdinals.tolist()]
+            months = sorted(set(ordinalMonths))
+            monthIndex = {month: index for index, month in enumerate(months)}
+            lookup = np.fromiter((monthIndex[month] for month in ordinalMonths), dtype=np.int64, count=len(ordinalMonths))
+            return months, lookup[inverse]
+
+        ordinalMonths = {ordinal: date.fromordinal(ordinal).strftime('%Y-%m') for ordinal in set(self.dateOrdinals)}
+        months = sorted(set(ordinalMonths.values()))
+        monthIndex = {month: index for index, month in enumerate(months)}
+        ordinalIndex = {ordinal: monthIndex[month] for ordinal, month in ordinalMonths.items()}
+        return months, array('q', (ordinalIndex[ordinal] for ordinal in self.dateOrdinals))
+
+    def __combineKeys(self, rowMonths: Sequence[int], rowRules: Sequence[int], ruleCount: int) -> Sequence[int]:
+        if self.useNumpy:
+            return np.where(rowRules >= 0, rowMonths * ruleCount + rowRules, -1)
+        return array('q', (month * ruleCount + rule if rule >= 0 else -1 for month, rule in zip(rowMonths, rowRules)))
+
+    def __aggregate(self, rowKeys: Sequence[int], keyCount: int, inCents: bool) -> Tuple[List, List[int], List[int]]:
+        # Sums the amounts, counts rows and finds the first row per key; rows with key -1 are skipped.
+        # Args: inCents - sum integer cents, otherwise the float amounts row by row (amounts carry two
+        #                 decimals at most, so cents / 100 is the parsed amount)
+        if self.useNumpy:
+            rows = np.flatnonzero(rowKeys >= 0)
+            keys = rowKeys[rows]
+            cents = np.frombuffer(self.amountCents, dtype=np.int64)[rows]
+            totals = np.zeros(keyCount, dtype=np.int64 if inCents else np.float64)
+            # unbuffered and in row order, like adding the amounts one by one
+            np.add.at(totals, keys, cents if inCents else cents / 100)
+            counts = np.bincount(keys, minlength=keyCount)
+            firstRows = np.full(keyCount, -1, dtype=np.int64)
+            distinctKeys, firstPositions = np.unique(keys, return_index=True)
+            firstRows[distinctKeys] = rows[firstPositions]
+            return totals.tolist(), counts.tolist(), firstRows.tolist()
+
+        totals = [0 if inCents else 0.0] * keyCount
+        counts = [0] * keyCount
+        firstRows = [-1] * keyCount
+        for row, (key, cents) in enumerate(zip(rowKeys, self.amountCents)):
+            if key < 0:
+                continue
+            totals[key] += cents if inCents else cents / 100
+            counts[key] += 1
+            if firstRows[key] < 0:
+                firstRows[key] = row
+        return totals, counts, firstRows
+
+    def __buildGroups(self, rules: List, keys: Iterable[int], totals: List[float], counts: List[int], firstRows: List[int]) -> List[Group]:
+        # ordered by first member, like groups built transaction by transaction
+        ruleCount = len(rules)
+        presentKeys = sorted((key for key in keys if counts[key]), key=lambda key: firstRows[key])
+        groups = []
+        for key in presentKeys:
+            rule = rules[key % ruleCount]
+            firstDate = date.fromordinal(self.dateOrdinals[firstRows[key]])
+            groups.append(Group(
+                description=rule.description,
+                totalAmount=totals[key],
+                transactionCount=counts[key],
+                monthEndDate=datetime(firstDate.year, firstDate.month, monthrange(firstDate.year, firstDate.month)[1]),
+                transactions=[],
+                mappingRule=rule,
+            ))
+        return groups
@@ -0,0 +1,71 @@
+import sys
+from unittest.mock import patch
+
+import pytest
+
+from odf.opendocument import load
+from odf.table import Table, TableCell, TableRow
+
+from main import main
+
+
+class TestColumnar:
+    CONFIG_DATA = {
+        'creditAccount': '2000',
+        'mapping': {
+            'Essen & Trinken': {'description': 'Verpflegung', 'debitAccount': '5821'},
+            'Transport': {'pattern': '^(SBB|CFF|FFS)', 'description': 'Öffentlicher Verkehr', 'debitAccount': '6282'}
+        },
+        'columns': [
+            {'name': 'Datum', 'type': 'date', 'format': 'DD.MM.YY'},
+            {'name': 'Text', 'type': 'description'},
+            {'name': 'Soll', 'type': 'debitAccount'},
+            {'name': 'Betrag CHF', 'type': 'amountChf'}
+        ]
+    }
+
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path, monkeypatch):
+        # arrange
+        monkeypatch.chdir(tmp_path)
+
+    def test_main_monthRangeColumnar_sameOutputsAsPerMonthGrouping(self, setupInputDir, writeConfig):
+        # arrange
+        inputDir = setupInputDir(['2025-07_1.txt', '2025-07_2.txt', '2025-08_1.txt', '2025-09_1.txt'])
+        writeConfig(self.CONFIG_DATA, 'input')
+        argv = ['onecreditcard', '--folder', str(inputDir), '--from', '2025-07', '--to', '2025-09', '--format', 'csv']
+        with patch.object(sys, 'argv', argv):
+            main()
+        expected = {path.name: path.read_text(encoding='utf-8') for path in inputDir.glob('*.csv')}
+
+        # act
+        with patch.object(sys, 'argv', argv + ['--columnar', '--jobs', '2']):
+            result = main()
+
+        # assert
+        assert result == 0
+        assert len(expected) == 3
+        assert {path.name: path.read_text(encoding='utf-8') for path in inputDir.glob('*.csv')} == expected
+
+    def test_main_yearColumnar_sameWorkbookAsPerMonthGrouping(self, setupInputDir, writeConfig):
+        # arrange
+        inputDir = setupInputDir(['2025-07_1.txt', '2025-08_1.txt'])
+        writeConfig(self.CONFIG_DATA, 'input')
+        argv = ['onecreditcard', '--folder', str(inputDir), '--year', '2025']
+        with patch.object(sys, 'argv', argv):
+            main()
+        expected = self.__getCells(inputDir / 'bookings_2025.ods')
+
+        # act
+        with patch.object(sys, 'argv', argv + ['--columnar']):
+            result = main()
+
+        # assert
+        assert result == 0
+        assert self.__getCells(inputDir / 'bookings_2025.ods') == expected
+
+    @staticmethod
+    def __getCells(outputPath):
+        return [[str(cell) for cell in row.getElementsByType(TableCell)]
+                for table in load(str(outputPath)).spreadsheet.getElementsByType(Table)
+                for row in table.getElementsByType(TableRow)]
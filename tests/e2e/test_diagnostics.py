@@ -0,0 +1,142 @@
+import json
+import pstats
+import sys
+import tracemalloc
+from unittest.mock import patch
+
+import pytest
+
+from main import main
+from runProfile import RunProfile
+
+
+class TestDiagnostics:
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path, monkeypatch):
+        # arrange
+        monkeypatch.chdir(tmp_path)
+
+    def test_main_profile_reportNextToBookings(self, setupInputDir, writeConfig):
+        # arrange
+        inputDir = setupInputDir(['2025-07_1.txt', '2025-07_2.txt'])
+        writeConfig({
+            'creditAccount': '2000',
+            'mapping': {},
+            'columns': [
+                {'name': 'Datum', 'type': 'date', 'format': 'DD.MM.YY'},
+                {'name': 'Text', 'type': 'description'}
+            ]
+        }, 'input')
+
+        # act
+        with patch.object(sys, 'argv', ['onecreditcard', '--folder', str(inputDir), '--month', '2025-07', '--cache', '--profile']):
+            result = main()
+
+        # assert
+        assert result == 0
+        report = json.loads((inputDir / 'bookings.profile.json').read_text(encoding='utf-8'))
+        assert {'configLoad', 'directoryScan', 'parse', 'classify', 'write'} <= set(report['stages'])
+        assert sorted(file['file'] for file in report['files']) == ['2025-07_1.txt', '2025-07_2.txt']
+        assert report['transactions'] == report['stages']['parse']['items'] > 0
+        assert report['memory']['tracemallocPeakBytes'] > 0
+        assert set(report['caches']) == {'parseCache', 'ruleResolver'}
+        assert report['arguments']['month'] == '2025-07'
+
+    def test_main_profileParallelBatch_workerStagesInReport(self, setupInputDir, writeConfig):
+        # arrange
+        inputDir = setupInputDir(['2025-07_1.txt', '2025-08_1.txt'])
+        writeConfig({
+            'creditAccount': '2000',
+            'mapping': {},
+            'columns': [
+                {'name': 'Datum', 'type': 'date', 'format': 'DD.MM.YY'},
+                {'name': 'Text', 'type': 'description'}
+            ]
+        }, 'input')
+
+        # act
+        argv = ['onecreditcard', '--folder', str(inputDir), '--from', '2025-07', '--to', '2025-08', '--jobs', '2', '--profile', 'timing']
+        with patch.object(sys, 'argv', argv):
+            result = main()
+
+        # assert
+        assert result == 0
+        report = json.loads((inputDir / 'bookings.profile.json').read_text(encoding='utf-8'))
+        assert {'parse', 'classify', 'write'} <= set(report['stages'])
+        assert report['stages']['classify']['items'] == report['stages']['parse']['items'] > 0
+
+    def test_main_profileNotWritable_resultKept(self, setupInputDir, writeConfig, caplog):
+        # arrange
+        inputDir = setupInputDir(['2025-07_1.txt'])
+        writeConfig({
+            'creditAccount': '2000',
+            'mapping': {},
+            'columns': [
+                {'name': 'Datum', 'type': 'date', 'format': 'DD.MM.YY'},
+                {'name': 'Text', 'type': 'description'}
+            ]
+        }, 'input')
+
+        # act
+        argv = ['onecreditcard', '--folder', str(inputDir), '--month', '2025-07', '--profile', 'timing']
+        with patch.object(sys, 'argv', argv), patch.object(RunProfile, 'write', side_effect=OSError('disk full')):
+            result = main()
+
+        # assert
+        assert result == 0
+        assert (inputDir / 'bookings.ods').exists()
+        assert "Diagnostics could not be written; error='disk full'" in caplog.text
+
+    def test_main_cprofileAndMemorySnapshots_dumpsWritten(self, setupInputDir, writeConfig):
+        # arrange
+        inputDir = setupInputDir(['2025-07_1.txt'])
+        writeConfig({
+            'creditAccount': '2000',
+            'mapping': {},
+            'columns': [
+                {'name': 'Datum', 'type': 'date', 'format': 'DD.MM.YY'},
+                {'name': 'Text', 'type': 'description'}
+            ]
+        }, 'input')
+
+        # act
+        argv = ['onecreditcard', '--folder', str(inputDir), '--month', '2025-07', '--cprofile', '--memory-snapshots', '5']
+        with patch.object(sys, 'argv', argv):
+            result = main()
+
+        # assert
+        assert result == 0
+        functions = {function for _, _, function in pstats.Stats(str(inputDir / 'bookings.pstats')).stats}
+        assert 'processMonth' in functions
+        snapshots = (inputDir / 'bookings.memory.txt').read_text(encoding='utf-8')
+        for label in ('configLoad end', 'parse start', 'classify end', 'write end', 'end'):
+            assert f'== {label} (' in snapshots
+        assert not tracemalloc.is_tracing()
+
+    def test_main_traceParallelBatch_spansOfWorkersAndWorkbooks(self, setupInputDir, writeConfig):
+        # arrange
+        inputDir = setupInputDir(['2025-07_1.txt', '2025-07_2.txt', '2025-08_1.txt'])
+        writeConfig({
+            'creditAccount': '2000',
+            'mapping': {},
+            'columns': [
+                {'name': 'Datum', 'type': 'date', 'format': 'DD.MM.YY'},
+                {'name': 'Text', 'type': 'description'}
+            ]
+        }, 'input')
+
+        # act
+        argv = ['onecreditcard', '--folder', str(inputDir), '--from', '2025-07', '--to', '2025-08', '--jobs', '2', '--trace']
+        with patch.object(sys, 'argv', argv):
+            result = main()
+
+        # assert
+        assert result == 0
+        events = json.loads((inputDir / 'bookings.trace.json').read_text(encoding='utf-8'))['traceEvents']
+        spans = [event for event in events if event['ph'] == 'X']
+        mainPid = next(event['pid'] for event in spans if event['name'] == 'configLoad')
+        assert {'configLoad', 'directoryScan', 'parse', 'write'} <= {event['name'] for event in spans}
+        workerParses = [event for event in spans if event['name'].startswith('parse ') and event['pid'] != mainPid]
+        assert sorted(event['args']['file'] for event in workerParses) == ['2025-07_1.txt', '2025-07_2.txt', '2025-08_1.txt']
+        workbooks = sorted(event['args']['file'] for event in spans if event['name'] == 'workbook' and event['pid'] != mainPid)
+        assert workbooks == ['bookings_2025-07.ods', 'bookings_2025-08.ods']
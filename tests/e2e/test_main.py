@@ -5,6 +5,9 @@ from unittest.mock import patch
 
 import pytest
 
+from odf.opendocument import load
+from odf.table import Table
+
 from main import main
 
 
@@ -89,6 +92,157 @@ class TestMain:
         assert result == 0
         assert outputFile.exists()
 
+    def test_main_parallelJobs_successfulProcessing(self, setupInputDir, writeConfig):
+        # arrange
+        inputDir = setupInputDir(['2025-07_1.txt', '2025-07_2.txt', '2025-08_1.txt'])
+        writeConfig({
+            'creditAccount': '2000',
+            'mapping': {},
+            'columns': [
+                {'name': 'Datum', 'type': 'date', 'format': 'DD.MM.YY'},
+                {'name': 'Text', 'type': 'description'}
+            ]
+        }, 'input')
+
+        # act
+        with patch.object(sys, 'argv', ['onecreditcard', '--folder', str(inputDir), '--month', '2025-07', '--jobs', '2']):
+            result = main()
+
+        # assert
+        assert result == 0
+        assert (inputDir / 'bookings.ods').exists()
+
+    def test_main_cache_cacheWrittenNextToData(self, setupInputDir, writeConfig):
+        # arrange
+        inputDir = setupInputDir(['2025-07_1.txt', '2025-08_1.txt'])
+        writeConfig({
+            'creditAccount': '2000',
+            'mapping': {},
+            'columns': [
+                {'name': 'Datum', 'type': 'date', 'format': 'DD.MM.YY'},
+                {'name': 'Text', 'type': 'description'}
+            ]
+        }, 'input')
+
+        # act
+        with patch.object(sys, 'argv', ['onecreditcard', '--folder', str(inputDir), '--month', '2025-07', '--cache']):
+            result = main()
+
+        # assert
+        assert result == 0
+        assert len(list((inputDir / '.onecreditcard-cache' / 'parsed').glob('*.json'))) == 2
+
+    def test_main_incrementalUnchanged_outputKept(self, setupInputDir, writeConfig):
+        # arrange
+        inputDir = setupInputDir(['2025-07_1.txt', '2025-08_1.txt'])
+        writeConfig({
+            'creditAccount': '2000',
+            'mapping': {},
+            'columns': [
+                {'name': 'Datum', 'type': 'date', 'format': 'DD.MM.YY'},
+                {'name': 'Text', 'type': 'description'}
+            ]
+        }, 'input')
+        argv = ['onecreditcard', '--folder', str(inputDir), '--month', '2025-07', '--incremental']
+        with patch.object(sys, 'argv', argv):
+            main()
+        outputFile = inputDir / 'bookings.ods'
+        outputFile.write_bytes(b"kept")
+
+        # act
+        with patch.object(sys, 'argv', argv):
+            result = main()
+
+        # assert
+        assert result == 0
+        assert outputFile.read_bytes() == b"kept"
+
+    def test_main_monthRange_oneOutputPerMonth(self, setupInputDir, writeConfig):
+        # arrange
+        inputDir = setupInputDir(['2025-07_1.txt', '2025-08_1.txt', '2025-09_1.txt'])
+        writeConfig({
+            'creditAccount': '2000',
+            'mapping': {},
+            'columns': [
+                {'name': 'Datum', 'type': 'date', 'format': 'DD.MM.YY'},
+                {'name': 'Text', 'type': 'description'}
+            ]
+        }, 'input')
+
+        # act
+        argv = ['onecreditcard', '--folder', str(inputDir), '--from', '2025-07', '--to', '2025-09', '--jobs', '2']
+        with patch.object(sys, 'argv', argv):
+            result = main()
+
+        # assert
+        assert result == 0
+        assert sorted(path.name for path in inputDir.glob('*.ods')) == \
+            ['bookings_2025-07.ods', 'bookings_2025-08.ods', 'bookings_2025-09.ods']
+
+    def test_main_year_workbookWithSheetPerMonth(self, setupInputDir, writeConfig):
+        # arrange
+        inputDir = setupInputDir(['2025-07_1.txt', '2025-08_1.txt'])
+        writeConfig({
+            'creditAccount': '2000',
+            'mapping': {},
+            'columns': [
+                {'name': 'Datum', 'type': 'date', 'format': 'DD.MM.YY'},
+                {'name': 'Text', 'type': 'description'}
+            ]
+        }, 'input')
+
+        # act
+        with patch.object(sys, 'argv', ['onecreditcard', '--folder', str(inputDir), '--year', '2025']):
+            result = main()
+
+        # assert
+        assert result == 0
+        tables = load(str(inputDir / 'bookings_2025.ods')).spreadsheet.getElementsByType(Table)
+        assert [table.getAttribute('name') for table in tables] == [f'2025-{month:02d}' for month in range(1, 13)] + ['Summary']
+
+    @pytest.mark.parametrize('flags, copies', [([], 1), (['--no-deduplicate'], 2)])
+    def test_main_overlappingExports_bookedOnceByDefault(self, setupInputDir, writeConfig, flags, copies):
+        # arrange
+        inputDir = setupInputDir(['2025-07_1.txt'])
+        (inputDir / '2025-07_1-copy.txt').write_bytes((inputDir / '2025-07_1.txt').read_bytes())
+        writeConfig({
+            'creditAccount': '2000',
+            'mapping': {},
+            'columns': [
+                {'name': 'Datum', 'type': 'date', 'format': 'DD.MM.YY'},
+                {'name': 'Text', 'type': 'description'},
+                {'name': 'Betrag CHF', 'type': 'amountChf'}
+            ]
+        }, 'input')
+        single = inputDir.parent / 'single'
+        single.mkdir()
+        (single / '2025-07_1.txt').write_bytes((inputDir / '2025-07_1.txt').read_bytes())
+        (single / 'onecreditcard.json').write_bytes((inputDir / 'onecreditcard.json').read_bytes())
+        with patch.object(sys, 'argv', ['onecreditcard', '--folder', str(single), '--month', '2025-07', '--format', 'csv']):
+            main()
+        singleTotal = sum(float(line.rsplit(',', 1)[1]) for line in (single / 'bookings.csv').read_text(encoding='utf-8').splitlines()[1:])
+
+        # act
+        with patch.object(sys, 'argv', ['onecreditcard', '--folder', str(inputDir), '--month', '2025-07', '--format', 'csv'] + flags):
+            result = main()
+
+        # assert
+        total = sum(float(line.rsplit(',', 1)[1]) for line in (inputDir / 'bookings.csv').read_text(encoding='utf-8').splitlines()[1:])
+        assert result == 0
+        assert singleTotal != 0
+        assert total == pytest.approx(copies * singleTotal)
+
+    def test_main_monthAndMonthRange_error(self, setupInputDir):
+        # arrange
+        inputDir = setupInputDir([])
+
+        # act
+        with patch.object(sys, 'argv', ['onecreditcard', '--folder', str(inputDir), '--month', '2025-07', '--from', '2025-07']):
+            result = main()
+
+        # assert
+        assert result == 1
+
     def test_main_defaultOutputPath_successfulProcessing(self, setupInputDir, writeConfig):
         # arrange
         inputDir = setupInputDir(['2025-07_1.txt'])
@@ -162,6 +316,32 @@ class TestMain:
         # assert
         assert result == 1
 
+    def test_main_invalidExport_previousOutputKept(self, setupInputDir, writeConfig):
+        # arrange
+        inputDir = setupInputDir(['2025-07_1.txt'])
+        writeConfig({
+            'creditAccount': '2000',
+            'mapping': {},
+            'columns': [
+                {'name': 'Datum', 'type': 'date', 'format': 'DD.MM.YY'},
+                {'name': 'Text', 'type': 'description'}
+            ]
+        }, 'input')
+        argv = ['onecreditcard', '--folder', str(inputDir), '--month', '2025-07']
+        with patch.object(sys, 'argv', argv):
+            main()
+        outputFile = inputDir / 'bookings.ods'
+        previous = outputFile.read_bytes()
+        (inputDir / '2025-07_2.txt').write_bytes(b"\xff\xfe invalid utf-8")
+
+        # act
+        with patch.object(sys, 'argv', argv):
+            result = main()
+
+        # assert
+        assert result == 1
+        assert outputFile.read_bytes() == previous
+
     def test_main_configFileNotFound_error(self, setupInputDir):
         # arrange
         inputDir = setupInputDir(['2025-07_1.txt'])
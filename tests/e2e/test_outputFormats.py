@@ -0,0 +1,69 @@
+import json
+import sys
+from unittest.mock import patch
+
+import pytest
+
+from main import main
+
+
+class TestOutputFormats:
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path, monkeypatch):
+        # arrange
+        monkeypatch.chdir(tmp_path)
+
+    def test_main_csvAndJsonLines_writtenInOnePass(self, setupInputDir, writeConfig, capsys):
+        # arrange
+        inputDir = setupInputDir(['2025-07_1.txt'])
+        writeConfig({
+            'creditAccount': '2000',
+            'mapping': {},
+            'columns': [
+                {'name': 'Datum', 'type': 'date', 'format': 'DD.MM.YY'},
+                {'name': 'Text', 'type': 'description'},
+                {'name': 'Betrag CHF', 'type': 'amountChf'}
+            ]
+        }, 'input')
+
+        # act
+        with patch.object(sys, 'argv', ['onecreditcard', '--folder', str(inputDir), '--month', '2025-07', '--format', 'csv,jsonl']):
+            result = main()
+
+        # assert
+        assert result == 0
+        assert not (inputDir / 'bookings.ods').exists()
+        csvLines = (inputDir / 'bookings.csv').read_text(encoding='utf-8').splitlines()
+        jsonRows = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+        assert csvLines[0] == 'Datum,Text,Betrag CHF'
+        assert len(jsonRows) == len(csvLines) - 1 > 0
+        assert list(jsonRows[0]) == ['Datum', 'Text', 'Betrag CHF']
+
+    def test_main_jsonLinesWithInvalidBlock_onlyJsonOnStdout(self, setupInputDir, writeConfig, capsys):
+        # arrange
+        inputDir = setupInputDir(['2025-07_1.txt'])
+        (inputDir / '2025-07_2.txt').write_text("""
+Shopping
+
+*Shop 1*
+31.07.2025 15:00 City
+*0.00*  CHF
+""", encoding='utf-8')
+        writeConfig({
+            'creditAccount': '2000',
+            'mapping': {},
+            'columns': [
+                {'name': 'Text', 'type': 'description'},
+                {'name': 'Betrag CHF', 'type': 'amountChf'}
+            ]
+        }, 'input')
+
+        # act
+        with patch.object(sys, 'argv', ['onecreditcard', '--folder', str(inputDir), '--month', '2025-07', '--format', 'jsonl']):
+            result = main()
+
+        # assert
+        captured = capsys.readouterr()
+        assert result == 0
+        assert len([json.loads(line) for line in captured.out.splitlines()]) > 0
+        assert "Failed to parse transaction" in captured.err
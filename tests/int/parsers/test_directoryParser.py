@@ -1,6 +1,7 @@
+from datetime import datetime
 import pytest
 
-from parsers import DirectoryParser
+from parsers import DateRange, DirectoryParser, ParseCache, TextParser
 
 
 class TestDirectoryParser:
@@ -79,3 +80,182 @@ Essen & Trinken
         # assert
         assert len(transactions) == 1
         assert transactions[0].amount == 15.00
+
+    def test_parse_dateRange_onlyTransactionsInRange(self, writeFile):
+        # arrange
+        file = writeFile("2025-07_1.txt", """
+Essen & Trinken
+
+*Restaurant 1*
+30.06.2025 12:00 City1
+*10.00*  CHF
+<https://one.viseca.ch/de/transaktionen/detail/TRX123>
+
+Shopping
+
+*Shop 1*
+31.07.2025 15:00 City2
+*20.00*  CHF
+<https://one.viseca.ch/de/transaktionen/detail/TRX456>
+""")
+
+        # act
+        transactions = list(self.testee.parse(str(file.parent), dateRange=DateRange.forMonth(datetime(2025, 7, 1))))
+
+        # assert
+        assert len(transactions) == 1
+        assert transactions[0].merchant == "Shop 1"
+
+    def test_ctor_zeroJobs_error(self):
+        # act & assert
+        with pytest.raises(ValueError, match="at least 1"):
+            DirectoryParser(jobs=0)
+
+    def test_parse_parallelJobs_sameOrderAsSequential(self, setupInputDir):
+        # arrange
+        inputDir = setupInputDir(['2025-07_1.txt', '2025-07_2.txt', '2025-08_1.txt', '2025-08_2.txt', '2025-09_1.txt'])
+        expected = list(self.testee.parse(str(inputDir)))
+
+        # act
+        transactions = list(DirectoryParser(jobs=2).parse(str(inputDir)))
+
+        # assert
+        assert len(transactions) > 0
+        assert transactions == expected
+
+    def test_parse_parallelJobsInvalidFile_errorWithPath(self, writeFile, tmp_path):
+        # arrange
+        writeFile("2025-07_1.txt", "")
+        invalidFile = tmp_path / "2025-07_2.txt"
+        invalidFile.write_bytes(b"\xff\xfe invalid utf-8")
+
+        # act & assert
+        with pytest.raises(RuntimeError, match="2025-07_2.txt"):
+            list(DirectoryParser(jobs=2).parse(str(tmp_path)))
+
+    def test_parse_mmap_sameAsTextPath(self, setupInputDir):
+        # arrange
+        inputDir = setupInputDir(['2025-07_1.txt', '2025-07_2.txt', '2025-08_1.txt', '2025-08_2.txt', '2025-09_1.txt', '2025-09_2.txt'])
+        expected = list(self.testee.parse(str(inputDir)))
+
+        # act
+        transactions = list(DirectoryParser(useMmap=True).parse(str(inputDir)))
+
+        # assert
+        assert len(transactions) > 0
+        assert transactions == expected
+
+    def test_parse_mmapWindowsLineEndings_sameAsTextPath(self, tmp_path):
+        # arrange
+        content = "Essen & Trinken\r\n\r\n*Café 1*\r\n31.07.2025 12:00 Zürich\r\n*10.00*  CHF\r\n"
+        (tmp_path / "2025-07_1.txt").write_bytes(content.encode("utf-8"))
+        (tmp_path / "2025-07_2.txt").write_bytes(b"")
+
+        # act
+        transactions = list(DirectoryParser(useMmap=True).parse(str(tmp_path)))
+
+        # assert
+        assert len(transactions) == 1
+        assert transactions[0].merchant == "Café 1"
+        assert transactions[0].location == "Zürich"
+
+    def test_parse_mmapStoppedEarly_fileReleased(self, setupInputDir):
+        # arrange
+        inputDir = setupInputDir(['2025-07_1.txt'])
+        transactions = DirectoryParser(useMmap=True).parse(str(inputDir))
+
+        # act
+        first = next(transactions)
+        transactions.close()
+
+        # assert
+        assert first.category
+
+    def test_parse_cacheWarm_textParserSkipped(self, setupInputDir, tmp_path, monkeypatch):
+        # arrange
+        inputDir = setupInputDir(['2025-07_1.txt', '2025-07_2.txt', '2025-08_1.txt'])
+        expected = list(self.testee.parse(str(inputDir)))
+        list(DirectoryParser(cache=ParseCache(tmp_path / "cache")).parse(str(inputDir)))
+        monkeypatch.setattr(TextParser, "parse", lambda *args: pytest.fail("parsed despite cache"))
+        testee = DirectoryParser(cache=ParseCache(tmp_path / "cache"))
+
+        # act
+        transactions = list(testee.parse(str(inputDir)))
+
+        # assert
+        assert transactions == expected
+        assert (testee.cacheHits, testee.cacheMisses) == (3, 0)
+
+    def test_parse_cacheFileChanged_fileParsedAgain(self, writeFile, tmp_path):
+        # arrange
+        file = writeFile("2025-07_1.txt", """
+Shopping
+
+*Shop 1*
+31.07.2025 15:00 City2
+*20.00*  CHF
+""")
+        list(DirectoryParser(cache=ParseCache(tmp_path / "cache")).parse(str(file.parent)))
+        file.write_text(file.read_text(encoding='utf-8').replace("20.00", "25.00"), encoding='utf-8')
+        testee = DirectoryParser(cache=ParseCache(tmp_path / "cache"))
+
+        # act
+        transactions = list(testee.parse(str(file.parent)))
+
+        # assert
+        assert transactions[0].amount == 25.00
+        assert testee.cacheMisses == 1
+        assert [entry.name for entry in (tmp_path / "cache" / "parsed").glob("*.json")] == \
+            [f"{ParseCache.hashFile(file)}.v{TextParser.PARSER_VERSION}.json"]
+
+    def test_parse_cacheWithDateRange_allMonthsCachedRangeReturned(self, setupInputDir, tmp_path):
+        # arrange
+        inputDir = setupInputDir(['2025-07_1.txt', '2025-08_1.txt'])
+        july = DateRange.forMonth(datetime(2025, 7, 1))
+        august = DateRange.forMonth(datetime(2025, 8, 1))
+        list(DirectoryParser(cache=ParseCache(tmp_path / "cache")).parse(str(inputDir), dateRange=july))
+        testee = DirectoryParser(jobs=2, cache=ParseCache(tmp_path / "cache"))
+
+        # act
+        transactions = list(testee.parse(str(inputDir), dateRange=august))
+
+        # assert
+        assert transactions == list(self.testee.parse(str(inputDir), dateRange=august))
+        assert testee.cacheHits == 2
+
+    def test_parse_deduplicateOverlappingFiles_laterCopiesDropped(self, writeFile):
+        # arrange
+        block = """
+Shopping
+
+*Shop 1*
+31.07.2025 15:00 City2
+*20.00*  CHF
+<https://one.viseca.ch/de/transaktionen/detail/{id}>
+"""
+        file = writeFile("2025-07_1.txt", block.format(id="TRX1") + block.format(id="TRX2"))
+        writeFile("2025-07_2.txt", block.format(id="TRX2") + block.format(id="TRX3"))
+
+        # act
+        transactions = list(DirectoryParser(deduplicate=True).parse(str(file.parent)))
+
+        # assert
+        assert [t.transactionId for t in transactions] == ["TRX1", "TRX2", "TRX3"]
+
+    def test_parse_deduplicateWithoutIds_contentDuplicatesAcrossFilesDropped(self, writeFile):
+        # arrange
+        block = """
+Essen & Trinken
+
+*Cafe 1*
+31.07.2025 {time} Zurich
+*4.50*  CHF
+"""
+        file = writeFile("2025-07_1.txt", block.format(time="08:00") + block.format(time="08:00"))
+        writeFile("2025-07_2.txt", block.format(time="08:00") + block.format(time="09:00"))
+
+        # act
+        transactions = list(DirectoryParser(deduplicate=True).parse(str(file.parent)))
+
+        # assert
+        assert [t.time for t in transactions] == ["08:00", "08:00", "09:00"]
@@ -0,0 +1,87 @@
+from datetime import datetime
+
+from parsers import ParseCache, TextParser, Transaction
+
+
+class TestParseCache:
+    @staticmethod
+    def __createTransactions():
+        return [
+            Transaction("Essen & Trinken", "Café 1", datetime(2025, 7, 31), "12:00", "Zürich", 10.05),
+            Transaction("Shopping", "Shop 1", datetime(2025, 7, 1), None, None, -20.00, 18.5, "EUR"),
+        ]
+
+    def test_load_stored_sameTransactions(self, tmp_path):
+        # arrange
+        testee = ParseCache(tmp_path)
+        transactions = self.__createTransactions()
+        testee.store("abc", transactions)
+
+        # act
+        loaded = testee.load("abc")
+
+        # assert
+        assert loaded == transactions
+
+    def test_load_unknownHash_none(self, tmp_path):
+        # arrange
+        testee = ParseCache(tmp_path)
+
+        # act
+        loaded = testee.load("abc")
+
+        # assert
+        assert loaded is None
+        assert not testee.contains("abc")
+
+    def test_load_otherParserVersion_none(self, tmp_path, monkeypatch):
+        # arrange
+        testee = ParseCache(tmp_path)
+        testee.store("abc", self.__createTransactions())
+        monkeypatch.setattr(TextParser, "PARSER_VERSION", TextParser.PARSER_VERSION + 1)
+
+        # act
+        loaded = testee.load("abc")
+
+        # assert
+        assert loaded is None
+
+    def test_load_corruptEntry_none(self, tmp_path):
+        # arrange
+        testee = ParseCache(tmp_path)
+        testee.store("abc", self.__createTransactions())
+        entry = next((tmp_path / "parsed").glob("abc.*"))
+        entry.write_text("[[1, 2", encoding='utf-8')
+
+        # act
+        loaded = testee.load("abc")
+
+        # assert
+        assert loaded is None
+
+    def test_prune_otherHashesAndVersions_deleted(self, tmp_path, monkeypatch):
+        # arrange
+        testee = ParseCache(tmp_path)
+        testee.store("old", self.__createTransactions())
+        testee.store("abc", self.__createTransactions())
+        monkeypatch.setattr(TextParser, "PARSER_VERSION", TextParser.PARSER_VERSION + 1)
+        testee.store("abc", self.__createTransactions())
+
+        # act
+        deleted = testee.prune(["abc"])
+
+        # assert
+        assert deleted == 2
+        assert [entry.name for entry in (tmp_path / "parsed").iterdir()] == [f"abc.v{TextParser.PARSER_VERSION}.json"]
+
+    def test_hashFile_sameContent_sameHash(self, writeFile):
+        # arrange
+        file1 = writeFile("a.txt", "content")
+        file2 = writeFile("b.txt", "content")
+
+        # act
+        hashes = (ParseCache.hashFile(file1), ParseCache.hashFile(file2))
+
+        # assert
+        assert hashes[0] == hashes[1]
+        assert ParseCache.hashFile(writeFile("c.txt", "other")) != hashes[0]
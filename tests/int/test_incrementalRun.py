@@ -0,0 +1,112 @@
+from datetime import datetime
+import shutil
+import pytest
+
+from incrementalRun import IncrementalRun
+from parsers import DateRange, DirectoryParser, ParseCache, TextParser
+
+
+class TestIncrementalRun:
+    JULY = datetime(2025, 7, 1)
+
+    @staticmethod
+    def __createTestee(inputDir):
+        return IncrementalRun(inputDir, DirectoryParser(cache=ParseCache.forDataFolder(inputDir)))
+
+    def test_filesOf_month_onlyFilesWithTransactionsOfMonth(self, setupInputDir):
+        # arrange
+        inputDir = setupInputDir(['2025-07_1.txt', '2025-07_2.txt', '2025-09_1.txt'])
+
+        # act
+        testee = self.__createTestee(inputDir)
+
+        # assert
+        assert [file.name for file in testee.filesOf(self.JULY)] == ['2025-07_1.txt', '2025-07_2.txt']
+
+    def test_transactions_month_sameAsFullParse(self, setupInputDir):
+        # arrange
+        inputDir = setupInputDir(['2025-07_1.txt', '2025-07_2.txt', '2025-08_1.txt', '2025-09_1.txt'])
+        expected = list(DirectoryParser().parse(str(inputDir), dateRange=DateRange.forMonth(self.JULY)))
+        testee = self.__createTestee(inputDir)
+
+        # act
+        transactions = list(testee.transactions(self.JULY))
+
+        # assert
+        assert len(transactions) > 0
+        assert transactions == expected
+
+    def test_init_unchangedFiles_nothingParsed(self, setupInputDir, monkeypatch):
+        # arrange
+        inputDir = setupInputDir(['2025-07_1.txt', '2025-08_1.txt'])
+        self.__createTestee(inputDir).complete()
+        monkeypatch.setattr(TextParser, "parse", lambda *args: pytest.fail("parsed unchanged file"))
+        monkeypatch.setattr(ParseCache, "hashFile", lambda *args: pytest.fail("hashed unchanged file"))
+
+        # act
+        testee = self.__createTestee(inputDir)
+
+        # assert
+        assert [file.name for file in testee.filesOf(self.JULY)] == ['2025-07_1.txt']
+
+    def test_isCurrent_newFileOfOtherMonth_stillCurrent(self, setupInputDir, writeConfig, fixturesInputsDir):
+        # arrange
+        inputDir = setupInputDir(['2025-07_1.txt', '2025-07_2.txt'])
+        configPath = writeConfig({"creditAccount": "2110", "mapping": {}, "columns": []})
+        outputFile = inputDir / 'bookings.ods'
+        outputFile.write_bytes(b"")
+        testee = self.__createTestee(inputDir)
+        testee.complete(outputFile, testee.fingerprint(self.JULY, configPath, "1.0"))
+        shutil.copy(fixturesInputsDir / '2025-09_1.txt', inputDir)
+
+        # act
+        testee = self.__createTestee(inputDir)
+
+        # assert
+        assert testee.isCurrent(outputFile, testee.fingerprint(self.JULY, configPath, "1.0"))
+
+    def test_isCurrent_changedFileOfMonth_notCurrent(self, setupInputDir, writeConfig):
+        # arrange
+        inputDir = setupInputDir(['2025-07_1.txt', '2025-07_2.txt'])
+        configPath = writeConfig({"creditAccount": "2110", "mapping": {}, "columns": []})
+        outputFile = inputDir / 'bookings.ods'
+        outputFile.write_bytes(b"")
+        testee = self.__createTestee(inputDir)
+        testee.complete(outputFile, testee.fingerprint(self.JULY, configPath, "1.0"))
+        changedFile = inputDir / '2025-07_2.txt'
+        changedFile.write_text(changedFile.read_text(encoding='utf-8') + "\n", encoding='utf-8')
+
+        # act
+        testee = self.__createTestee(inputDir)
+
+        # assert
+        assert not testee.isCurrent(outputFile, testee.fingerprint(self.JULY, configPath, "1.0"))
+
+    def test_isCurrent_changedConfiguration_notCurrent(self, setupInputDir, writeConfig):
+        # arrange
+        inputDir = setupInputDir(['2025-07_1.txt'])
+        configPath = writeConfig({"creditAccount": "2110", "mapping": {}, "columns": []})
+        outputFile = inputDir / 'bookings.ods'
+        outputFile.write_bytes(b"")
+        testee = self.__createTestee(inputDir)
+        testee.complete(outputFile, testee.fingerprint(self.JULY, configPath, "1.0"))
+        writeConfig({"creditAccount": "2120", "mapping": {}, "columns": []})
+
+        # act
+        testee = self.__createTestee(inputDir)
+
+        # assert
+        assert not testee.isCurrent(outputFile, testee.fingerprint(self.JULY, configPath, "1.0"))
+
+    def test_complete_removedFile_cacheEntryPruned(self, setupInputDir):
+        # arrange
+        inputDir = setupInputDir(['2025-07_1.txt', '2025-08_1.txt'])
+        self.__createTestee(inputDir).complete()
+        (inputDir / '2025-08_1.txt').unlink()
+
+        # act
+        self.__createTestee(inputDir).complete()
+
+        # assert
+        entries = [entry.name for entry in (inputDir / ParseCache.DIRECTORY_NAME / 'parsed').glob('*.json')]
+        assert entries == [f"{ParseCache.hashFile(inputDir / '2025-07_1.txt')}.v{TextParser.PARSER_VERSION}.json"]
@@ -0,0 +1,54 @@
+import tracemalloc
+
+import pytest
+
+from memorySnapshots import MemorySnapshots
+
+
+def allocate(count: int):
+    for _ in range(count):
+        yield bytearray(10_000)
+
+
+class TestMemorySnapshots:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.snapshots = MemorySnapshots(topSites=3).start()  # pylint: disable=attribute-defined-outside-init
+        yield
+        self.snapshots.stop()
+
+    def test_timed_stage_snapshotAtStartAndEnd(self):
+        # act
+        kept = list(self.snapshots.timed("parse", allocate(50)))
+
+        # assert
+        labels = [line for line in self.snapshots.lines if line.startswith("==")]
+        assert len(kept) == 50
+        assert [label.split(" (")[0] for label in labels] == ["== start", "== parse start", "== parse end"]
+
+    def test_timed_growth_allocationSiteReported(self):
+        # act
+        kept = list(self.snapshots.timed("parse", allocate(50)))
+
+        # assert
+        parseEnd = next(index for index, line in enumerate(self.snapshots.lines) if line.startswith("== parse end"))
+        growth = self.snapshots.lines[self.snapshots.lines.index("growth since the previous snapshot:", parseEnd):]
+        assert len(kept) == 50
+        assert any("test_memorySnapshots.py" in line for line in growth)
+
+    def test_timed_detail_notSnapshotted(self):
+        # act
+        with self.snapshots.stage("write"):
+            list(self.snapshots.timed("parse", allocate(1), detail="2025-07_1.txt"))
+
+        # assert
+        assert self.snapshots.snapshotCount == 3
+
+    def test_stop_startedTracing_tracingStopped(self, tmp_path):
+        # act
+        self.snapshots.stop()
+        self.snapshots.write(tmp_path / "bookings.memory.txt")
+
+        # assert
+        assert not tracemalloc.is_tracing()
+        assert "== end" in (tmp_path / "bookings.memory.txt").read_text(encoding="utf-8")
@@ -0,0 +1,81 @@
+import csv
+from datetime import datetime
+import pytest
+
+from configuration import Configuration
+from monthBatch import MonthBatch, dateRangeOf, monthsBetween, partitionByMonth
+from parsers.transaction import Transaction
+
+
+class TestMonthBatch:
+    @pytest.fixture(autouse=True)
+    def setup(self, writeConfig, tmp_path):
+        configData = {
+            "creditAccount": "2110",
+            "mapping": {
+                "Food": {"description": "Verpflegung", "debitAccount": "5821"}
+            },
+            "columns": [
+                {"name": "Datum", "type": "date", "format": "DD.MM.YY"},
+                {"name": "Beschreibung", "type": "description"},
+                {"name": "Betrag CHF", "type": "amountChf"}
+            ]
+        }
+        self.config = Configuration(writeConfig(configData))  # pylint: disable=attribute-defined-outside-init
+        self.outputDir = tmp_path  # pylint: disable=attribute-defined-outside-init
+        self.transactions = [  # pylint: disable=attribute-defined-outside-init
+            Transaction("Food", "Restaurant", datetime(2025, 7, 3), None, None, 10.0),
+            Transaction("Food", "Restaurant", datetime(2025, 8, 5), None, None, 20.0),
+            Transaction("Shopping", "Store", datetime(2025, 7, 9), None, None, 5.5),
+            Transaction("Food", "Restaurant", datetime(2025, 7, 20), None, None, 12.0),
+            Transaction("Food", "Restaurant", datetime(2025, 10, 1), None, None, 99.0),
+        ]
+
+    def test_monthsBetween_acrossYearEnd_everyMonth(self):
+        # act
+        months = monthsBetween(datetime(2024, 11, 1), datetime(2025, 2, 1))
+
+        # assert
+        assert [f"{month:%Y-%m}" for month in months] == ["2024-11", "2024-12", "2025-01", "2025-02"]
+
+    def test_monthsBetween_reversedRange_valueError(self):
+        # act & assert
+        with pytest.raises(ValueError):
+            monthsBetween(datetime(2025, 8, 1), datetime(2025, 7, 1))
+
+    def test_dateRangeOf_months_firstToLastDay(self):
+        # act
+        dateRange = dateRangeOf(monthsBetween(datetime(2025, 1, 1), datetime(2025, 2, 1)))
+
+        # assert
+        assert (str(dateRange.start), str(dateRange.end)) == ("2025-01-01", "2025-02-28")
+
+    def test_partitionByMonth_transactions_everyMonthInInputOrder(self):
+        # act
+        partitions = partitionByMonth(self.transactions, monthsBetween(datetime(2025, 7, 1), datetime(2025, 9, 1)))
+
+        # assert
+        assert list(partitions) == ["2025-07", "2025-08", "2025-09"]
+        assert [t.amount for t in partitions["2025-07"]] == [10.0, 5.5, 12.0]
+        assert [t.amount for t in partitions["2025-08"]] == [20.0]
+        assert partitions["2025-09"] == []
+
+    @pytest.mark.parametrize("jobs", [1, 2])
+    def test_write_months_oneOutputPerMonthWithMonthEndDates(self, jobs):
+        # arrange
+        testee = MonthBatch(self.config, ["csv"], jobs)
+        partitions = partitionByMonth(self.transactions, monthsBetween(datetime(2025, 7, 1), datetime(2025, 8, 1)))
+
+        # act
+        rowCounts = testee.write(partitions, self.outputDir)
+
+        # assert
+        assert rowCounts == {"2025-07": 2, "2025-08": 1}
+        july = self.__readRows(self.outputDir / "bookings_2025-07.csv")
+        august = self.__readRows(self.outputDir / "bookings_2025-08.csv")
+        assert july == [["09.07.25", "Store", "5.50"], ["31.07.25", "Verpflegung", "22.00"]]
+        assert august == [["31.08.25", "Verpflegung", "20.00"]]
+
+    def __readRows(self, path):
+        with open(path, encoding="utf-8", newline="") as file:
+            return list(csv.reader(file))[1:]
@@ -1,10 +1,14 @@
 from datetime import datetime
+import zipfile
 import pytest
 
 from odf.opendocument import load
 from odf.table import Table, TableRow, TableCell
 from odf.text import P
 
+# the former odfpy document tree writer, the comparator of benchmarks/odsWriterBenchmark.py
+from odsWriterBenchmark import generateInMemory
+
 from odsGenerator import OdsGenerator
 from accountMapper import BookingEntry
 from configuration import Configuration
@@ -28,13 +32,14 @@ class TestOdsGenerator:
             ]
         }
         config = Configuration(writeConfig(configData))
+        self.config = config  # pylint: disable=attribute-defined-outside-init
         self.testee = OdsGenerator(config)  # pylint: disable=attribute-defined-outside-init
         self.outputDir = tmp_path  # pylint: disable=attribute-defined-outside-init
 
     def test_generate_singleTransaction_odsFile(self):
         # arrange
         transaction = Transaction("Food", "Restaurant", datetime(2025, 7, 15), "12:30", "Zurich", 25.50)
-        entries = [BookingEntry("Verpflegung", "5821", "2110", transaction=transaction)]
+        entries = [BookingEntry("Verpflegung", "5821", "2110", source=transaction)]
         outputPath = self.outputDir / "test.ods"
 
         # act
@@ -52,7 +57,7 @@ class TestOdsGenerator:
     def test_generate_singleTransaction_correctData(self):
         # arrange
         transaction = Transaction("Food", "Restaurant", datetime(2025, 7, 15), "12:30", "Zurich", 25.50)
-        entries = [BookingEntry("Verpflegung", "5821", "2110", transaction=transaction)]
+        entries = [BookingEntry("Verpflegung", "5821", "2110", source=transaction)]
         outputPath = self.outputDir / "test.ods"
 
         # act
@@ -80,7 +85,7 @@ class TestOdsGenerator:
     def test_generate_transactionWithForeignCurrency_remarksColumn(self):
         # arrange
         transaction = Transaction("Shopping", "Amazon", datetime(2025, 7, 20), None, None, 285.05, 297.00, "EUR")
-        entries = [BookingEntry("Online Shopping", "5811", "2110", transaction=transaction)]
+        entries = [BookingEntry("Online Shopping", "5811", "2110", source=transaction)]
         outputPath = self.outputDir / "test.ods"
 
         # act
@@ -99,7 +104,7 @@ class TestOdsGenerator:
     def test_generate_groupedTransactions_monthEndDate(self):
         # arrange
         group = Group("Food", 100.50, 3, datetime(2025, 7, 31), [])
-        entries = [BookingEntry("Verpflegung", "5821", "2110", group=group)]
+        entries = [BookingEntry("Verpflegung", "5821", "2110", source=group)]
         outputPath = self.outputDir / "test.ods"
 
         # act
@@ -119,7 +124,7 @@ class TestOdsGenerator:
     def test_generate_unmappedTransaction_emptyDebitAccount(self):
         # arrange
         transaction = Transaction("Unknown", "Store", datetime(2025, 7, 15), None, None, 50.00)
-        entries = [BookingEntry("Store", None, "2110", transaction=transaction)]
+        entries = [BookingEntry("Store", None, "2110", source=transaction)]
         outputPath = self.outputDir / "test.ods"
 
         # act
@@ -140,8 +145,8 @@ class TestOdsGenerator:
         t1 = Transaction("Food", "Restaurant", datetime(2025, 7, 15), None, None, 25.50)
         t2 = Transaction("Transport", "SBB", datetime(2025, 7, 16), None, None, 15.00)
         entries = [
-            BookingEntry("Verpflegung", "5821", "2110", transaction=t1),
-            BookingEntry("Verkehr", "6282", "2110", transaction=t2)
+            BookingEntry("Verpflegung", "5821", "2110", source=t1),
+            BookingEntry("Verkehr", "6282", "2110", source=t2)
         ]
         outputPath = self.outputDir / "test.ods"
 
@@ -154,6 +159,21 @@ class TestOdsGenerator:
         rows = tables[0].getElementsByType(TableRow)
         assert len(rows) == 3  # Header + 2 data rows
 
+    def test_generate_entriesGenerator_rowCount(self):
+        # arrange
+        transactions = [Transaction("Food", f"Restaurant {i}", datetime(2025, 7, i), None, None, 10.0 + i) for i in range(1, 4)]
+        entries = (BookingEntry(t.merchant, "5821", "2110", source=t) for t in transactions)
+        outputPath = self.outputDir / "test.ods"
+
+        # act
+        rowCount = self.testee.generate(entries, outputPath)
+
+        # assert
+        assert rowCount == 3
+        doc = load(str(outputPath))
+        rows = doc.spreadsheet.getElementsByType(Table)[0].getElementsByType(TableRow)
+        assert len(rows) == 4  # Header + 3 data rows
+
     def test_generate_withOptionalColumns_emptyValues(self, writeConfig):
         # arrange
         configData = {
@@ -170,7 +190,7 @@ class TestOdsGenerator:
         testee = OdsGenerator(config)
 
         transaction = Transaction("Food", "Restaurant", datetime(2025, 7, 15), None, None, 25.50)
-        entries = [BookingEntry("Verpflegung", "5821", "2110", transaction=transaction)]
+        entries = [BookingEntry("Verpflegung", "5821", "2110", source=transaction)]
         outputPath = self.outputDir / "optional.ods"
 
         # act
@@ -190,7 +210,7 @@ class TestOdsGenerator:
     def test_generate_amountChfColumn_floatValueType(self):
         # arrange
         transaction = Transaction("Food", "Restaurant", datetime(2025, 7, 15), "12:30", "Zurich", 25.35)
-        entries = [BookingEntry("Verpflegung", "5821", "2110", transaction=transaction)]
+        entries = [BookingEntry("Verpflegung", "5821", "2110", source=transaction)]
         outputPath = self.outputDir / "test.ods"
 
         # act
@@ -212,7 +232,7 @@ class TestOdsGenerator:
     def test_generate_amountChfColumn_wholeNumber_noTrailingZero(self):
         # arrange
         transaction = Transaction("Food", "Restaurant", datetime(2025, 7, 15), "12:30", "Zurich", 70.0)
-        entries = [BookingEntry("Verpflegung", "5821", "2110", transaction=transaction)]
+        entries = [BookingEntry("Verpflegung", "5821", "2110", source=transaction)]
         outputPath = self.outputDir / "whole.ods"
 
         # act
@@ -233,7 +253,7 @@ class TestOdsGenerator:
     def test_generate_dateColumn_dateValueType(self):
         # arrange
         transaction = Transaction("Food", "Restaurant", datetime(2025, 7, 15), "12:30", "Zurich", 25.50)
-        entries = [BookingEntry("Verpflegung", "5821", "2110", transaction=transaction)]
+        entries = [BookingEntry("Verpflegung", "5821", "2110", source=transaction)]
         outputPath = self.outputDir / "test.ods"
 
         # act
@@ -262,7 +282,7 @@ class TestOdsGenerator:
         config = Configuration(writeConfig(configData))
         testee = OdsGenerator(config)
         transaction = Transaction("Food", "Restaurant", datetime(2025, 7, 15), None, None, 25.50)
-        entries = [BookingEntry("Verpflegung", "5821", "2110", transaction=transaction)]
+        entries = [BookingEntry("Verpflegung", "5821", "2110", source=transaction)]
         outputPath = self.outputDir / "yyyy.ods"
 
         # act
@@ -284,7 +304,7 @@ class TestOdsGenerator:
     def test_generate_accountColumns_floatValueType(self):
         # arrange
         transaction = Transaction("Food", "Restaurant", datetime(2025, 7, 15), "12:30", "Zurich", 25.50)
-        entries = [BookingEntry("Verpflegung", "5821", "2110", transaction=transaction)]
+        entries = [BookingEntry("Verpflegung", "5821", "2110", source=transaction)]
         outputPath = self.outputDir / "test.ods"
 
         # act
@@ -300,6 +320,140 @@ class TestOdsGenerator:
         assert cells[2].getAttribute("valuetype") == "float"  # debitAccount
         assert cells[3].getAttribute("valuetype") == "float"  # creditAccount
 
+    def test_generate_zipContainer_mimetypeStoredFirst(self):
+        # arrange
+        transaction = Transaction("Food", "Restaurant", datetime(2025, 7, 15), None, None, 25.50)
+        entries = [BookingEntry("Verpflegung", "5821", "2110", source=transaction)]
+        outputPath = self.outputDir / "test.ods"
+
+        # act
+        self.testee.generate(entries, outputPath)
+
+        # assert
+        with zipfile.ZipFile(outputPath) as container:
+            first = container.infolist()[0]
+            assert first.filename == "mimetype"
+            assert first.compress_type == zipfile.ZIP_STORED
+            assert container.read("mimetype") == b"application/vnd.oasis.opendocument.spreadsheet"
+            assert {"content.xml", "styles.xml", "meta.xml", "META-INF/manifest.xml"} <= set(container.namelist())
+
+    def test_generate_variousEntries_sameCellsAsInMemory(self):
+        # arrange
+        entries = [
+            BookingEntry("A & B <Bar>", "5821", "2110", source=Transaction("Food", "A & B <Bar>", datetime(2025, 7, 15), None, None, 25.35)),
+            BookingEntry("Shop \"1\"", None, "2110", source=Transaction("Shopping", "Shop", datetime(2025, 7, 20), None, None, 285.05, 297.00, "EUR")),
+            BookingEntry("Parking", "6232", "2110", source=Group("Parking", 1234.5, 3, datetime(2025, 7, 31), [])),
+            BookingEntry("Kiosk\x01\x0b", "58\x1f21", "2110", source=Transaction("Food", "Kiosk", datetime(2025, 7, 21), None, None, 4.20)),
+        ]
+
+        # act
+        self.testee.generate(entries, self.outputDir / "streamed.ods")
+        generateInMemory(self.config, entries, self.outputDir / "inMemory.ods")
+
+        # assert
+        streamed = self.__getCells(self.outputDir / "streamed.ods")
+        assert streamed == self.__getCells(self.outputDir / "inMemory.ods")
+        assert streamed[1][1][3] == "A & B <Bar>"
+        assert streamed[2][1][3] == 'Shop "1"'
+        assert streamed[4][1][3] == "Kiosk\ufffd\ufffd"
+
+    def test_generate_repeatedValues_sameCellsAsInMemory(self, writeConfig):
+        # arrange
+        config = Configuration(writeConfig({
+            "creditAccount": "2110",
+            "mapping": {},
+            "columns": [
+                {"name": "Datum", "type": "date", "format": "DD.MM.YYYY"},
+                {"name": "Datum kurz", "type": "date", "format": "DD.MM.YY"},
+                {"name": "Bemerkung"},
+                {"name": "KtSoll", "type": "debitAccount"},
+                {"name": "Beschreibung", "type": "description"}
+            ]
+        }))
+        testee = OdsGenerator(config)
+        entries = [BookingEntry(f"Shop {i % 2}", "5821" if i % 3 else None, "2110",
+                                source=Transaction("Shopping", "Shop", datetime(2025, 7, i % 2 + 1), None, None, 10.0 + i,
+                                                   12.0 if i == 4 else None, "EUR" if i == 4 else None))
+                   for i in range(6)]
+
+        # act
+        testee.generate(entries, self.outputDir / "streamed.ods")
+        generateInMemory(config, entries, self.outputDir / "inMemory.ods")
+
+        # assert
+        streamed = self.__getCells(self.outputDir / "streamed.ods")
+        assert streamed == self.__getCells(self.outputDir / "inMemory.ods")
+        assert [row[0][3] for row in streamed[1:3]] == ["01.07.2025", "02.07.2025"]
+        assert streamed[5][2][3] == "EUR 12.00"
+
+    def test_open_sinkFailsMidway_noPartialFile(self):
+        # arrange
+        transaction = Transaction("Food", "Restaurant", datetime(2025, 7, 15), None, None, 25.50)
+        outputPath = self.outputDir / "failed.ods"
+
+        # act
+        with pytest.raises(RuntimeError):
+            with self.testee.open(outputPath) as sink:
+                sink.write(BookingEntry("Verpflegung", "5821", "2110", source=transaction))
+                raise RuntimeError("entries failed")
+
+        # assert
+        assert not outputPath.exists()
+
+    def test_open_sinkFailsMidway_previousWorkbookKept(self):
+        # arrange
+        transaction = Transaction("Food", "Restaurant", datetime(2025, 7, 15), None, None, 25.50)
+        outputPath = self.outputDir / "bookings.ods"
+        self.testee.generate([BookingEntry("Verpflegung", "5821", "2110", source=transaction)], outputPath)
+        previous = outputPath.read_bytes()
+
+        # act
+        with pytest.raises(RuntimeError):
+            with self.testee.open(outputPath) as sink:
+                sink.write(BookingEntry("Verpflegung", "5821", "2110", source=transaction))
+                raise RuntimeError("entries failed")
+
+        # assert
+        assert outputPath.read_bytes() == previous
+        assert [path.name for path in self.outputDir.glob("*bookings.ods*")] == ["bookings.ods"]
+
+    def test_generateWorkbook_months_sheetPerMonthAndSummary(self):
+        # arrange
+        def monthEntries(month, *amounts):
+            return [BookingEntry("Verpflegung", account, "2110",
+                                 source=Transaction("Food", "Restaurant", datetime(2025, month, day), None, None, amount))
+                    for day, (account, amount) in enumerate(amounts, start=1)]
+        months = [
+            ("2025-07", iter(monthEntries(7, ("5821", 10.10), ("6282", 5.00), ("5821", 0.20)))),
+            ("2025-08", iter([])),
+            ("2025-09", iter(monthEntries(9, (None, 7.00), ("6282", 2.50)))),
+        ]
+        outputPath = self.outputDir / "year.ods"
+
+        # act
+        rowCount = self.testee.generateWorkbook(months, outputPath)
+
+        # assert
+        assert rowCount == 5
+        tables = load(str(outputPath)).spreadsheet.getElementsByType(Table)
+        assert [table.getAttribute("name") for table in tables] == ["2025-07", "2025-08", "2025-09", "Summary"]
+        assert [len(table.getElementsByType(TableRow)) for table in tables[:3]] == [4, 1, 3]
+        summary = [[self.__getCellText(cell) for cell in row.getElementsByType(TableCell)]
+                   for row in tables[3].getElementsByType(TableRow)]
+        assert summary == [
+            ["KtSoll", "2025-07", "2025-08", "2025-09", "Total"],
+            ["5821", "10.30", "", "", "10.30"],
+            ["6282", "5.00", "", "2.50", "7.50"],
+            ["", "", "", "7.00", "7.00"],
+            ["Total", "15.30", "", "9.50", "24.80"],
+        ]
+
+    def __getCells(self, outputPath):
+        rows = load(str(outputPath)).spreadsheet.getElementsByType(Table)[0].getElementsByType(TableRow)
+        return [[(cell.getAttribute("valuetype"), cell.getAttribute("value"), cell.getAttribute("datevalue"),
+                  self.__getCellText(cell), cell.getAttribute("stylename")) for cell in row.getElementsByType(TableCell)]
+                for row in rows]
+
     def __getCellText(self, cell: TableCell) -> str:
         paragraphs = cell.getElementsByType(P)
         if paragraphs:
@@ -0,0 +1,102 @@
+import csv
+import io
+import json
+from datetime import datetime
+import pytest
+
+from odf.opendocument import load
+from odf.table import Table, TableRow
+
+from accountMapper import BookingEntry
+from configuration import Configuration
+from outputWriter import OutputWriter
+from parsers.transaction import Transaction
+
+
+class TestOutputWriter:
+    @pytest.fixture(autouse=True)
+    def setup(self, writeConfig, tmp_path):
+        configData = {
+            "creditAccount": "2110",
+            "mapping": {},
+            "columns": [
+                {"name": "Datum", "type": "date", "format": "DD.MM.YY"},
+                {"name": "Beschreibung", "type": "description"},
+                {"name": "Betrag CHF", "type": "amountChf"}
+            ]
+        }
+        self.config = Configuration(writeConfig(configData))  # pylint: disable=attribute-defined-outside-init
+        self.outputDir = tmp_path  # pylint: disable=attribute-defined-outside-init
+
+    def test_write_allFormats_entriesConsumedOnce(self):
+        # arrange
+        consumed = []
+
+        def entries():
+            for day in range(1, 4):
+                consumed.append(day)
+                yield BookingEntry(f"Entry {day}", "5821", "2110",
+                                   source=Transaction("Food", "Restaurant", datetime(2025, 7, day), None, None, 10.0 * day))
+        stdout = io.StringIO()
+        testee = OutputWriter(self.config, ["ods", "csv", "tsv", "jsonl"], stdout)
+
+        # act
+        rowCount = testee.write(entries(), self.outputDir, "bookings")
+
+        # assert
+        assert rowCount == 3
+        assert consumed == [1, 2, 3]
+        assert len(load(str(self.outputDir / "bookings.ods")).spreadsheet.getElementsByType(Table)[0].getElementsByType(TableRow)) == 4
+        with open(self.outputDir / "bookings.csv", encoding="utf-8", newline="") as file:
+            assert list(csv.reader(file))[3] == ["03.07.25", "Entry 3", "30.00"]
+        assert (self.outputDir / "bookings.tsv").read_text(encoding="utf-8").splitlines()[1] == "01.07.25\tEntry 1\t10.00"
+        assert [json.loads(line)["Betrag CHF"] for line in stdout.getvalue().splitlines()] == [10.0, 20.0, 30.0]
+
+    def test_outputFiles_streamFormat_noFile(self):
+        # arrange
+        testee = OutputWriter(self.config, ["jsonl", "csv"])
+
+        # act
+        outputFiles = testee.outputFiles(self.outputDir, "bookings")
+
+        # assert
+        assert outputFiles == [self.outputDir / "bookings.csv"]
+        assert testee.writesToStdout
+
+    def test_write_entriesFail_noOutputFiles(self):
+        # arrange
+        def entries():
+            yield BookingEntry("Entry", "5821", "2110",
+                               source=Transaction("Food", "Restaurant", datetime(2025, 7, 1), None, None, 10.0))
+            raise RuntimeError("classification failed")
+        testee = OutputWriter(self.config, ["ods", "csv"])
+
+        # act
+        with pytest.raises(RuntimeError):
+            testee.write(entries(), self.outputDir, "bookings")
+
+        # assert
+        assert not (self.outputDir / "bookings.ods").exists()
+        assert not (self.outputDir / "bookings.csv").exists()
+
+    def test_write_entriesFail_previousOutputFilesKept(self):
+        # arrange
+        def entries():
+            yield BookingEntry("Entry", "5821", "2110",
+                               source=Transaction("Food", "Restaurant", datetime(2025, 7, 1), None, None, 10.0))
+            raise RuntimeError("classification failed")
+        testee = OutputWriter(self.config, ["ods", "csv"])
+        testee.write(iter([]), self.outputDir, "bookings")
+        previous = {path.name: path.read_bytes() for path in testee.outputFiles(self.outputDir, "bookings")}
+
+        # act
+        with pytest.raises(RuntimeError):
+            testee.write(entries(), self.outputDir, "bookings")
+
+        # assert
+        assert {path.name: path.read_bytes() for path in testee.outputFiles(self.outputDir, "bookings")} == previous
+
+    def test_init_unknownFormat_valueError(self):
+        # act & assert
+        with pytest.raises(ValueError, match="xlsx"):
+            OutputWriter(self.config, ["ods", "xlsx"])
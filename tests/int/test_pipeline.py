@@ -5,6 +5,7 @@ from parsers.directoryParser import DirectoryParser
 from transactionGrouper import TransactionGrouper
 from accountMapper import AccountMapper
 from odsGenerator import OdsGenerator
+from ruleResolver import RuleResolver
 
 
 class TestPipeline:
@@ -181,3 +182,36 @@ class TestPipeline:
         assert len(sbbEntries) == 1
         assert sbbEntries[0].group.transactionCount == 1
         assert sbbEntries[0].group.totalAmount == 6.40
+
+    def test_pipeline_sharedResolver_individualTransactionsResolvedOnce(self, setupInputDir, writeConfig):
+        # arrange
+        inputDir = setupInputDir(['2025-07_1.txt'])
+
+        configData = {
+            'creditAccount': '2000',
+            'mapping': {
+                'Lebensmittel': {
+                    'description': 'Groceries',
+                    'debitAccount': '6000'
+                }
+            },
+            'columns': []
+        }
+        configPath = writeConfig(configData, 'input')
+
+        config = Configuration(configPath)
+        resolver = RuleResolver(config)
+        parser = DirectoryParser()
+        grouper = TransactionGrouper(config, resolver)
+        mapper = AccountMapper(config, resolver)
+
+        # act
+        transactions = list(parser.parse(inputDir))
+        individualTransactions, _ = grouper.group(iter(transactions))
+        missesAfterGrouping = resolver.cacheMisses
+        entries = list(mapper.mapTransactions(individualTransactions))
+
+        # assert
+        assert len(entries) == len(individualTransactions)
+        assert resolver.cacheMisses == missesAfterGrouping
+        assert resolver.cacheHits >= len(individualTransactions)
@@ -0,0 +1,131 @@
+import json
+import time
+
+import pytest
+
+import runProfile
+from runProfile import RunProfile
+
+
+def slowItems(count: int, seconds: float):
+    for item in range(count):
+        time.sleep(seconds)
+        yield item
+
+
+class TestRunProfile:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.profile = RunProfile(traceMemory=False).start()  # pylint: disable=attribute-defined-outside-init
+
+    def test_timed_nestedStages_selfTimeBookedPerStage(self):
+        # arrange
+        parsed = self.profile.timed("parse", slowItems(3, 0.01))
+        classified = self.profile.timed("classify", (item for item in parsed if time.sleep(0.02) is None))
+
+        # act
+        with self.profile.stage("write"):
+            for _ in classified:
+                time.sleep(0.03)
+
+        # assert
+        stages = self.profile.stages
+        assert stages["parse"].items == stages["classify"].items == 3
+        assert 0.03 <= stages["parse"].wallSeconds < 0.06
+        assert 0.06 <= stages["classify"].wallSeconds < 0.09
+        assert 0.09 <= stages["write"].wallSeconds < 0.12
+
+    def test_timed_detail_fileTimesBesideStageTotal(self):
+        # arrange
+        files = [self.profile.timed("parse", slowItems(2, 0.01), detail=name) for name in ("a.txt", "b.txt")]
+
+        # act
+        transactions = list(self.profile.timed("parse", (item for file in files for item in file)))
+
+        # assert
+        report = self.profile.toJson()
+        assert len(transactions) == 4
+        assert report["stages"]["parse"]["items"] == 4
+        assert [(file["file"], file["items"]) for file in report["files"]] == [("a.txt", 2), ("b.txt", 2)]
+        assert report["stages"]["parse"]["wallSeconds"] >= sum(file["wallSeconds"] for file in report["files"])
+
+    def test_toJson_cachesAndCounts_hitRatesAndThroughput(self):
+        # arrange
+        self.profile.recordCache("ruleResolver", hits=3, misses=1)
+        self.profile.recordCache("parseCache", hits=0, misses=0)
+        self.profile.count("transactions", 40)
+
+        # act
+        self.profile.stop()
+        report = self.profile.toJson({"month": "2025-07"})
+
+        # assert
+        assert report["arguments"] == {"month": "2025-07"}
+        assert report["caches"]["ruleResolver"]["hitRate"] == 0.75
+        assert report["caches"]["parseCache"]["hitRate"] is None
+        assert report["transactions"] == 40
+        assert report["transactionsPerSecond"] > 0
+        json.dumps(report)
+
+    def test_stop_traceMemory_tracemallocPeak(self):
+        # arrange
+        profile = RunProfile().start()
+        data = [bytes(1000) for _ in range(1000)]
+
+        # act
+        profile.stop()
+
+        # assert
+        assert len(data) == 1000
+        assert profile.toJson()["memory"]["tracemallocPeakBytes"] >= 1_000_000
+
+    def test_stage_inactive_iterablePassedThrough(self):
+        # arrange
+        items = [1, 2]
+
+        # act & assert
+        assert not runProfile.active()
+        assert runProfile.timed("parse", items) is items
+        with runProfile.stage("write"):
+            runProfile.count("transactions", 2)
+
+    def test_stage_severalObservers_eachObserves(self):
+        # arrange
+        other = RunProfile(traceMemory=False).start()
+        runProfile.activate(self.profile, None, other)
+
+        # act
+        try:
+            with runProfile.stage("write"):
+                items = list(runProfile.timed("parse", [1, 2]))
+            runProfile.recordCache("parseCache", 1, 1)
+        finally:
+            runProfile.activate()
+
+        # assert
+        assert items == [1, 2]
+        for profile in (self.profile, other):
+            assert profile.stages["parse"].items == 2
+            assert profile.stages["write"].calls == 1
+            assert profile.caches["parseCache"] == {"hits": 1, "misses": 1}
+
+    def test_adopt_workerProfile_stagesAndCountsAdded(self):
+        # arrange
+        worker = self.profile.forWorker()
+        with worker.stage("write"):
+            list(worker.timed("classify", [1, 2, 3]))
+        worker.count("transactions", 3)
+        worker.recordCache("parseCache", 2, 1)
+        list(self.profile.timed("classify", [1]))
+        self.profile.recordCache("parseCache", 1, 1)
+
+        # act
+        self.profile.adopt(worker)
+
+        # assert
+        assert not worker.traceMemory
+        assert self.profile.stages["classify"].items == 4
+        assert self.profile.stages["classify"].calls == 6
+        assert self.profile.stages["write"].calls == 1
+        assert self.profile.counts["transactions"] == 3
+        assert self.profile.caches["parseCache"] == {"hits": 3, "misses": 2}
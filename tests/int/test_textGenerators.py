@@ -0,0 +1,121 @@
+import csv
+import io
+import json
+from datetime import datetime
+import pytest
+
+from accountMapper import BookingEntry
+from configuration import Configuration
+from parsers.transaction import Transaction
+from textGenerators import CsvGenerator, JsonLinesGenerator
+from transactionGrouper import Group
+
+
+class TestTextGenerators:
+    @pytest.fixture(autouse=True)
+    def setup(self, writeConfig, tmp_path):
+        configData = {
+            "creditAccount": "2110",
+            "mapping": {},
+            "columns": [
+                {"name": "Datum", "type": "date", "format": "DD.MM.YYYY"},
+                {"name": "Beschreibung", "type": "description"},
+                {"name": "KtSoll", "type": "debitAccount"},
+                {"name": "KtHaben", "type": "creditAccount"},
+                {"name": "Betrag CHF", "type": "amountChf"},
+                {"name": "Bemerkungen", "type": "remarks"},
+                {"name": "MWST"}
+            ]
+        }
+        self.config = Configuration(writeConfig(configData))  # pylint: disable=attribute-defined-outside-init
+        self.outputDir = tmp_path  # pylint: disable=attribute-defined-outside-init
+        self.entries = [  # pylint: disable=attribute-defined-outside-init
+            BookingEntry("Online Shopping", "5811", "2110",
+                         source=Transaction("Shopping", "Amazon", datetime(2025, 7, 20), None, None, 285.05, 297.00, "EUR")),
+            BookingEntry("Store", None, "2110", source=Transaction("Unknown", "Store", datetime(2025, 7, 15), None, None, 50.0)),
+            BookingEntry("Verpflegung", "5821", "2110", source=Group("Food", 100.5, 3, datetime(2025, 7, 31), [])),
+        ]
+
+    def test_generate_csv_headerAndFormattedRows(self):
+        # arrange
+        outputPath = self.outputDir / "test.csv"
+
+        # act
+        rowCount = CsvGenerator(self.config).generate(iter(self.entries), outputPath)
+
+        # assert
+        assert rowCount == 3
+        with open(outputPath, encoding="utf-8", newline="") as file:
+            rows = list(csv.reader(file))
+        assert rows == [
+            ["Datum", "Beschreibung", "KtSoll", "KtHaben", "Betrag CHF", "Bemerkungen", "MWST"],
+            ["20.07.2025", "Online Shopping", "5811", "2110", "285.05", "EUR 297.00", ""],
+            ["15.07.2025", "Store", "", "2110", "50.00", "", ""],
+            ["31.07.2025", "Verpflegung", "5821", "2110", "100.50", "", ""],
+        ]
+
+    def test_generate_tsv_tabSeparated(self):
+        # arrange
+        outputPath = self.outputDir / "test.tsv"
+
+        # act
+        CsvGenerator(self.config, "\t").generate(self.entries[:1], outputPath)
+
+        # assert
+        lines = outputPath.read_text(encoding="utf-8").splitlines()
+        assert lines[1] == "20.07.2025\tOnline Shopping\t5811\t2110\t285.05\tEUR 297.00\t"
+
+    def test_generate_csvDelimiterInValue_quoted(self):
+        # arrange
+        transaction = Transaction("Food", "Restaurant", datetime(2025, 7, 15), None, None, 25.5)
+        outputPath = self.outputDir / "test.csv"
+
+        # act
+        CsvGenerator(self.config).generate([BookingEntry('Essen, "Trinken"', "5821", "2110", source=transaction)], outputPath)
+
+        # assert
+        lines = outputPath.read_text(encoding="utf-8").splitlines()
+        assert lines[1] == '15.07.2025,"Essen, ""Trinken""",5821,2110,25.50,,'
+
+    def test_open_csvSinkFailsMidway_noPartialFile(self):
+        # arrange
+        outputPath = self.outputDir / "failed.csv"
+
+        # act
+        with pytest.raises(RuntimeError):
+            with CsvGenerator(self.config).open(outputPath) as sink:
+                sink.write(self.entries[0])
+                raise RuntimeError("entries failed")
+
+        # assert
+        assert not outputPath.exists()
+
+    def test_open_csvSinkFailsMidway_previousFileKept(self):
+        # arrange
+        outputPath = self.outputDir / "bookings.csv"
+        outputPath.write_text("previous", encoding="utf-8")
+
+        # act
+        with pytest.raises(RuntimeError):
+            with CsvGenerator(self.config).open(outputPath) as sink:
+                sink.write(self.entries[0])
+                raise RuntimeError("entries failed")
+
+        # assert
+        assert outputPath.read_text(encoding="utf-8") == "previous"
+        assert [path.name for path in self.outputDir.glob("*bookings.csv*")] == ["bookings.csv"]
+
+    def test_generate_jsonLines_oneTypedObjectPerLine(self):
+        # arrange
+        stream = io.StringIO()
+
+        # act
+        rowCount = JsonLinesGenerator(self.config).generate(self.entries, stream)
+
+        # assert
+        assert rowCount == 3
+        rows = [json.loads(line) for line in stream.getvalue().splitlines()]
+        assert rows[0] == {"Datum": "20.07.2025", "Beschreibung": "Online Shopping", "KtSoll": "5811", "KtHaben": "2110",
+                           "Betrag CHF": 285.05, "Bemerkungen": "EUR 297.00", "MWST": None}
+        assert rows[1]["KtSoll"] is None
+        assert rows[2]["Betrag CHF"] == 100.5
@@ -0,0 +1,63 @@
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+import runProfile
+from traceEvents import TraceRecorder
+
+
+def recordInWorker(name: str) -> int:
+    runProfile.recordSpan(name, 1.0, 1.5, {"transactions": 3})
+    return os.getpid()
+
+
+class TestTraceRecorder:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.tracer = TraceRecorder()  # pylint: disable=attribute-defined-outside-init
+        runProfile.activate(self.tracer)
+        yield
+        runProfile.activate()
+
+    def test_timed_streamingStages_nestedSpansWithCounts(self):
+        # act
+        with runProfile.stage("write"):
+            transactions = runProfile.timed("parse", runProfile.timed("parse", [1, 2, 3], detail="2025-07_1.txt"))
+            entries = list(runProfile.timed("classify", (transaction for transaction in transactions if transaction > 1)))
+
+        # assert
+        spans = {event["name"]: event for event in self.tracer.events}
+        assert entries == [2, 3]
+        assert spans["parse 2025-07_1.txt"]["args"] == {"file": "2025-07_1.txt", "transactions": 3}
+        assert spans["parse"]["args"] == {"transactions": 3}
+        assert spans["classify"]["args"] == {"entries": 2}
+        for inner, outer in (("parse 2025-07_1.txt", "parse"), ("parse", "classify"), ("classify", "write")):
+            assert spans[outer]["ts"] <= spans[inner]["ts"]
+            assert spans[inner]["ts"] + spans[inner]["dur"] <= spans[outer]["ts"] + spans[outer]["dur"]
+        assert {(event["pid"], event["ph"]) for event in self.tracer.events} == {(os.getpid(), "X")}
+
+    def test_submit_workerProcess_spansAdoptedWithWorkerPid(self):
+        # act
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            workerPid = runProfile.submit(executor, recordInWorker, "parse 2025-07_1.txt").result()
+
+        # assert
+        assert [(event["name"], event["pid"], event["ts"], event["dur"]) for event in self.tracer.events] == \
+            [("parse 2025-07_1.txt", workerPid, 1_000_000.0, 500_000.0)]
+
+    def test_toJson_workerSpans_processesNamed(self, tmp_path):
+        # arrange
+        self.tracer.adopt(TraceRecorder())
+        self.tracer.events.append({"name": "workbook", "ph": "X", "ts": 2.0, "dur": 1.0, "pid": 4711, "tid": 1, "args": {}})
+        runProfile.recordSpan("configLoad", 0.0, 0.000001)
+
+        # act
+        self.tracer.write(tmp_path / "bookings.trace.json")
+
+        # assert
+        trace = json.loads((tmp_path / "bookings.trace.json").read_text(encoding="utf-8"))
+        names = {event["pid"]: event["args"]["name"] for event in trace["traceEvents"] if event["ph"] == "M"}
+        assert names == {os.getpid(): "onecreditcard", 4711: "worker 4711"}
+        assert [event["name"] for event in trace["traceEvents"] if event["ph"] == "X"] == ["configLoad", "workbook"]
@@ -0,0 +1,101 @@
+from configuration import Configuration
+from parsers.directoryParser import DirectoryParser
+from transactionClassifier import TransactionClassifier
+from transactionGrouper import TransactionGrouper
+from transactionStore import TransactionStore
+from accountMapper import AccountMapper
+from ruleResolver import RuleResolver
+
+
+class TestTransactionClassifier:
+    CONFIG_DATA = {
+        'creditAccount': '2110',
+        'ignore': {
+            'categories': ['Einlagen'],
+            'transactions': ['^Shop 2']
+        },
+        'mapping': {
+            'Fahrzeug': [
+                {'pattern': 'Gasstation', 'description': 'Auto; Diesel', 'debitAccount': '6210'},
+                {'pattern': 'parking', 'description': 'Auto; Parkgebühren', 'debitAccount': '6232'}
+            ],
+            'Transport': {
+                'pattern': '^(SBB|CFF|FFS)',
+                'description': 'Öffentlicher Verkehr',
+                'debitAccount': '6282'
+            },
+            'Essen & Trinken': {
+                'description': 'Verpflegung',
+                'debitAccount': '5821'
+            }
+        },
+        'columns': []
+    }
+
+    def test_classify_fixtureExports_sameAsGroupThenMap(self, setupInputDir, writeConfig):
+        # arrange
+        inputDir = setupInputDir(['2025-07_1.txt', '2025-07_2.txt', '2025-08_1.txt'])
+        config = Configuration(writeConfig(self.CONFIG_DATA, 'input'))
+        transactions = list(DirectoryParser().parse(inputDir))
+        grouper = TransactionGrouper(config)
+        mapper = AccountMapper(config)
+        individualTransactions, groups = grouper.group(iter(transactions))
+        expected = list(mapper.mapTransactions(individualTransactions))
+        expected.extend(mapper.mapGroups(groups))
+
+        # act
+        classification = TransactionClassifier(config).classify(transactions)
+
+        # assert
+        assert [(e.mappedDescription, e.debitAccount, e.transaction) for e in classification.entries] == \
+            [(e.mappedDescription, e.debitAccount, e.transaction) for e in expected]
+        assert [(g.description, g.totalAmount, g.transactionCount) for g in classification.groups] == \
+            [(g.description, g.totalAmount, g.transactionCount) for g in groups]
+        assert len(classification.individual) + classification.ignoredCount == len(individualTransactions)
+
+    def test_classify_sharedResolver_eachMerchantResolvedOnce(self, setupInputDir, writeConfig):
+        # arrange
+        inputDir = setupInputDir(['2025-07_1.txt', '2025-07_2.txt'])
+        config = Configuration(writeConfig(self.CONFIG_DATA, 'input'))
+        transactions = list(DirectoryParser().parse(inputDir))
+        resolver = RuleResolver(config)
+
+        # act
+        TransactionClassifier(config, resolver).classify(transactions)
+
+        # assert
+        distinctKeys = {(t.category, t.merchant) for t in transactions}
+        assert resolver.cacheMisses == len(distinctKeys)
+        assert resolver.cacheHits + resolver.cacheMisses == len(transactions)
+
+    def test_stream_fixtureExports_sameEntriesAsClassify(self, setupInputDir, writeConfig):
+        # arrange
+        inputDir = setupInputDir(['2025-07_1.txt', '2025-07_2.txt', '2025-08_1.txt'])
+        config = Configuration(writeConfig(self.CONFIG_DATA, 'input'))
+        expected = TransactionClassifier(config).classify(DirectoryParser().parse(inputDir)).entries
+
+        # act
+        entries = list(TransactionClassifier(config).stream(DirectoryParser().parse(inputDir)))
+
+        # assert
+        assert [(e.mappedDescription, e.debitAccount, e.transaction) for e in entries] == \
+            [(e.mappedDescription, e.debitAccount, e.transaction) for e in expected]
+        groupEntries = [e for e in entries if e.group is not None]
+        assert groupEntries
+        assert all(not e.group.transactions and e.group.transactionCount > 0 for e in groupEntries)
+        assert [e.group.totalAmount for e in groupEntries] == [e.group.totalAmount for e in expected if e.group]
+
+    def test_stream_storeGroups_sameEntriesAsGroupBuilders(self, setupInputDir, writeConfig):
+        # arrange
+        inputDir = setupInputDir(['2025-07_1.txt', '2025-07_2.txt'])
+        config = Configuration(writeConfig(self.CONFIG_DATA, 'input'))
+        transactions = list(DirectoryParser().parse(inputDir))
+        expected = list(TransactionClassifier(config).stream(transactions))
+        groups = TransactionStore.fromTransactions(transactions).groups(RuleResolver(config))
+
+        # act
+        entries = list(TransactionClassifier(config).stream(transactions, groups))
+
+        # assert
+        assert [(e.mappedDescription, e.debitAccount, e.transaction, e.group) for e in entries] == \
+            [(e.mappedDescription, e.debitAccount, e.transaction, e.group) for e in expected]
@@ -0,0 +1,109 @@
+from datetime import datetime
+import pytest
+
+from configuration import Configuration
+from parsers.directoryParser import DirectoryParser
+from parsers.transaction import Transaction
+from ruleResolver import RuleResolver
+from transactionClassifier import TransactionClassifier
+from transactionGrouper import GroupBuilder
+from transactionStore import TransactionStore, np
+
+BACKENDS = [False, pytest.param(True, marks=pytest.mark.skipif(np is None, reason="NumPy not installed"))]
+
+
+class TestTransactionStore:
+    CONFIG_DATA = {
+        'creditAccount': '2110',
+        'ignore': {'categories': ['Einlagen'], 'transactions': []},
+        'mapping': {
+            'Fahrzeug': [
+                {'pattern': 'Gasstation', 'description': 'Auto; Diesel', 'debitAccount': '6210'},
+                {'pattern': 'parking', 'description': 'Auto; Parkgebühren', 'debitAccount': '6232'}
+            ],
+            'Transport': {'pattern': '^(SBB|CFF|FFS)', 'description': 'Öffentlicher Verkehr', 'debitAccount': '6282'},
+            'Essen & Trinken': {'description': 'Verpflegung', 'debitAccount': '5821'}
+        },
+        'columns': []
+    }
+
+    @pytest.mark.parametrize("useNumpy", BACKENDS)
+    def test_groups_fixtureExports_sameAsClassifier(self, useNumpy, setupInputDir, writeConfig):
+        # arrange
+        inputDir = setupInputDir(['2025-07_1.txt', '2025-07_2.txt', '2025-08_1.txt', '2025-09_1.txt'])
+        config = Configuration(writeConfig(self.CONFIG_DATA, 'input'))
+        transactions = list(DirectoryParser().parse(inputDir))
+        expected = TransactionClassifier(config).classify(transactions).groups
+        testee = TransactionStore.fromTransactions(transactions, useNumpy)
+
+        # act
+        groups = testee.groups(RuleResolver(config))
+
+        # assert
+        assert [(g.description, g.totalAmount, g.transactionCount, g.monthEndDate, g.mappingRule) for g in groups] == \
+            [(g.description, g.totalAmount, g.transactionCount, g.monthEndDate, g.mappingRule) for g in expected]
+
+    @pytest.mark.parametrize("useNumpy", BACKENDS)
+    def test_groupsByMonth_fixtureExports_sameAsClassifierPerMonth(self, useNumpy, setupInputDir, writeConfig):
+        # arrange
+        inputDir = setupInputDir(['2025-07_1.txt', '2025-08_1.txt', '2025-09_1.txt'])
+        config = Configuration(writeConfig(self.CONFIG_DATA, 'input'))
+        transactions = list(DirectoryParser().parse(inputDir))
+        testee = TransactionStore.fromTransactions(transactions, useNumpy)
+
+        # act
+        groupsByMonth = testee.groupsByMonth(RuleResolver(config))
+
+        # assert
+        assert list(groupsByMonth) == sorted({t.date.strftime('%Y-%m') for t in transactions})
+        for month, groups in groupsByMonth.items():
+            monthTransactions = [t for t in transactions if t.date.strftime('%Y-%m') == month]
+            expected = TransactionClassifier(config).classify(monthTransactions).groups
+            assert [(g.description, g.totalAmount, g.transactionCount) for g in groups] == \
+                [(g.description, g.totalAmount, g.transactionCount) for g in expected]
+
+    @pytest.mark.parametrize("useNumpy", BACKENDS)
+    def test_groups_inexactFloatAmounts_sameTotalAsGroupBuilder(self, useNumpy, writeConfig):
+        # arrange
+        config = Configuration(writeConfig(self.CONFIG_DATA))
+        transactions = [Transaction("Essen & Trinken", f"Cafe {i}", datetime(2025, 7, i + 1), None, None, amount)
+                        for i, amount in enumerate([0.10, 0.20])]
+        builder = GroupBuilder(config.mappingRules['Essen & Trinken'][0])
+        for transaction in transactions:
+            builder.add(transaction)
+        testee = TransactionStore.fromTransactions(transactions, useNumpy)
+
+        # act
+        groups = testee.groups(RuleResolver(config))
+
+        # assert
+        assert [group.totalAmount for group in groups] == [builder.build().totalAmount]
+        assert groups[0].totalAmount != sum(t.amountCents for t in transactions) / 100
+
+    @pytest.mark.parametrize("useNumpy", BACKENDS)
+    def test_monthTotals_centAmounts_exactTotals(self, useNumpy):
+        # arrange
+        testee = TransactionStore.fromTransactions([
+            Transaction("Shopping", "Shop 1", datetime(2025, 7, 1), None, None, 0.10),
+            Transaction("Shopping", "Shop 2", datetime(2025, 7, 31), None, None, 0.20),
+            Transaction("Shopping", "Shop 1", datetime(2025, 6, 30), None, None, -1.05),
+        ], useNumpy)
+
+        # act
+        totals = testee.monthTotals()
+
+        # assert
+        assert totals == {"2025-06": -1.05, "2025-07": 0.30}
+
+    @pytest.mark.parametrize("useNumpy", BACKENDS)
+    def test_groups_emptyStore_noGroups(self, useNumpy, writeConfig):
+        # arrange
+        config = Configuration(writeConfig(self.CONFIG_DATA))
+        testee = TransactionStore(useNumpy)
+
+        # act
+        groups = testee.groups(RuleResolver(config))
+
+        # assert
+        assert not groups
+        assert not testee.monthTotals()
@@ -0,0 +1,46 @@
+import gc
+import time
+
+import pytest
+
+# the synthetic export generator lives with the benchmarks (on the pytest pythonpath)
+from syntheticExport import SyntheticExport
+
+SEED = 42
+FILES = 4
+
+
+@pytest.fixture(scope='session')
+def syntheticDataset(tmp_path_factory):
+    # one month of synthetic exports plus configuration per (transactions, rules), generated once per session
+    datasets = {}
+
+    def _syntheticDataset(transactions, rules):
+        key = (transactions, rules)
+        if key not in datasets:
+            folder = tmp_path_factory.mktemp(f'synthetic{transactions}x{rules}')
+            export = SyntheticExport(SEED)
+            export.writeExports(folder, transactions, FILES, monthCount=1)
+            export.writeConfiguration(folder, rules)
+            datasets[key] = folder
+        return datasets[key]
+    return _syntheticDataset
+
+
+@pytest.fixture
+def bestSeconds():
+    # fastest of several runs with the garbage collector paused, whose pauses grow with the heap and
+    # would make linear code look superlinear
+    def _bestSeconds(run, repeat=3):
+        best = float('inf')
+        gc.collect()
+        gc.disable()
+        try:
+            for _ in range(repeat):
+                start = time.perf_counter()
+                run()
+                best = min(best, time.perf_counter() - start)
+        finally:
+            gc.enable()
+        return best
+    return _bestSeconds
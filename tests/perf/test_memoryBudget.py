@@ -0,0 +1,40 @@
+import sys
+import tracemalloc
+from unittest.mock import patch
+
+import pytest
+
+from main import main
+
+pytestmark = pytest.mark.perf
+
+
+class TestMemoryBudget:
+    # the pipeline streams from parser to writer; peak memory must not grow faster than the export files do
+    BUDGET_PER_100K = 16_000_000
+    BASE_BUDGET = 2_000_000
+    RULES = 50
+
+    @pytest.mark.parametrize('transactions', [10_000, 20_000])
+    def test_main_syntheticMonth_peakWithinBudget(self, syntheticDataset, tmp_path, monkeypatch, transactions):
+        # arrange
+        folder = syntheticDataset(transactions, self.RULES)
+        monkeypatch.chdir(tmp_path)
+        argv = ['onecreditcard', '--folder', str(folder), '--month', '2025-01',
+                '--log-file', str(tmp_path / 'perf.log'), '--log-level', 'WARNING']
+        budget = self.BASE_BUDGET + self.BUDGET_PER_100K * transactions / 100_000
+
+        # act
+        with patch.object(sys, 'argv', argv):
+            # warm-up, so that imports and compiled patterns are not counted
+            main()
+            tracemalloc.start()
+            try:
+                result = main()
+                _, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+
+        # assert
+        assert result == 0
+        assert peak <= budget, f"peak {peak / 1e6:.1f} MB exceeds budget {budget / 1e6:.1f} MB for {transactions} transactions"
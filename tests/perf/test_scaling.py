@@ -0,0 +1,60 @@
+import pytest
+
+from accountMapper import AccountMapper
+from configuration import Configuration
+from odsGenerator import OdsGenerator
+from parsers.directoryParser import DirectoryParser
+from transactionClassifier import TransactionClassifier
+from transactionGrouper import TransactionGrouper
+
+pytestmark = pytest.mark.perf
+
+
+class TestScaling:
+    # Quadrupling the input of a linear stage quadruples its runtime; a quadratic one takes 16 times as
+    # long. The bounds leave a factor of two for timing noise and still catch the quadratic case.
+    SMALL = 5_000
+    LARGE = 20_000
+    RULES = 10
+    MANY_RULES = 160
+    MAX_TRANSACTION_RATIO = 2 * LARGE / SMALL
+    # sub-linear: 16 times the rules must cost less than 4 (the square root of 16) times the runtime
+    MAX_RULE_RATIO = (MANY_RULES / RULES) ** 0.5
+
+    @pytest.mark.parametrize('stage', ['pipeline', 'grouper', 'mapper', 'odsGenerator'])
+    def test_stage_fourTimesTransactions_linearRuntime(self, syntheticDataset, bestSeconds, tmp_path, stage):
+        # arrange
+        small = self.__createStage(stage, syntheticDataset(self.SMALL, self.RULES), tmp_path)
+        large = self.__createStage(stage, syntheticDataset(self.LARGE, self.RULES), tmp_path)
+
+        # act
+        ratio = bestSeconds(large) / bestSeconds(small)
+
+        # assert
+        assert ratio < self.MAX_TRANSACTION_RATIO, f"{stage}: {self.LARGE / self.SMALL:g}x transactions took {ratio:.1f}x as long"
+
+    def test_pipeline_sixteenTimesRules_subLinearRuntime(self, syntheticDataset, bestSeconds, tmp_path):
+        # arrange
+        few = self.__createStage('pipeline', syntheticDataset(self.SMALL, self.RULES), tmp_path)
+        many = self.__createStage('pipeline', syntheticDataset(self.SMALL, self.MANY_RULES), tmp_path)
+
+        # act
+        ratio = bestSeconds(many) / bestSeconds(few)
+
+        # assert
+        assert ratio < self.MAX_RULE_RATIO, f"{self.MANY_RULES / self.RULES:g}x rules took {ratio:.1f}x as long"
+
+    def __createStage(self, stage, folder, tmp_path):
+        # the stage as a callable on prepared input, so that only the stage itself is timed
+        config = Configuration(folder / 'onecreditcard.json')
+        outputPath = tmp_path / f'{folder.name}.ods'
+        if stage == 'pipeline':
+            return lambda: OdsGenerator(config).generate(TransactionClassifier(config).stream(DirectoryParser().parse(folder)), outputPath)
+        transactions = list(DirectoryParser().parse(folder))
+        if stage == 'grouper':
+            return lambda: TransactionGrouper(config).group(iter(transactions))
+        if stage == 'mapper':
+            return lambda: list(AccountMapper(config).mapTransactions(transactions))
+        # one row per transaction, the writer's worst case
+        entries = list(AccountMapper(config).mapTransactions(transactions))
+        return lambda: OdsGenerator(config).generate(entries, outputPath)
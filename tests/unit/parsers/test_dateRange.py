@@ -0,0 +1,39 @@
+from datetime import date, datetime
+import pytest
+
+from parsers import DateRange
+
+
+class TestDateRange:
+    def test_ctor_startAfterEnd_error(self):
+        # act & assert
+        with pytest.raises(ValueError, match="after end"):
+            DateRange(date(2025, 8, 1), date(2025, 7, 31))
+
+    def test_forMonth_february_lastDayIncluded(self):
+        # act
+        testee = DateRange.forMonth(datetime(2024, 2, 1))
+
+        # assert
+        assert testee.start == date(2024, 2, 1)
+        assert testee.end == date(2024, 2, 29)
+
+    def test_containsRaw_boundaries_inclusive(self):
+        # arrange
+        testee = DateRange.forMonth(datetime(2025, 7, 1))
+
+        # act & assert
+        assert testee.containsRaw("01.07.2025")
+        assert testee.containsRaw("31.07.2025")
+        assert not testee.containsRaw("30.06.2025")
+        assert not testee.containsRaw("01.08.2025")
+        assert not testee.containsRaw("15.07.2024")
+
+    def test_contains_datetime_sameAsRaw(self):
+        # arrange
+        testee = DateRange(date(2024, 12, 15), date(2025, 1, 15))
+
+        # act & assert
+        assert testee.contains(datetime(2025, 1, 1))
+        assert not testee.contains(datetime(2024, 12, 14))
+        assert testee.containsRaw("01.01.2025")
@@ -1,6 +1,7 @@
 from datetime import datetime
+import pytest
 
-from parsers import TextParser
+from parsers import DateRange, TextParser
 
 
 class TestTextParser:
@@ -31,6 +32,7 @@ Essen & Trinken
         assert trans.amount == 4.30
         assert trans.foreignAmount is None
         assert trans.foreignCurrency is None
+        assert trans.transactionId == "TRX123245678"
 
     def test_parse_entryWithForeignCurrency_transactionWithForeignCurrency(self):
         # arrange
@@ -56,6 +58,7 @@ Shopping
         assert trans.amount == 285.05
         assert trans.foreignAmount == 297.00
         assert trans.foreignCurrency == "EUR"
+        assert trans.transactionId == "TRX123245678"
 
     def test_parse_entryWithoutTimeAndLocation_transactionWithoutTimeAndLocation(self):
         # arrange
@@ -180,3 +183,139 @@ Essen & Trinken
         # assert
         assert len(transactions) == 1
         assert transactions[0].merchant == "Restaurant with spaces"
+
+    def test_parse_dateRange_outOfRangeBlocksSkippedBeforeDecoding(self, caplog):
+        # arrange
+        text = """
+Essen & Trinken
+
+*Restaurant 1*
+31.07.2025 12:00 City
+*25.50*  CHF
+<https://one.viseca.ch/de/transaktionen/detail/TRX123245678>
+
+Shopping
+
+*Shop 1*
+30.02.2025 15:00 City
+*0.00*  CHF
+<https://one.viseca.ch/de/transaktionen/detail/TRX123245678>
+
+Shopping
+
+*Shop 2*
+01.08.2025 15:00 City
+*20.00*  CHF
+<https://one.viseca.ch/de/transaktionen/detail/TRX123245678>
+"""
+        # act
+        transactions = list(self.testee.parse(text, DateRange.forMonth(datetime(2025, 7, 1))))
+
+        # assert
+        assert [t.merchant for t in transactions] == ["Restaurant 1"]
+        assert "Failed to parse transaction" not in caplog.text
+
+    def test_parse_invalidCalendarDate_skippedWithWarning(self, caplog):
+        # arrange
+        text = """
+Shopping
+
+*Shop 1*
+30.02.2025 15:00 City
+*20.00*  CHF
+<https://one.viseca.ch/de/transaktionen/detail/TRX123245678>
+"""
+        # act
+        transactions = list(self.testee.parse(text))
+
+        # assert
+        assert len(transactions) == 0
+        assert "Failed to parse transaction" in caplog.text
+
+    def test_decodeDate_sameDateTwice_equalToStrptime(self):
+        # act
+        first = self.testee._decodeDate("05.07.2025")  # pylint: disable=protected-access
+        second = self.testee._decodeDate("05.07.2025")  # pylint: disable=protected-access
+
+        # assert
+        assert first == datetime.strptime("05.07.2025", "%d.%m.%Y")
+        assert first is second
+
+    def test_decodeAmount_thousandsSeparators_float(self):
+        # act & assert
+        assert TextParser._decodeAmount("1'234'567.89") == 1234567.89  # pylint: disable=protected-access
+        assert TextParser._decodeAmount("-12.50") == -12.50  # pylint: disable=protected-access
+        assert TextParser._decodeAmount("100") == 100.0  # pylint: disable=protected-access
+
+    def test_parseBytes_utf8Export_sameAsParse(self):
+        # arrange
+        text = """
+Essen & Trinken
+
+*Café Müller*
+31.07.2025 13:14 Zürich
+*1'234.30*  CHF 1290.00  EUR
+<https://one.viseca.ch/de/transaktionen/detail/TRX123245678>
+
+Shopping
+
+*shop.company.com*
+22.07.2025
+*-5.05*  CHF
+<https://one.viseca.ch/de/transaktionen/detail/TRX123245678>
+"""
+        # act
+        transactions = list(self.testee.parseBytes(text.encode("utf-8")))
+
+        # assert
+        assert transactions == list(self.testee.parse(text))
+        assert transactions[0].merchant == "Café Müller"
+        assert transactions[0].location == "Zürich"
+        assert transactions[0].foreignAmount == 1290.00
+
+    @pytest.mark.parametrize("space", ["\xa0", "\u2009", "\u3000", "\x1f"])
+    def test_parseBytes_nonAsciiWhitespace_sameAsParse(self, space):
+        # arrange
+        text = f"""
+Essen & Trinken
+
+*Restaurant 1*
+31.07.2025{space}12:00 City1
+*12.50*{space}CHF
+"""
+        # act
+        transactions = list(self.testee.parseBytes(text.encode("utf-8")))
+
+        # assert
+        assert len(transactions) == 1
+        assert transactions == list(self.testee.parse(text))
+
+    def test_parseBytes_invalidUtf8_unicodeDecodeError(self):
+        # arrange
+        buffer = b"Essen & Trinken\n\n*Caf\xe9*\n31.07.2025\n*12.50*  CHF\n"
+
+        # act & assert
+        with pytest.raises(UnicodeDecodeError):
+            list(self.testee.parseBytes(buffer))
+
+    def test_parse_entryWithoutDetailLink_transactionWithoutId(self):
+        # arrange
+        text = """
+Essen & Trinken
+
+*Restaurant 1*
+31.07.2025 12:00 City1
+*10.00*  CHF
+
+Shopping
+
+*Shop 1*
+31.07.2025 15:00 City2
+*20.00*  CHF
+<https://one.viseca.ch/de/transaktionen/detail/TRX456>
+"""
+        # act
+        transactions = list(self.testee.parse(text))
+
+        # assert
+        assert [t.transactionId for t in transactions] == [None, "TRX456"]
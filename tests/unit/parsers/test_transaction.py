@@ -139,3 +139,33 @@ class TestTransaction:
         assert "Zürich" in reprStr
         assert "amountChf=25.5" in reprStr
         assert "EUR 27.0" in reprStr
+
+    def test_identity_withTransactionId_idOnly(self):
+        # arrange
+        testee1 = Transaction("Shopping", "Shop 1", datetime(2025, 7, 31), None, None, 20.00, transactionId="TRX1")
+        testee2 = Transaction("Shopping", "Shop 1 ", datetime(2025, 7, 31), "12:00", None, 20.00, transactionId="TRX1")
+
+        # act & assert
+        assert testee1.identity == testee2.identity
+
+    def test_identity_withoutTransactionId_content(self):
+        # arrange
+        testee1 = Transaction("Shopping", "Shop 1", datetime(2025, 7, 31), "12:00", None, 20.00)
+        testee2 = Transaction("Shopping", "Shop 1", datetime(2025, 7, 31), "12:01", None, 20.00)
+
+        # act & assert
+        assert testee1.identity == Transaction("Shopping", "Shop 1", datetime(2025, 7, 31), "12:00", None, 20.00).identity
+        assert testee1.identity != testee2.identity
+
+    def test_ctor_equalStrings_interned(self):
+        # arrange
+        merchant = "".join(["Shop", " 1"])
+
+        # act
+        testee1 = Transaction("Shopping", merchant, datetime(2025, 7, 31), None, None, 20.00, 18.00, "EUR")
+        testee2 = Transaction("Shopping", "".join(["Shop", " 1"]), datetime(2025, 7, 31), None, None, 30.00, 27.00, "".join(["E", "UR"]))
+
+        # assert
+        assert testee1.merchant is testee2.merchant
+        assert testee1.foreignCurrency is testee2.foreignCurrency
+        assert not hasattr(testee1, "__dict__")
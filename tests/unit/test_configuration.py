@@ -223,8 +223,8 @@ class TestConfigurationProperties:
 
         # assert
         assert isinstance(ignoreRules, IgnoreRules)
-        assert ignoreRules.categories == ["Einlagen"]
-        assert ignoreRules.transactions == ["Payment"]
+        assert ignoreRules.categories == ("Einlagen",)
+        assert ignoreRules.transactions == ("Payment",)
 
     def test_ignoreRules_emptyIgnoreSection_emptyLists(self, writeConfig):
         # arrange
@@ -250,7 +250,7 @@ class TestConfigurationProperties:
         assert len(rules) == 2
 
         foodRules = rules["Food"]
-        assert isinstance(foodRules, list)
+        assert isinstance(foodRules, tuple)
         assert len(foodRules) == 1
         foodRule = foodRules[0]
         assert isinstance(foodRule, MappingRule)
@@ -261,6 +261,35 @@ class TestConfigurationProperties:
         transportRule = rules["Transport"][0]
         assert transportRule.pattern == "^SBB.*"
 
+    def test_mappingRules_repeatedAccess_sameSnapshot(self, validConfig):
+        # act
+        first = validConfig.mappingRules
+        second = validConfig.mappingRules
+
+        # assert
+        assert first is second
+        assert first["Transport"][0].regex.pattern == "^SBB.*"
+        with pytest.raises(TypeError):
+            first["Other"] = ()  # type: ignore[index]
+
+    def test_mappingRules_rule_frozen(self, validConfig):
+        # arrange
+        rule = validConfig.mappingRules["Food"][0]
+
+        # act & assert
+        with pytest.raises(AttributeError):
+            rule.description = "Changed"  # type: ignore[misc]
+
+    def test_ignoreRules_differentCase_ignored(self, validConfig):
+        # act
+        ignoreRules = validConfig.ignoreRules
+
+        # assert
+        assert ignoreRules.ignoresCategory("EINLAGEN")
+        assert not ignoreRules.ignoresCategory("Shopping")
+        assert ignoreRules.ignoresMerchant("PAYMENT received")
+        assert not ignoreRules.ignoresMerchant("Restaurant")
+
     def test_columns_validConfig_columnConfigObjects(self, validConfig):
         # act
         columns = validConfig.columns
@@ -0,0 +1,129 @@
+from configuration import Configuration
+from ruleMatcher import RuleMatcher
+
+
+class TestRuleMatcher:
+    @staticmethod
+    def __createTestee(writeConfig, mapping):
+        config = Configuration(writeConfig({"creditAccount": "2110", "mapping": mapping, "columns": []}))
+        return RuleMatcher(config)
+
+    @staticmethod
+    def __orderedLoop(testee, merchant):
+        for rule in testee.fallbackRules:
+            if rule.matches(merchant):
+                return rule
+        return None
+
+    def test_match_categoryCatchAll_catchAllRule(self, writeConfig):
+        # arrange
+        testee = self.__createTestee(writeConfig, {
+            "Essen & Trinken": {"description": "Verpflegung", "debitAccount": "5821"}
+        })
+
+        # act
+        rule = testee.match("Essen & Trinken", "Restaurant")
+
+        # assert
+        assert rule.description == "Verpflegung"
+
+    def test_match_categoryPatternBeforeCatchAll_patternRule(self, writeConfig):
+        # arrange
+        testee = self.__createTestee(writeConfig, {
+            "Fahrzeug": [
+                {"description": "Auto", "debitAccount": "6200"},
+                {"pattern": "parking", "description": "Parking", "debitAccount": "6232"}
+            ]
+        })
+
+        # act
+        rule = testee.match("Fahrzeug", "City Parking")
+
+        # assert
+        assert rule.debitAccount == "6232"
+
+    def test_match_laterRuleMatchesEarlierPosition_firstRuleInOrder(self, writeConfig):
+        # arrange
+        testee = self.__createTestee(writeConfig, {
+            "A": {"pattern": "station", "description": "Station", "debitAccount": "1"},
+            "B": {"pattern": "^Gas", "description": "Gas", "debitAccount": "2"}
+        })
+
+        # act
+        rule = testee.match("Unknown", "Gasstation 1")
+
+        # assert
+        assert rule.description == "Station"
+
+    def test_match_noPatternMatches_none(self, writeConfig):
+        # arrange
+        testee = self.__createTestee(writeConfig, {
+            "Transport": {"pattern": "^(SBB|CFF|FFS)", "description": "ÖV", "debitAccount": "6282"}
+        })
+
+        # act
+        rule = testee.match("Shopping", "Shop 1")
+
+        # assert
+        assert rule is None
+
+    def test_match_manyPatterns_sameAsOrderedLoop(self, writeConfig):
+        # arrange
+        mapping = {
+            f"Category{index}": {"pattern": pattern, "description": f"Rule {index}", "debitAccount": str(6000 + index)}
+            for index, pattern in enumerate([
+                "^SBB", "restaurant", r"\d{4}", "shop$", "gas(station)?", "[äö]", r"\bcafe\b", "x|y", "^$", "coop"
+            ])
+        }
+        testee = self.__createTestee(writeConfig, mapping)
+        merchants = ["SBB CFF FFS", "Restaurant 1", "Shop 1234", "Big shop", "Gasstation 1",
+                     "Bäckerei", "Cafe Central", "Xylo", "", "Migros", "COOP Pronto"]
+
+        # act
+        results = [testee.match("Unknown", merchant) for merchant in merchants]
+
+        # assert
+        assert results == [self.__orderedLoop(testee, merchant) for merchant in merchants]
+
+    def test_match_overlappingKeywords_sameAsOrderedLoop(self, writeConfig):
+        # arrange
+        patterns = ["shopping", "^Shop", "sho", "Bäckerei", "^SBB", "gas station", "station", "^gas", "a&b", "x-y"]
+        mapping = {
+            f"Category{index}": {"pattern": pattern, "description": f"Rule {index}", "debitAccount": str(6000 + index)}
+            for index, pattern in enumerate(patterns)
+        }
+        testee = self.__createTestee(writeConfig, mapping)
+        merchants = ["Shopping Center", "Shop 1", "Photoshop", "BÄCKEREI Huber", "SBB CFF FFS", "Zug SBB",
+                     "Gas Station 1", "Gasoline", "Station", "A&B Store", "X-Y", "Bar"]
+
+        # act
+        results = [testee.match("Unknown", merchant) for merchant in merchants]
+
+        # assert
+        assert results == [self.__orderedLoop(testee, merchant) for merchant in merchants]
+
+    def test_match_backreferencePattern_sameAsOrderedLoop(self, writeConfig):
+        # arrange
+        testee = self.__createTestee(writeConfig, {
+            "A": {"pattern": r"(o)\1", "description": "Double o", "debitAccount": "1"},
+            "B": {"pattern": "(?P<word>shop)", "description": "Shop", "debitAccount": "2"}
+        })
+
+        # act
+        results = [testee.match("Unknown", merchant) for merchant in ["Foodshop", "Shop", "Bar"]]
+
+        # assert
+        assert [rule.description if rule else None for rule in results] == ["Double o", "Shop", None]
+
+    def test_match_globalInlineFlag_sameAsOrderedLoop(self, writeConfig):
+        # arrange
+        testee = self.__createTestee(writeConfig, {
+            "A": {"pattern": "^bar", "description": "Bar", "debitAccount": "1"},
+            "B": {"pattern": "(?s)shop", "description": "Shop", "debitAccount": "2"}
+        })
+
+        # act
+        rule = testee.match("Unknown", "Shop 1")
+
+        # assert
+        assert rule.description == "Shop"
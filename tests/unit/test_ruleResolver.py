@@ -0,0 +1,82 @@
+import pytest
+
+from configuration import Configuration
+from ruleResolver import RuleResolver
+
+
+class TestRuleResolver:
+    @pytest.fixture(autouse=True)
+    def setup(self, writeConfig):
+        configData = {
+            "creditAccount": "2110",
+            "ignore": {
+                "categories": ["Einlagen"],
+                "transactions": ["PAYMENT.*"]
+            },
+            "mapping": {
+                "Essen & Trinken": {
+                    "description": "Verpflegung",
+                    "debitAccount": "5821"
+                },
+                "Transport": {
+                    "pattern": "^SBB.*",
+                    "description": "Öffentlicher Verkehr",
+                    "debitAccount": "6282"
+                }
+            },
+            "columns": []
+        }
+        self.config = Configuration(writeConfig(configData))  # pylint: disable=attribute-defined-outside-init
+        self.testee = RuleResolver(self.config)  # pylint: disable=attribute-defined-outside-init
+
+    def test_resolve_mappedCategory_rule(self):
+        # act
+        resolution = self.testee.resolve("Essen & Trinken", "Restaurant 1")
+
+        # assert
+        assert resolution.rule.description == "Verpflegung"
+        assert not resolution.ignored
+
+    def test_resolve_unmappedCategory_noMatch(self):
+        # act
+        resolution = self.testee.resolve("Shopping", "Shop 1")
+
+        # assert
+        assert resolution.rule is None
+        assert not resolution.ignored
+
+    def test_resolve_ignoredCategoryAndPattern_ignored(self):
+        # act
+        byCategory = self.testee.resolve("Einlagen", "Deposit")
+        byPattern = self.testee.resolve("Shopping", "PAYMENT THANK YOU")
+
+        # assert
+        assert byCategory.ignored
+        assert byPattern.ignored
+
+    def test_resolve_repeatedMerchant_cacheHit(self):
+        # act
+        first = self.testee.resolve("Transport", "SBB CFF FFS")
+        second = self.testee.resolve("Transport", "SBB CFF FFS")
+        self.testee.resolve("Transport", "Bus")
+
+        # assert
+        assert first is second
+        assert self.testee.cacheHits == 1
+        assert self.testee.cacheMisses == 2
+
+    def test_resolve_cacheFull_leastRecentlyUsedEvicted(self):
+        # arrange
+        testee = RuleResolver(self.config, cacheSize=2)
+        testee.resolve("Shopping", "Shop 1")
+        testee.resolve("Shopping", "Shop 2")
+        testee.resolve("Shopping", "Shop 1")
+
+        # act
+        testee.resolve("Shopping", "Shop 3")
+        testee.resolve("Shopping", "Shop 1")
+        testee.resolve("Shopping", "Shop 2")
+
+        # assert
+        assert testee.cacheHits == 2
+        assert testee.cacheMisses == 4